@@ -0,0 +1,1932 @@
+"""Blender side of the add-on: operators, panels, menus and registration."""
+
+import bpy
+import os
+import re
+import time
+import wave
+from bpy.app.handlers import persistent
+from datetime import datetime
+from operator import attrgetter
+
+from .strip_batch import (
+    MAX_CHANNEL, build_text_strips, deselect_all, pack_batch_channels, pack_cue_channels, sync_text_strips,
+)
+from .async_import import BackgroundImportMixin, BackgroundJob
+from .audio_snap import (
+    HAS_NUMPY, cached_envelope, chunked_envelope, clear_envelopes, snap_cues, snap_strips, speech_boundaries,
+    wav_envelope,
+)
+from .incremental_parse import clear_parsers, incremental_parser
+from .parse_cache import BLEND_CACHE_DIR, ParseCache, cached_parse, load_subtitle_file
+from .profiling import NO_PROFILE, RunProfile, format_count, recent_runs
+from .resync import MARKUP_PROP, remove_strip, tagged_strips
+from .srt_parser import ms_to_timecode
+from .subtitle_core import (
+    ensure_unique_filepath, parse_subtitle_data, run_steps, scale_steps, unique_filepaths,
+)
+from .subtitle_formats import codec_for_path, detect_format, get_codec, strip_markup
+from .subtitle_reader import iter_subtitle_lines
+from .retime import framerate_map, offset_map, retime_cues, retime_strips, stretch_map, sync_map
+from .style_registry import cue_styles, strip_styles
+from .subtitle_writer import iter_chunks, write_subtitle_stream
+from .subtitle_qc import QCSettings, check_cues, fix_timing, issue_message
+from .subtitle_track import TRACK_PROP, clear_track_indexes, create_subtitle_track, update_tracks
+from .track_export import group_strips, track_file_stem
+from .track_import import TrackSource, file_track, parse_tracks
+from .text_stats import clear_caches, cue_block, forget_text, selected_character_count, text_stats
+from .timebase import frame_to_ms, ms_to_frame, parse_timecode, render_frame_rate
+
+NAME_PREFIX_RE = re.compile(r"^\[.*?\]:")
+
+# Characters written to a text block per step of a background import
+TEXT_CHUNK_SIZE = 256 * 1024
+# Strips created per step of a background import
+STRIP_CHUNK_SIZE = 200
+# Issues listed in the QC panel
+MAX_SHOWN_ISSUES = 100
+# Characters of cue text shown in the Text Editor footer
+FOOTER_PREVIEW_LENGTH = 40
+# Sample rate non-WAV audio is decoded at for snapping; plenty for speech energy
+AUDIO_DECODE_RATE = 8000
+# Audio decoded at a time for snapping, so a long mix is never held whole
+AUDIO_DECODE_SECONDS = 60
+
+# Text block name -> (issues, cue count, seconds) of the last QC check
+qc_results = {}
+
+def text_block_format(text_block):
+    """Detect the subtitle format of a text block, defaulting to SRT."""
+    return detect_format(text_block_lines(text_block)) or 'SRT'
+
+def rewrite_text_block(text_block, codec, document):
+    """Replace the content of a text block with a parsed document, written by ``codec``."""
+    text_block.clear()
+    for chunk in iter_chunks(codec.iter_blocks(document.iter_cues(), document.header, document.format)):
+        text_block.write(chunk)
+    # Every line may have changed, not just the ones at the cursor
+    forget_text(text_block)
+
+def iter_text_block_blocks(text_block, format):
+    """Yield the content of a subtitle text block rendered in ``format``, block by block."""
+    source_format = text_block_format(text_block)
+    if format == source_format:
+        for line in text_block.lines:
+            yield line.body + "\n"
+        return
+    document = get_codec(source_format).parse(text_block_lines(text_block))
+    yield from get_codec(format).iter_blocks(document.iter_cues(), document.header, document.format)
+
+class SUBTITLE_OT_import(BackgroundImportMixin, bpy.types.Operator):
+    """Import subtitles into Text Editor"""
+    bl_idname = "subtitle.import"
+    bl_label = "Import Subtitle"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    filepath: bpy.props.StringProperty(subtype="FILE_PATH")
+    filter_glob: bpy.props.StringProperty(
+        default="*.srt;*.vtt;*.sbv;*.ass;*.ssa;*.txt",
+        options={'HIDDEN'},
+    )
+    keep_format: bpy.props.BoolProperty(
+        name="Keep Original Format",
+        default=False,
+        description="Import VTT/SBV/ASS text as is instead of converting it to SRT (the VSE import reads all of them)"
+    )
+    run_in_background: bpy.props.BoolProperty(
+        name="Run in Background",
+        default=True,
+        description="Read and convert the file without blocking Blender (Esc cancels)"
+    )
+
+    def execute(self, context):
+        filepath = self.filepath
+        name = os.path.basename(filepath)
+        keep_format = self.keep_format
+        profile = self._profile = start_profile(context, f"Import {name}")
+        if self.run_in_background:
+            job = BackgroundJob(
+                profile.profiled(lambda job: self.load_content(filepath, keep_format, profile)),
+                lambda content: profile.profiled_steps(self.fill_text_block(name, content, profile)),
+            )
+            return self.start_job(context, job)
+
+        content = profile.profiled(self.load_content)(filepath, keep_format, profile)
+        if content:
+            run_steps(profile.profiled_steps(self.fill_text_block(name, content, profile)))
+            return self.job_finished(context, name)
+        else:
+            self.report({'ERROR'}, "Failed to import subtitle")
+            return {'CANCELLED'}
+
+    @staticmethod
+    def load_content(filepath, keep_format=False, profile=NO_PROFILE):
+        """Read the file and convert it to SRT text; safe to run in a worker thread.
+
+        The file is streamed line by line: a converted file is parsed
+        straight from the stream, so its source text is never held whole.
+        """
+        try:
+            size = os.path.getsize(filepath)
+            codec = codec_for_path(filepath)
+            if codec and codec.name != 'SRT' and not (keep_format and codec.name != 'TXT'):
+                with profile.stage("convert"):
+                    document = codec.parse(iter_subtitle_lines(filepath))
+                    content = get_codec('SRT').dumps(document)
+            else:
+                with profile.stage("decode"):
+                    content = "".join(f"{line}\n" for line in iter_subtitle_lines(filepath))
+        except Exception as e:
+            print(f"Error reading file: {e}")
+            return None
+        if content:
+            profile.count("bytes", size)
+        return content
+
+    @staticmethod
+    def fill_text_block(name, content, profile=NO_PROFILE):
+        """Write content into a new text block in chunks, yielding the fraction done."""
+        if not content:
+            raise ValueError("Failed to import subtitle")
+        text_block = bpy.data.texts.new(name=name)
+        length = len(content)
+        position = 0
+        while position < length:
+            # Cut chunks at line ends so no line is split across writes
+            end = content.find("\n", position + TEXT_CHUNK_SIZE)
+            end = length if end < 0 else end + 1
+            with profile.stage("text block"):
+                text_block.write(content[position:end])
+            position = end
+            yield position / length
+        return text_block.name
+
+    def job_finished(self, context, result):
+        finish_profile(self, context, self._profile)
+        self.report({'INFO'}, f"Imported subtitle: {self.filepath}")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+    
+    def draw(self, context):
+        layout = self.layout
+        layout.label(text="Support: SRT, VTT, SBV, ASS, TXT", icon='DOCUMENTS')
+        layout.prop(self, "keep_format")
+        layout.prop(self, "run_in_background")
+
+
+class SUBTITLE_OT_export(bpy.types.Operator):
+    """Export Text Editor content as subtitle"""
+    bl_idname = "subtitle.export"
+    bl_label = "Export Subtitle"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    filepath: bpy.props.StringProperty(subtype="FILE_PATH")
+    filter_glob: bpy.props.StringProperty(
+        default="*.*",
+        options={'HIDDEN'},
+    )
+    format: bpy.props.EnumProperty(
+        name="Format",
+        description="Select subtitle format",
+        items=[
+            ('SRT', "SRT (.srt)", "SubRip Subtitle format"),
+            ('VTT', "VTT (.vtt)", "WebVTT format"),
+            ('SBV', "SBV (.sbv)", "YouTube Subtitle format"),
+            ('ASS', "ASS (.ass)", "Advanced SubStation Alpha format"),
+        ],
+        default='SRT',
+    )
+
+    def execute(self, context):
+        active_text = context.space_data.text
+        if not active_text:
+            self.report({'ERROR'}, "No active text to export")
+            return {'CANCELLED'}
+
+        # Extract base path and extension
+        base_path, _ = os.path.splitext(self.filepath)
+        extension = f".{self.format.lower()}"
+
+        # Ensure the file path is unique
+        unique_path = ensure_unique_filepath(base_path, extension)
+
+        # Stream straight from the text block lines to the file
+        profile = start_profile(context, f"Export {active_text.name}")
+        try:
+            with profile.stage("write"):
+                profile.profiled(write_subtitle_stream)(unique_path, iter_text_block_blocks(active_text, self.format))
+            profile.count("bytes", os.path.getsize(unique_path))
+            success = True
+        except Exception as e:
+            print(f"Error writing file: {e}")
+            success = False
+        if success:
+            finish_profile(self, context, profile)
+            self.report({'INFO'}, f"Exported subtitle to: {unique_path}")
+            return {'FINISHED'}
+        else:
+            self.report({'ERROR'}, "Failed to export subtitle")
+            return {'CANCELLED'}
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "format", text="Subtitle Format", icon='FILE_CACHE')
+        
+
+class SUBTITLE_OT_check(bpy.types.Operator):
+    """Check subtitle timing, reading speed and line lengths of the active text block"""
+    bl_idname = "subtitle.check"
+    bl_label = "Check Subtitles"
+
+    @classmethod
+    def poll(cls, context):
+        return getattr(context.space_data, "text", None) is not None
+
+    def execute(self, context):
+        text_block = context.space_data.text
+        issues, count, seconds = run_qc(context, text_block)
+        if not count and not issues:
+            self.report({'WARNING'}, "No valid subtitles found in the text block.")
+            return {'CANCELLED'}
+        self.report(
+            {'WARNING'} if issues else {'INFO'},
+            f"Checked {count} subtitles in {seconds:.2f}s: {len(issues) or 'no'} issue(s)."
+        )
+        return {'FINISHED'}
+
+
+class SUBTITLE_OT_fix(bpy.types.Operator):
+    """Fix subtitle timing in the active text block and check it again"""
+    bl_idname = "subtitle.fix"
+    bl_label = "Fix Subtitles"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    trim_overlaps: bpy.props.BoolProperty(
+        name="Trim Overlaps",
+        default=True,
+        description="End every subtitle no later than the start of the next one"
+    )
+    enforce_gaps: bpy.props.BoolProperty(
+        name="Enforce Minimum Gap",
+        default=False,
+        description="End every subtitle at least the minimum gap before the next one"
+    )
+    renumber: bpy.props.BoolProperty(
+        name="Sort and Renumber",
+        default=True,
+        description="Rewrite the subtitles in start order, numbered from 1"
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return getattr(context.space_data, "text", None) is not None
+
+    def execute(self, context):
+        text_block = context.space_data.text
+        if not (self.trim_overlaps or self.enforce_gaps or self.renumber):
+            return {'CANCELLED'}
+
+        # Parse with the block's own codec so markup and settings survive
+        codec = get_codec(text_block_format(text_block))
+        document = codec.parse(text_block_lines(text_block))
+        if not document.cues:
+            self.report({'WARNING'}, "No valid subtitles found in the text block.")
+            return {'CANCELLED'}
+
+        changed = 0
+        if self.enforce_gaps:
+            changed = fix_timing(document.cues, context.scene.subtitle_qc_settings.min_gap)
+        elif self.trim_overlaps:
+            changed = fix_timing(document.cues)
+        else:
+            document.cues.sort_by_start()
+        if changed or self.renumber:
+            rewrite_text_block(text_block, codec, document)
+
+        issues, _, _ = run_qc(context, text_block)
+        self.report({'INFO'}, f"Fixed the timing of {changed} subtitles; {len(issues)} issue(s) left.")
+        return {'FINISHED'}
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "trim_overlaps")
+        layout.prop(self, "enforce_gaps")
+        layout.prop(self, "renumber")
+
+
+class SUBTITLE_OT_jump_to_line(bpy.types.Operator):
+    """Move the cursor to this line"""
+    bl_idname = "subtitle.jump_to_line"
+    bl_label = "Jump to Line"
+
+    line: bpy.props.IntProperty(min=1)
+
+    @classmethod
+    def poll(cls, context):
+        return getattr(context.space_data, "text", None) is not None
+
+    def execute(self, context):
+        space = context.space_data
+        text_block = space.text
+        index = min(self.line, len(text_block.lines)) - 1
+        text_block.current_line_index = index
+        text_block.select_end_line_index = index
+        text_block.current_character = 0
+        text_block.select_end_character = 0
+        # Scroll so the line shows a few lines below the top
+        space.top = max(index - 5, 0)
+        return {'FINISHED'}
+
+
+class SUBTITLE_OT_jump_to_strip(bpy.types.Operator):
+    """Select the strip imported from the cue at the cursor and move the playhead to it"""
+    bl_idname = "subtitle.jump_to_strip"
+    bl_label = "Jump to Strip"
+
+    start_ms: bpy.props.IntProperty(min=0)
+
+    @classmethod
+    def poll(cls, context):
+        return getattr(context.space_data, "text", None) is not None
+
+    def execute(self, context):
+        scene = context.scene
+        text_block = context.space_data.text
+        frame = ms_to_frame(self.start_ms, render_frame_rate(scene.render))
+        sequencer = scene.sequence_editor
+        strips = tagged_strips(sequencer, text_block.name) if sequencer else []
+        if strips:
+            # The strip starting nearest the cue (cues may have moved since the import)
+            strip = min(
+                (strip for strip, key, content_hash in strips),
+                key=lambda strip: abs(strip.frame_final_start - frame),
+            )
+            deselect_all(sequencer)
+            strip.select = True
+            sequencer.active_strip = strip
+            frame = strip.frame_final_start
+        scene.frame_current = frame
+        return {'FINISHED'}
+
+
+def run_qc(context, text_block):
+    """Check a text block with the scene's QC settings and keep the result for the panel."""
+    started = time.perf_counter()
+    errors = []
+    document = get_codec(text_block_format(text_block)).parse(text_block_lines(text_block), errors)
+    issues = check_cues(document.cues, context.scene.subtitle_qc_settings.as_settings(), errors)
+    result = qc_results[text_block.name] = (issues, len(document.cues), time.perf_counter() - started)
+    return result
+
+
+def menu_func_sub(self, context):
+    layout = self.layout
+    layout.separator()
+
+    st = context.space_data
+    text = st.text
+
+    layout.operator(SUBTITLE_OT_import.bl_idname, text="Import Subtitle", icon='IMPORT')
+    if text:
+        layout.operator(SUBTITLE_OT_export.bl_idname, text="Export Subtitle", icon='EXPORT')
+        layout.operator(SUBTITLE_OT_check.bl_idname, text="Check Subtitles", icon='CHECKMARK')
+
+
+# Footer panel for displaying text info
+class TEXT_HT_footer(bpy.types.Header):
+    bl_space_type = 'TEXT_EDITOR'
+    bl_region_type = 'FOOTER'
+
+    def draw(self, context):
+        layout = self.layout
+        st = context.space_data
+        text = st.text
+        settings = context.scene.text_info_settings  # Access settings
+
+        if text:
+            row = layout.row()
+            # File or Text Info
+            if text.filepath:
+                row.label(text=f"File: *(Unsaved)" if text.is_dirty else "File: (Saved)")
+            else:
+                row.label(text="Text: External" if text.library else "Text: Internal")
+
+            # Total Lines
+            row.label(text=f"Lns: {len(text.lines)}")
+
+            # Spacer
+            row.separator_spacer()
+
+            # Cursor Position
+            cursor_line = text.current_line_index + 1
+            cursor_column = text.current_character + 1  # Blender uses zero-based indices
+            row.label(text=f"Ln {cursor_line}, Col {cursor_column}")
+
+            # Selected Characters, from the cached per-line statistics
+            stats = text_stats(text)
+            if text.select_end_line_index >= 0:
+                selected_count = selected_character_count(text, settings.count_spaces, stats)
+                row.label(text=f"({selected_count} Selected)")
+            else:
+                row.label(text="")
+
+            # Subtitle cue at the cursor
+            if stats.cue_count:
+                cue = cue_block(text, stats, text.current_line_index)
+                if cue:
+                    cue_number, start_ms, end_ms, cue_text = cue
+                    row.label(text=f"Cue {cue_number}/{stats.cue_count} @ {ms_to_timecode(start_ms)} \u2192 {ms_to_timecode(end_ms)} ({(end_ms - start_ms) / 1000:.2f}s)")
+                    preview = " / ".join(strip_markup(cue_text).splitlines())
+                    if len(preview) > FOOTER_PREVIEW_LENGTH:
+                        preview = preview[:FOOTER_PREVIEW_LENGTH - 1] + "\u2026"
+                    row.label(text=preview)
+                    row.operator(SUBTITLE_OT_jump_to_strip.bl_idname, text="", icon='SEQ_SEQUENCER').start_ms = start_ms
+                else:
+                    row.label(text=f"Cues: {stats.cue_count}")
+
+            # Indentation Spaces
+            current_line = text.current_line.body
+            indentation_spaces = len(current_line) - len(current_line.lstrip())
+            row.label(text=f"Spaces: {indentation_spaces}")
+
+        else:
+            layout.separator_spacer()
+            layout.label(text="----- Text Info -----")
+            layout.separator_spacer()
+
+# Add a property to store whether spaces should be counted
+class TextInfoSettings(bpy.types.PropertyGroup):
+    count_spaces: bpy.props.BoolProperty(
+        name="Selected Count Spaces",
+        description="Include spaces in selected character count",
+        default=True
+    )
+
+class SubtitleQCSettings(bpy.types.PropertyGroup):
+    min_duration: bpy.props.IntProperty(name="Min Duration (ms)", default=833, min=0)
+    max_duration: bpy.props.IntProperty(name="Max Duration (ms)", default=7000, min=1)
+    max_cps: bpy.props.FloatProperty(
+        name="Max Characters/Second",
+        default=17.0,
+        min=1.0,
+        description="Highest reading speed allowed"
+    )
+    min_gap: bpy.props.IntProperty(name="Min Gap (ms)", default=83, min=0)
+    max_line_length: bpy.props.IntProperty(name="Max Line Length", default=42, min=1)
+    max_lines: bpy.props.IntProperty(name="Max Lines", default=2, min=1)
+
+    def as_settings(self):
+        return QCSettings(
+            self.min_duration, self.max_duration, self.max_cps,
+            self.min_gap, self.max_line_length, self.max_lines,
+        )
+
+# Text Panel with Count Spaces Checkbox
+class TEXT_Pannel(bpy.types.Panel):
+    bl_space_type = 'TEXT_EDITOR'
+    bl_region_type = 'UI'
+    bl_category = "Text"
+    bl_label = "Text Info"
+
+    def draw(self, context):
+        layout = self.layout
+        settings = context.scene.text_info_settings  # Access settings
+        
+        # Checkbox for toggling space counting
+        row = layout.row()
+        row.prop(settings, "count_spaces")
+
+def draw_recent_runs(layout):
+    """Draw the stage timings of the last import or export run, then earlier runs."""
+    if not recent_runs:
+        layout.label(text="No import or export run yet", icon='INFO')
+        return
+    runs = list(recent_runs)
+    last = runs[-1]
+
+    box = layout.box()
+    box.label(text=last.name, icon='TIME')
+    col = box.column(align=True)
+    for name, seconds, share in last.rows():
+        row = col.row()
+        row.label(text=name)
+        row.label(text=f"{seconds:.3f}s ({share:.0%})")
+    row = col.row()
+    row.label(text="Total")
+    row.label(text=f"{last.seconds:.3f}s")
+    if last.counts:
+        col = box.column(align=True)
+        for name, value in last.counts.items():
+            col.label(text=format_count(name, value))
+
+    if len(runs) > 1:
+        col = layout.column(align=True)
+        col.label(text="Earlier Runs:")
+        for run in reversed(runs[:-1]):
+            col.label(text=f"{run.name}: {run.seconds:.2f}s")
+
+
+class TEXT_PT_subtitle_qc(bpy.types.Panel):
+    bl_space_type = 'TEXT_EDITOR'
+    bl_region_type = 'UI'
+    bl_category = "Text"
+    bl_label = "Subtitle QC"
+
+    def draw(self, context):
+        layout = self.layout
+        settings = context.scene.subtitle_qc_settings
+        text = context.space_data.text
+
+        col = layout.column(align=True)
+        col.prop(settings, "min_duration")
+        col.prop(settings, "max_duration")
+        col.prop(settings, "max_cps")
+        col.prop(settings, "min_gap")
+        col.prop(settings, "max_line_length")
+        col.prop(settings, "max_lines")
+
+        row = layout.row(align=True)
+        row.operator(SUBTITLE_OT_check.bl_idname, icon='CHECKMARK')
+        row.operator(SUBTITLE_OT_fix.bl_idname, icon='MODIFIER')
+
+        result = qc_results.get(text.name) if text else None
+        if result is None:
+            return
+        issues, count, seconds = result
+        layout.label(text=f"{len(issues)} issue(s) in {count} subtitles ({seconds:.2f}s)")
+        col = layout.column(align=True)
+        for issue in issues[:MAX_SHOWN_ISSUES]:
+            row = col.row(align=True)
+            op = row.operator(SUBTITLE_OT_jump_to_line.bl_idname, text=f"Ln {issue.line}", emboss=False)
+            op.line = max(issue.line, 1)
+            row.label(text=issue_message(issue))
+        if len(issues) > MAX_SHOWN_ISSUES:
+            col.label(text=f"... and {len(issues) - MAX_SHOWN_ISSUES} more")
+
+
+class TEXT_PT_subtitle_timing(bpy.types.Panel):
+    bl_space_type = 'TEXT_EDITOR'
+    bl_region_type = 'UI'
+    bl_category = "Text"
+    bl_label = "Subtitle Timing"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        draw_recent_runs(self.layout)
+
+
+class SEQUENCER_PT_subtitle_timing(bpy.types.Panel):
+    bl_space_type = 'SEQUENCE_EDITOR'
+    bl_region_type = 'UI'
+    bl_category = "Subtitles"
+    bl_label = "Subtitle Timing"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        draw_recent_runs(self.layout)
+
+# ----------------------- Subtitle VSE------------------------
+
+def text_block_lines(text_block):
+    """Iterate the line bodies of a text block without building one big string."""
+    return (line.body for line in text_block.lines)
+
+
+def text_block_source_file(text_block):
+    """Return the file a text block was opened from if it still matches it, else None."""
+    if not text_block.filepath or text_block.is_in_memory or text_block.is_dirty or text_block.is_modified:
+        return None
+    path = bpy.path.abspath(text_block.filepath)
+    return path if os.path.isfile(path) else None
+
+
+def resolve_style_table(subtitles):
+    """Return the interned styles of a CueStore as dicts with RGBA colours.
+
+    Styles are resolved through the shared registry, so a style seen in an
+    earlier import is not resolved again.
+    """
+    return [cue_styles.lookup(style).values for style in subtitles.styles]
+
+
+def iter_create_text_strips(scene, subtitles, channel, batch_size=0, auto_channels=False,
+                            source=None, chunk_size=0, profile=NO_PROFILE):
+    """Create text strips in chunks of ``chunk_size`` cues, yielding the fraction done.
+
+    Generator form of create_text_strips for background imports; its return
+    value is the same ``(strip_count, seconds, channels_used, top_channel)``. With meta
+    batches every chunk is one batch.
+    """
+    fps = render_frame_rate(scene.render)
+    sequencer = scene.sequence_editor
+    if not sequencer:
+        sequencer = scene.sequence_editor_create()
+
+    # Deselect all existing strips
+    deselect_all(sequencer)
+
+    # Resolve each interned style once instead of per cue
+    style_table = resolve_style_table(subtitles)
+
+    channels = None
+    meta_channels = None
+    channels_used = 1
+    top_channel = channel
+    if batch_size > 0:
+        # Metas are placed on the timeline; cues only share a meta with their batch
+        with profile.stage("channels"):
+            meta_channels, channels = pack_batch_channels(
+                sequencer, subtitles, channel, fps, batch_size, auto_channels
+            )
+        channels_used = len(set(meta_channels))
+        top_channel = max(meta_channels, default=channel)
+    elif auto_channels:
+        with profile.stage("channels"):
+            channels = pack_cue_channels(sequencer, subtitles, channel, fps)
+        channels_used = len(set(channels))
+        # Packing may skip occupied channels, so this can exceed channel + channels_used - 1
+        top_channel = max(channels, default=channel)
+    else:
+        subtitles.sort_by_start()
+
+    count = len(subtitles)
+    if batch_size > 0:
+        chunk_size = batch_size
+    elif chunk_size <= 0:
+        chunk_size = max(count, 1)
+
+    created = 0
+    elapsed = 0.0
+    for first in range(0, count, chunk_size):
+        positions = range(first, min(first + chunk_size, count))
+        chunk = subtitles if len(positions) == count else subtitles.take(positions)
+        chunk_channels = channels[first:positions.stop] if channels is not None else None
+        chunk_meta_channels = meta_channels[first // chunk_size:] if meta_channels is not None else None
+        with profile.stage("strips"):
+            chunk_created, seconds = build_text_strips(
+                sequencer, chunk, channel, fps, style_table, batch_size, chunk_channels,
+                source=source, keys=positions, profile=profile, meta_channels=chunk_meta_channels,
+            )
+        created += chunk_created
+        elapsed += seconds
+        yield positions.stop / count
+
+    return created, elapsed, channels_used, top_channel
+
+
+def create_text_strips(context, subtitles, channel, batch_size=0, auto_channels=False, source=None):
+    """Add text strips to the VSE based on the timings and styles of a CueStore.
+
+    With ``auto_channels`` overlapping cues, and cues colliding with existing
+    strips, are moved up to the fewest extra channels. With ``source`` the
+    strips are tagged for later re-sync. Returns
+    ``(strip_count, seconds, channels_used, top_channel)``.
+    """
+    return run_steps(iter_create_text_strips(
+        context.scene, subtitles, channel, batch_size, auto_channels, source
+    ))
+
+
+def strip_style_id(strip):
+    """Return the registry ID of a text strip's style."""
+    return strip_styles.intern((
+        getattr(strip, "use_bold", False),
+        getattr(strip, "use_italic", False),
+        getattr(strip, "use_box", False),  # Represent box as underline
+        getattr(strip, "font_size", 40),
+        tuple(strip.color[:3]),
+    ))
+
+
+def strip_srt_text(strip, style_id=None):
+    """Render a text strip's text with its styles as SRT tags.
+
+    Line breaks stay real newlines; each codec writes them its own way.
+    """
+    # Partial styling kept from the import, unless the text was edited since
+    text = strip.text
+    markup = strip.get(MARKUP_PROP)
+    if markup and strip_markup(markup) == text:
+        text = markup
+
+    # Blender styles as SRT tags, resolved once per distinct style
+    style = strip_styles[strip_style_id(strip) if style_id is None else style_id]
+    text = f"{style.prefix}{text}{style.suffix}"
+
+    # Remove name prefix if present
+    text = NAME_PREFIX_RE.sub("", text).strip()
+
+    # Include the name prefix if available
+    name_prefix = strip.name.split(" ")[0] if "[" in strip.name else ""
+    if name_prefix:
+        text = f"{name_prefix} {text}"
+
+    # Skip exporting the color tag if the color is default white
+    return f"{style.color_prefix}{text}{style.color_suffix}"
+
+
+def selected_text_strips(sequencer):
+    """Return the selected TEXT strips sorted by start frame."""
+    strips = [s for s in sequencer.sequences_all if s.type == 'TEXT' and s.select]
+    strips.sort(key=attrgetter("frame_final_start", "channel"))
+    return strips
+
+
+def iter_strip_cues(strips, fps):
+    """Yield ``(start_ms, end_ms, text, settings)`` cues rendered from text strips.
+
+    ``fps`` is the exact frame rate, see timebase.render_frame_rate.
+    """
+    for strip in strips:
+        start_ms = frame_to_ms(strip.frame_final_start, fps)
+        end_ms = frame_to_ms(strip.frame_final_end, fps)
+        yield start_ms, end_ms, strip_srt_text(strip), None
+
+
+def export_metadata():
+    """Return the metadata comment block written at the top of SRT exports."""
+    return (
+        f"# Metadata\n"
+        f"# Title: Subtitles\n"
+        f"# Author: Your Name\n"
+        f"# Tags: Comedy,\n"
+        f"# Language: English\n"
+        f"# Encoding: UTF-8\n"
+        f"# Created: {datetime.now().strftime('%Y-%m-%d')}\n"
+        f"# Tool: Blender\n\n"
+    )
+
+
+def iter_export_blocks(strips, fps, format='SRT'):
+    """Yield the rendered export of text strips in ``format``, block by block."""
+    cues = iter_strip_cues(strips, fps)
+    if format == 'SRT':
+        yield export_metadata()
+        # SRT exports keep the literal \n line breaks they always had
+        yield from get_codec(format).iter_blocks(cues, legacy_newlines=True)
+        return
+    yield from get_codec(format).iter_blocks(cues)
+
+
+def export_selected_text_strips_to_text_editor(context, profile=NO_PROFILE):
+    """Export selected text strips from the VSE to the Text Editor as SRT format."""
+    scene = context.scene
+    sequencer = scene.sequence_editor
+
+    if not sequencer:
+        return "No VSE sequences found to export."
+
+    with profile.stage("collect"):
+        strips = selected_text_strips(sequencer)
+    if not strips:
+        return "No selected text strips found to export."
+    profile.count("strips", len(strips))
+
+    # Generate a unique name for the text block, with lookups by name
+    base_name = "Subtitles_Export"
+    counter = 1
+    while bpy.data.texts.get(f"{base_name}_{counter:03}") is not None:
+        counter += 1
+    text_block_name = f"{base_name}_{counter:03}"
+
+    # Add a new Text block and stream the export into it in bounded chunks
+    text_block = bpy.data.texts.new(text_block_name)
+    write = profile.timed("text block", text_block.write)
+    with profile.stage("render"):
+        for chunk in iter_chunks(iter_export_blocks(strips, render_frame_rate(scene.render))):
+            write(chunk)
+
+    return f"Exported {len(strips)} selected subtitles to '{text_block_name}'."
+
+
+def export_selected_text_strips_to_file(context, file_path, format='SRT', profile=NO_PROFILE):
+    """Export selected text strips from the VSE straight to a subtitle file."""
+    scene = context.scene
+    sequencer = scene.sequence_editor
+
+    if not sequencer:
+        return None, "No VSE sequences found to export."
+
+    with profile.stage("collect"):
+        strips = selected_text_strips(sequencer)
+    if not strips:
+        return None, "No selected text strips found to export."
+    profile.count("strips", len(strips))
+
+    base_path, _ = os.path.splitext(file_path)
+    unique_path = ensure_unique_filepath(base_path, f".{format.lower()}")
+    with profile.stage("write"):
+        write_subtitle_stream(unique_path, iter_export_blocks(strips, render_frame_rate(scene.render), format))
+    profile.count("bytes", os.path.getsize(unique_path))
+    return unique_path, f"Exported {len(strips)} selected subtitles to: {unique_path}"
+
+# ----------------------- Operators ------------------------
+
+class VSEImportSubtitlesOperator(BackgroundImportMixin, bpy.types.Operator):
+    """Import subtitles into VSE from Text Editor"""
+    bl_idname = "vse.import_subtitles"
+    bl_label = "Import Subtitles from Text Editor"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    channel: bpy.props.IntProperty(name="Channel", default=2, min=1, max=128)
+    text_block_name: bpy.props.StringProperty(name="Text Block Name")
+    import_mode: bpy.props.EnumProperty(
+        name="Import As",
+        items=[
+            ('STRIPS', "One Strip per Subtitle", "Create a text strip for every subtitle"),
+            ('TRACK', "Single Track Strip", "Create one text strip whose text follows the playhead, "
+                                            "for long-form content with many subtitles"),
+        ],
+        default='STRIPS',
+    )
+    toggle_connect: bpy.props.BoolProperty(
+        name="Connect Strips",
+        default=True,
+        description="Connect created subtitle strips"
+    )
+    sync_existing: bpy.props.BoolProperty(
+        name="Sync Existing Strips",
+        default=True,
+        description="Update strips previously imported from this text block instead of adding a new set"
+    )
+    auto_channels: bpy.props.BoolProperty(
+        name="Auto Channels",
+        default=True,
+        description="Move overlapping subtitles, and ones colliding with existing strips, to the fewest extra channels"
+    )
+    use_meta_batches: bpy.props.BoolProperty(
+        name="Group in Meta Strips",
+        default=False,
+        description="Wrap each batch of created strips in a meta strip to keep large timelines responsive"
+    )
+    batch_size: bpy.props.IntProperty(
+        name="Batch Size",
+        default=500,
+        min=10,
+        description="Number of subtitles per meta strip"
+    )
+    run_in_background: bpy.props.BoolProperty(
+        name="Run in Background",
+        default=True,
+        description="Parse and create strips without blocking Blender (Esc cancels)"
+    )
+
+    def execute(self, context):
+        text_block = bpy.data.texts.get(self.text_block_name)
+        if not text_block:
+            self.report({'ERROR'}, f"No text block named '{self.text_block_name}' found.")
+            return {'CANCELLED'}
+
+        # Plain values only: the apply step may run after this call returns
+        scene = context.scene
+        options = {
+            "source": text_block.name,
+            "channel": self.channel,
+            "sync_existing": self.sync_existing,
+            "auto_channels": self.auto_channels,
+            "batch_size": self.batch_size if self.use_meta_batches else 0,
+            "track": self.import_mode == 'TRACK',
+        }
+
+        format = text_block_format(text_block)
+        profile = self._profile = start_profile(context, f"Import {text_block.name} to VSE")
+        cache = parse_cache(context)
+        source_file = text_block_source_file(text_block) if cache else None
+        # SRT blocks edited since the last import are re-parsed block by block
+        parser = incremental_parser(text_block.as_pointer()) if format == 'SRT' and not source_file else None
+        if source_file:
+            content = None  # cached by file, read only on a cache miss
+        elif self.run_in_background or cache or parser:
+            content = text_block.as_string()
+        else:
+            content = text_block_lines(text_block)
+
+        if self.run_in_background:
+            job = BackgroundJob(
+                profile.profiled(
+                    lambda job: self.parse_subtitles(content, format, cache, source_file, profile, parser)
+                ),
+                lambda payload: profile.profiled_steps(
+                    self.apply_subtitles(scene, payload, options, STRIP_CHUNK_SIZE, profile)
+                ),
+            )
+            return self.start_job(context, job)
+
+        payload = profile.profiled(self.parse_subtitles)(content, format, cache, source_file, profile, parser)
+        steps = profile.profiled_steps(self.apply_subtitles(scene, payload, options, profile=profile))
+        return self.job_finished(context, run_steps(steps))
+
+    @staticmethod
+    def parse_subtitles(source, format='SRT', cache=None, source_file=None, profile=NO_PROFILE, parser=None):
+        """Parse the text block content, through the parse cache if given; safe to run in a worker thread.
+
+        With an IncrementalParser (SRT only) only the cue blocks changed
+        since its last run are parsed.
+        """
+        if source_file:
+            return load_subtitle_file(source_file, cache, format, profile)
+        if parser is not None:
+            def parse(content, errors):
+                with profile.stage("parse"):
+                    cues = parser.parse(content, errors)
+                profile.count("reparsed blocks", parser.reparsed)
+                profile.count("cues", len(cues))
+                return cues
+        else:
+            def parse(content, errors):
+                return parse_subtitle_data(content, errors, format, profile)
+        return cached_parse(cache, source, format, parse, profile)
+
+    @staticmethod
+    def apply_subtitles(scene, payload, options, chunk_size=0, profile=NO_PROFILE):
+        """Create or sync strips, yielding the fraction done; returns a result tuple."""
+        subtitles, errors = payload
+        if not subtitles:
+            return 'EMPTY', errors, None
+
+        sequencer = scene.sequence_editor
+        source = options["source"]
+        if options["track"]:
+            with profile.stage("track"):
+                strip, count = create_subtitle_track(scene, subtitles, options["channel"], source)
+            return 'TRACK', errors, (strip.name, count)
+
+        if options["sync_existing"] and sequencer and tagged_strips(sequencer, source):
+            with profile.stage("sync"):
+                stats = sync_text_strips(
+                    sequencer, subtitles, source, options["channel"],
+                    render_frame_rate(scene.render), resolve_style_table(subtitles), options["auto_channels"],
+                    profile,
+                )
+            return 'SYNC', errors, stats
+
+        stats = yield from iter_create_text_strips(
+            scene, subtitles, options["channel"], options["batch_size"],
+            options["auto_channels"], source=source, chunk_size=chunk_size, profile=profile,
+        )
+        return 'CREATE', errors, stats
+
+    def job_finished(self, context, result):
+        kind, errors, stats = result
+        if errors:
+            lines = ", ".join(str(line) for line, _ in errors[:10])
+            more = f" (+{len(errors) - 10} more)" if len(errors) > 10 else ""
+            self.report({'WARNING'}, f"Skipped {len(errors)} malformed block(s) at line {lines}{more}")
+
+        if kind == 'EMPTY':
+            self.report({'WARNING'}, "No valid subtitles found in the text block.")
+            return {'CANCELLED'}
+
+        if kind == 'TRACK':
+            strip_name, count = stats
+            finish_profile(self, context, self._profile)
+            self.report({'INFO'}, f"Imported {count} subtitles into track strip '{strip_name}'.")
+            return {'FINISHED'}
+
+        if kind == 'SYNC':
+            updated, added, removed, unchanged, elapsed = stats
+            finish_profile(self, context, self._profile)
+            self.report(
+                {'INFO'},
+                f"Synced '{self.text_block_name}': {updated} updated, {added} added, "
+                f"{removed} removed, {unchanged} unchanged ({elapsed:.2f}s)."
+            )
+            return {'FINISHED'}
+
+        created, elapsed, channels_used, top_channel = stats
+
+        # Handle toggling connection
+        with self._profile.stage("connect"):
+            if self.toggle_connect:
+                bpy.ops.sequencer.connect(toggle=True)
+            else:
+                bpy.ops.sequencer.disconnect()
+        finish_profile(self, context, self._profile)
+
+        rate = created / elapsed if elapsed > 0 else 0.0
+        channel_info = f" on {channels_used} channels" if channels_used > 1 else ""
+        self.report({'INFO'}, f"Imported {created} subtitles into VSE{channel_info} ({rate:.0f} strips/sec).")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        wm = context.window_manager
+        return wm.invoke_props_dialog(self)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop_search(self, "text_block_name", bpy.data, "texts", text="Text Block")
+        layout.prop(self, "channel", text="Target Channel")
+        layout.prop(self, "import_mode")
+        col = layout.column()
+        col.active = self.import_mode == 'STRIPS'
+        col.prop(self, "sync_existing")
+        col.prop(self, "auto_channels")
+        col.prop(self, "toggle_connect", text="Connect Strips")
+        row = col.row()
+        row.prop(self, "use_meta_batches")
+        sub = row.row()
+        sub.active = self.use_meta_batches
+        sub.prop(self, "batch_size", text="Size")
+        layout.prop(self, "run_in_background")
+
+
+class SubtitleTrackItem(bpy.types.PropertyGroup):
+    use: bpy.props.BoolProperty(name="Import", default=True)
+
+
+class VSEImportSubtitleTracksOperator(BackgroundImportMixin, bpy.types.Operator):
+    """Import several subtitle files or text blocks at once, one channel per track"""
+    bl_idname = "vse.import_subtitle_tracks"
+    bl_label = "Import Subtitle Tracks"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    source_type: bpy.props.EnumProperty(
+        name="Source",
+        items=[
+            ('FILES', "Files", "Import subtitle files picked in the file browser"),
+            ('TEXT_BLOCKS', "Text Blocks", "Import subtitle text blocks"),
+        ],
+        default='FILES',
+    )
+    files: bpy.props.CollectionProperty(type=bpy.types.OperatorFileListElement, options={'HIDDEN', 'SKIP_SAVE'})
+    directory: bpy.props.StringProperty(subtype='DIR_PATH', options={'HIDDEN', 'SKIP_SAVE'})
+    filter_glob: bpy.props.StringProperty(
+        default="*.srt;*.vtt;*.sbv;*.ass;*.ssa;*.txt",
+        options={'HIDDEN'},
+    )
+    text_blocks: bpy.props.CollectionProperty(type=SubtitleTrackItem, options={'SKIP_SAVE'})
+    channel: bpy.props.IntProperty(name="First Channel", default=2, min=1, max=MAX_CHANNEL)
+    sync_existing: bpy.props.BoolProperty(
+        name="Sync Existing Strips",
+        default=True,
+        description="Update strips previously imported from the same track instead of adding a new set"
+    )
+    auto_channels: bpy.props.BoolProperty(
+        name="Auto Channels",
+        default=True,
+        description="Move overlapping subtitles of a track to extra channels, below the next track"
+    )
+    run_in_background: bpy.props.BoolProperty(
+        name="Run in Background",
+        default=True,
+        description="Parse and create strips without blocking Blender (Esc cancels)"
+    )
+
+    def track_sources(self, cache):
+        """Collect the selected tracks as TrackSources (main thread only)."""
+        if self.source_type == 'FILES':
+            paths = sorted(os.path.join(self.directory, item.name) for item in self.files if item.name)
+            return [file_track(path) for path in paths]
+
+        sources = []
+        for item in self.text_blocks:
+            text_block = bpy.data.texts.get(item.name)
+            if not item.use or text_block is None:
+                continue
+            format = text_block_format(text_block)
+            source_file = text_block_source_file(text_block) if cache else None
+            if source_file:
+                sources.append(TrackSource(text_block.name, source_file, None, format))
+            else:
+                sources.append(TrackSource(text_block.name, None, text_block.as_string(), format))
+        return sources
+
+    def execute(self, context):
+        cache = parse_cache(context)
+        sources = self.track_sources(cache)
+        if not sources:
+            self.report({'ERROR'}, "No subtitle tracks selected.")
+            return {'CANCELLED'}
+        profile = self._profile = start_profile(context, f"Import {len(sources)} subtitle tracks")
+
+        scene = context.scene
+        options = {
+            "channel": self.channel,
+            "sync_existing": self.sync_existing,
+            "auto_channels": self.auto_channels,
+        }
+        if self.run_in_background:
+            job = BackgroundJob(
+                profile.profiled(lambda job: self.parse_tracks(sources, cache, profile)),
+                lambda tracks: profile.profiled_steps(
+                    self.apply_tracks(scene, tracks, options, STRIP_CHUNK_SIZE, profile)
+                ),
+            )
+            return self.start_job(context, job)
+
+        tracks = profile.profiled(self.parse_tracks)(sources, cache, profile)
+        steps = profile.profiled_steps(self.apply_tracks(scene, tracks, options, profile=profile))
+        return self.job_finished(context, run_steps(steps))
+
+    @staticmethod
+    def parse_tracks(sources, cache, profile=NO_PROFILE):
+        """Parse all tracks concurrently (timed as one stage); safe to run in a worker thread."""
+        with profile.stage("parse"):
+            tracks = parse_tracks(sources, cache)
+        profile.count("cues", sum(len(track.cues) for track in tracks if track.cues))
+        return tracks
+
+    @staticmethod
+    def apply_tracks(scene, tracks, options, chunk_size=0, profile=NO_PROFILE):
+        """Create or sync the strips of every track in one pass, yielding the fraction done.
+
+        Each track starts above the highest channel the previous one used. Returns a
+        list of ``(track, kind, errors, stats, channel)``.
+        """
+        sequencer = scene.sequence_editor or scene.sequence_editor_create()
+        channel = options["channel"]
+        results = []
+        for position, track in enumerate(tracks):
+            if channel > MAX_CHANNEL:
+                results.append((track, 'FULL', track.errors, None, channel))
+                continue
+            track_options = {
+                "source": track.name,
+                "channel": channel,
+                "sync_existing": options["sync_existing"],
+                "auto_channels": options["auto_channels"],
+                "batch_size": 0,
+                "track": False,
+            }
+            steps = VSEImportSubtitlesOperator.apply_subtitles(
+                scene, (track.cues, track.errors), track_options, chunk_size, profile
+            )
+            kind, errors, stats = yield from scale_steps(steps, position / len(tracks), 1 / len(tracks))
+            results.append((track, kind, errors, stats, channel))
+
+            if kind == 'CREATE':
+                channel = stats[3] + 1
+            elif kind == 'SYNC':
+                channel = max(strip.channel for strip, _, _ in tagged_strips(sequencer, track.name)) + 1
+        return results
+
+    def job_finished(self, context, result):
+        imported = 0
+        channels = []
+        for track, kind, errors, stats, channel in result:
+            problems = f", {len(errors)} malformed block(s)" if errors else ""
+            if kind == 'FULL':
+                self.report({'WARNING'}, f"{track.name}: skipped, no channel left above {MAX_CHANNEL}")
+            elif kind == 'EMPTY':
+                self.report({'WARNING'}, f"{track.name}: no valid subtitles{problems}")
+            elif kind == 'SYNC':
+                updated, added, removed, unchanged, elapsed = stats
+                channels.append(channel)
+                self.report(
+                    {'INFO'},
+                    f"{track.name}: synced {updated} updated, {added} added, {removed} removed, "
+                    f"{unchanged} unchanged (parse {track.seconds:.2f}s, strips {elapsed:.2f}s){problems}"
+                )
+            else:
+                created, elapsed, channels_used, top_channel = stats
+                imported += created
+                channels.append(channel)
+                last = f"-{top_channel}" if top_channel > channel else ""
+                self.report(
+                    {'INFO'},
+                    f"{track.name}: {created} subtitles on channel {channel}{last} "
+                    f"(parse {track.seconds:.2f}s, strips {elapsed:.2f}s){problems}"
+                )
+
+        if not channels:
+            self.report({'WARNING'}, "No subtitle tracks imported.")
+            return {'CANCELLED'}
+        finish_profile(self, context, self._profile)
+        self.report({'INFO'}, f"Imported {len(channels)} subtitle tracks ({imported} new strips).")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        if self.source_type == 'FILES':
+            context.window_manager.fileselect_add(self)
+            return {'RUNNING_MODAL'}
+
+        self.text_blocks.clear()
+        for text_block in bpy.data.texts:
+            if detect_format(text_block_lines(text_block)):
+                self.text_blocks.add().name = text_block.name
+        return context.window_manager.invoke_props_dialog(self)
+
+    def draw(self, context):
+        layout = self.layout
+        if self.source_type == 'TEXT_BLOCKS':
+            col = layout.column(align=True)
+            for item in self.text_blocks:
+                col.prop(item, "use", text=item.name)
+            if not self.text_blocks:
+                col.label(text="No subtitle text blocks found", icon='INFO')
+        layout.prop(self, "channel")
+        layout.prop(self, "sync_existing")
+        layout.prop(self, "auto_channels")
+        layout.prop(self, "run_in_background")
+
+
+class VSEExportSubtitlesOperator(bpy.types.Operator):
+    """Export selected subtitles from VSE to Text Editor or straight to a file"""
+    bl_idname = "vse.export_subtitles"
+    bl_label = "Export Subtitles to Text Editor"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    export_to_file: bpy.props.BoolProperty(
+        name="Export to File",
+        default=False,
+        description="Write the selected strips directly to a subtitle file instead of a text block"
+    )
+    filepath: bpy.props.StringProperty(subtype="FILE_PATH")
+    filter_glob: bpy.props.StringProperty(
+        default="*.srt;*.vtt;*.sbv;*.ass",
+        options={'HIDDEN'},
+    )
+    format: bpy.props.EnumProperty(
+        name="Format",
+        description="Select subtitle format",
+        items=[
+            ('SRT', "SRT (.srt)", "SubRip Subtitle format"),
+            ('VTT', "VTT (.vtt)", "WebVTT format"),
+            ('SBV', "SBV (.sbv)", "YouTube Subtitle format"),
+            ('ASS', "ASS (.ass)", "Advanced SubStation Alpha format"),
+        ],
+        default='SRT',
+    )
+
+    def execute(self, context):
+        profile = start_profile(context, "Export subtitles from VSE")
+        if not self.export_to_file:
+            result = profile.profiled(export_selected_text_strips_to_text_editor)(context, profile)
+            finish_profile(self, context, profile)
+            self.report({'INFO'}, result)
+            return {'FINISHED'}
+
+        try:
+            path, result = profile.profiled(export_selected_text_strips_to_file)(
+                context, self.filepath, self.format, profile
+            )
+        except Exception as e:
+            self.report({'ERROR'}, f"Failed to export subtitle: {e}")
+            return {'CANCELLED'}
+        if path:
+            finish_profile(self, context, profile)
+        self.report({'INFO'} if path else {'WARNING'}, result)
+        return {'FINISHED'} if path else {'CANCELLED'}
+
+    def invoke(self, context, event):
+        if self.export_to_file:
+            context.window_manager.fileselect_add(self)
+            return {'RUNNING_MODAL'}
+        return self.execute(context)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "format", text="Subtitle Format", icon='FILE_CACHE')
+
+class VSEExportSubtitleTracksOperator(bpy.types.Operator):
+    """Export every subtitle channel or speaker to its own files in one pass"""
+    bl_idname = "vse.export_subtitle_tracks"
+    bl_label = "Export All Subtitle Tracks"
+    bl_options = {'REGISTER'}
+
+    directory: bpy.props.StringProperty(subtype='DIR_PATH')
+    filter_folder: bpy.props.BoolProperty(default=True, options={'HIDDEN'})
+    group_by: bpy.props.EnumProperty(
+        name="Tracks",
+        items=[
+            ('CHANNEL', "By Channel", "One track per channel"),
+            ('SPEAKER', "By Speaker", "One track per [Speaker] name tag"),
+        ],
+        default='CHANNEL',
+    )
+    formats: bpy.props.EnumProperty(
+        name="Formats",
+        items=[
+            ('SRT', "SRT", "SubRip Subtitle format"),
+            ('VTT', "VTT", "WebVTT format"),
+            ('SBV', "SBV", "YouTube Subtitle format"),
+            ('ASS', "ASS", "Advanced SubStation Alpha format"),
+        ],
+        options={'ENUM_FLAG'},
+        default={'SRT'},
+    )
+    file_prefix: bpy.props.StringProperty(
+        name="File Prefix",
+        description="Start of every file name (default: the .blend file name)"
+    )
+    selected_only: bpy.props.BoolProperty(
+        name="Selected Only",
+        default=False,
+        description="Export only selected text strips"
+    )
+    overwrite: bpy.props.BoolProperty(
+        name="Overwrite",
+        default=False,
+        description="Replace existing files instead of adding a numbered suffix"
+    )
+
+    def execute(self, context):
+        sequencer = context.scene.sequence_editor
+        if not sequencer:
+            self.report({'WARNING'}, "No VSE sequences found to export.")
+            return {'CANCELLED'}
+        if not self.formats:
+            self.report({'ERROR'}, "Pick at least one format.")
+            return {'CANCELLED'}
+
+        profile = start_profile(context, "Export all subtitle tracks")
+        selected_only = self.selected_only
+        with profile.stage("collect"):
+            # Track strips show a different cue on every frame; skip them
+            tracks = group_strips(
+                sequencer.sequences_all, self.group_by,
+                lambda strip: (selected_only and not strip.select) or strip.get(TRACK_PROP) is not None,
+            )
+        if not tracks:
+            self.report({'WARNING'}, "No text strips found to export.")
+            return {'CANCELLED'}
+
+        prefix = self.file_prefix or bpy.path.display_name_from_filepath(bpy.data.filepath) or "Subtitles"
+        directory = bpy.path.abspath(self.directory)
+        formats = sorted(self.formats)
+        outputs = [
+            (os.path.join(directory, track_file_stem(prefix, key, self.group_by)), f".{format.lower()}")
+            for key, _ in tracks for format in formats
+        ]
+        if self.overwrite:
+            paths = [f"{base_path}{extension}" for base_path, extension in outputs]
+        else:
+            paths = unique_filepaths(outputs)
+
+        fps = render_frame_rate(context.scene.render)
+        paths = iter(paths)
+        written = 0
+        try:
+            os.makedirs(directory, exist_ok=True)
+            for key, strips in tracks:
+                profile.count("strips", len(strips))
+                for format in formats:
+                    path = next(paths)
+                    with profile.stage("write"):
+                        profile.profiled(write_subtitle_stream)(path, iter_export_blocks(strips, fps, format))
+                    profile.count("bytes", os.path.getsize(path))
+                    written += 1
+        except Exception as e:
+            self.report({'ERROR'}, f"Failed to export subtitle: {e}")
+            return {'CANCELLED'}
+
+        profile.count("files", written)
+        finish_profile(self, context, profile)
+        self.report({'INFO'}, f"Exported {len(tracks)} subtitle tracks to {written} files in: {directory}")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "group_by")
+        layout.prop(self, "formats")
+        layout.prop(self, "file_prefix")
+        layout.prop(self, "selected_only")
+        layout.prop(self, "overwrite")
+
+class VSERetimeSubtitlesOperator(bpy.types.Operator):
+    """Shift, stretch, sync or convert the frame rate of subtitle timings"""
+    bl_idname = "vse.retime_subtitles"
+    bl_label = "Retime Subtitles"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    target: bpy.props.EnumProperty(
+        name="Apply To",
+        items=[
+            ('STRIPS', "Selected Strips", "Retime the selected text strips"),
+            ('TEXT', "Text Block", "Retime the cues of a subtitle text block"),
+        ],
+        default='STRIPS',
+    )
+    text_block_name: bpy.props.StringProperty(name="Text Block Name")
+    mode: bpy.props.EnumProperty(
+        name="Mode",
+        items=[
+            ('OFFSET', "Offset", "Move every subtitle by the same amount"),
+            ('STRETCH', "Stretch", "Scale timings around an anchor time"),
+            ('SYNC', "Two-Point Sync", "Move two known times to where they should be"),
+            ('FRAMERATE', "Frame Rate", "Convert timings made for another frame rate"),
+        ],
+        default='OFFSET',
+    )
+    offset_ms: bpy.props.IntProperty(name="Offset (ms)", default=0)
+    stretch: bpy.props.FloatProperty(name="Factor", default=1.0, min=0.01, max=100.0, precision=6)
+    anchor: bpy.props.StringProperty(name="Anchor", default="00:00:00,000")
+    sync_source_a: bpy.props.StringProperty(name="First From", default="00:00:00,000")
+    sync_target_a: bpy.props.StringProperty(name="First To", default="00:00:00,000")
+    sync_source_b: bpy.props.StringProperty(name="Second From", default="00:01:00,000")
+    sync_target_b: bpy.props.StringProperty(name="Second To", default="00:01:00,000")
+    source_fps: bpy.props.FloatProperty(name="Source FPS", default=25.0, min=1.0, precision=3)
+    target_fps: bpy.props.FloatProperty(name="Target FPS", default=23.976, min=1.0, precision=3)
+
+    def retime_map(self):
+        """Return ``(scale, offset)`` for the chosen mode (ValueError on bad input)."""
+        if self.mode == 'OFFSET':
+            return offset_map(self.offset_ms)
+        if self.mode == 'STRETCH':
+            return stretch_map(self.stretch, parse_timecode(self.anchor))
+        if self.mode == 'SYNC':
+            return sync_map(
+                parse_timecode(self.sync_source_a), parse_timecode(self.sync_target_a),
+                parse_timecode(self.sync_source_b), parse_timecode(self.sync_target_b),
+            )
+        return framerate_map(self.source_fps, self.target_fps)
+
+    def execute(self, context):
+        try:
+            scale, offset = self.retime_map()
+        except ValueError as e:
+            self.report({'ERROR'}, f"Invalid retime settings: {e}")
+            return {'CANCELLED'}
+
+        if self.target == 'TEXT':
+            return self.retime_text_block(scale, offset)
+
+        sequencer = context.scene.sequence_editor
+        strips = selected_text_strips(sequencer) if sequencer else []
+        if not strips:
+            self.report({'WARNING'}, "No selected text strips to retime.")
+            return {'CANCELLED'}
+        moved, dropped = retime_strips(strips, render_frame_rate(context.scene.render), scale, offset)
+        for strip in dropped:
+            remove_strip(sequencer, strip)
+        message = f"Retimed {moved} of {len(strips)} selected subtitles"
+        if dropped:
+            self.report({'WARNING'}, f"{message}; removed {len(dropped)} that would end before zero.")
+        else:
+            self.report({'INFO'}, f"{message}.")
+        return {'FINISHED'}
+
+    def retime_text_block(self, scale, offset):
+        text_block = bpy.data.texts.get(self.text_block_name)
+        if not text_block:
+            self.report({'ERROR'}, f"No text block named '{self.text_block_name}' found.")
+            return {'CANCELLED'}
+
+        # Parse with the block's own codec so markup and settings survive
+        codec = get_codec(text_block_format(text_block))
+        document = codec.parse(text_block_lines(text_block))
+        if not document.cues:
+            self.report({'WARNING'}, "No valid subtitles found in the text block.")
+            return {'CANCELLED'}
+        count = len(document)
+        document.cues = retime_cues(document.cues, scale, offset)
+        dropped = count - len(document)
+
+        rewrite_text_block(text_block, codec, document)
+        message = f"Retimed {len(document)} subtitles in '{text_block.name}'"
+        if dropped:
+            self.report({'WARNING'}, f"{message}; dropped {dropped} that would end before zero.")
+        else:
+            self.report({'INFO'}, f"{message}.")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "target")
+        if self.target == 'TEXT':
+            layout.prop_search(self, "text_block_name", bpy.data, "texts", text="Text Block")
+        layout.prop(self, "mode")
+        if self.mode == 'OFFSET':
+            layout.prop(self, "offset_ms")
+        elif self.mode == 'STRETCH':
+            layout.prop(self, "stretch")
+            layout.prop(self, "anchor")
+        elif self.mode == 'SYNC':
+            col = layout.column(align=True)
+            col.prop(self, "sync_source_a")
+            col.prop(self, "sync_target_a")
+            col = layout.column(align=True)
+            col.prop(self, "sync_source_b")
+            col.prop(self, "sync_target_b")
+        else:
+            row = layout.row(align=True)
+            row.prop(self, "source_fps")
+            row.prop(self, "target_fps")
+
+def sound_strip_envelope(strip):
+    """Return the RMS envelope ``(rms, step_ms)`` of a sound strip's audio file.
+
+    PCM WAV files are streamed with the wave module; anything else is
+    decoded to mono at AUDIO_DECODE_RATE with Blender's audio library.
+    """
+    sound = strip.sound
+    path = bpy.path.abspath(sound.filepath, library=sound.library)
+    if path.lower().endswith(".wav"):
+        try:
+            return cached_envelope(path, wav_envelope)
+        except (wave.Error, ValueError):
+            pass  # e.g. float WAV: decode it like other formats
+    return cached_envelope(path, decode_envelope)
+
+
+def decode_envelope(path):
+    """Return the RMS envelope of a sound file, decoded AUDIO_DECODE_SECONDS at a time."""
+    import aud
+    sound = aud.Sound(path).rechannel(1).resample(AUDIO_DECODE_RATE)
+
+    def chunks():
+        start = 0
+        while True:
+            data = sound.limit(start, start + AUDIO_DECODE_SECONDS).data()
+            if not len(data):
+                return
+            yield data
+            start += AUDIO_DECODE_SECONDS
+    return chunked_envelope(chunks(), AUDIO_DECODE_RATE)
+
+
+class VSESnapSubtitlesToAudioOperator(bpy.types.Operator):
+    """Snap subtitle starts and ends to the nearest speech onsets and offsets in an audio track"""
+    bl_idname = "vse.snap_subtitles_to_audio"
+    bl_label = "Snap Subtitles to Audio"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    target: bpy.props.EnumProperty(
+        name="Apply To",
+        items=[
+            ('STRIPS', "Selected Strips", "Snap the selected text strips"),
+            ('TEXT', "Text Block", "Snap the cues of a subtitle text block"),
+        ],
+        default='STRIPS',
+    )
+    text_block_name: bpy.props.StringProperty(name="Text Block Name")
+    audio_source: bpy.props.EnumProperty(
+        name="Audio",
+        items=[
+            ('STRIP', "Sound Strip", "Use the audio of a sound strip, at its place in the timeline"),
+            ('FILE', "WAV File", "Use a WAV file that starts at frame 0"),
+        ],
+        default='STRIP',
+    )
+    sound_strip_name: bpy.props.StringProperty(name="Sound Strip")
+    filepath: bpy.props.StringProperty(name="WAV File", subtype='FILE_PATH')
+    tolerance_ms: bpy.props.IntProperty(
+        name="Tolerance (ms)",
+        default=300,
+        min=0,
+        description="Largest distance a start or end is moved to reach speech",
+    )
+    threshold_db: bpy.props.FloatProperty(
+        name="Threshold (dB)",
+        default=12.0,
+        min=1.0,
+        max=60.0,
+        description="How much louder than the background noise speech is",
+    )
+    min_silence_ms: bpy.props.IntProperty(
+        name="Min Pause (ms)",
+        default=150,
+        min=0,
+        description="Shorter pauses count as part of the speech around them",
+    )
+    min_speech_ms: bpy.props.IntProperty(
+        name="Min Speech (ms)",
+        default=100,
+        min=0,
+        description="Shorter sounds are ignored",
+    )
+
+    def find_speech(self, context, profile):
+        """Return speech ``(onsets, offsets)`` in scene milliseconds (OSError, ValueError on bad audio)."""
+        rate = render_frame_rate(context.scene.render)
+        offset_ms = 0
+        visible = None
+        if self.audio_source == 'FILE':
+            path = bpy.path.abspath(self.filepath)
+            with profile.stage("audio"):
+                rms, step_ms = cached_envelope(path, wav_envelope)
+        else:
+            sequencer = context.scene.sequence_editor
+            strip = sequencer.sequences_all.get(self.sound_strip_name) if sequencer else None
+            if strip is None or strip.type != 'SOUND':
+                raise ValueError(f"No sound strip named '{self.sound_strip_name}'")
+            with profile.stage("audio"):
+                rms, step_ms = sound_strip_envelope(strip)
+            # Audio time 0 plays at the strip's (untrimmed) start
+            offset_ms = frame_to_ms(int(strip.frame_start), rate)
+            visible = (frame_to_ms(strip.frame_final_start, rate), frame_to_ms(strip.frame_final_end, rate))
+        profile.count("windows", len(rms))
+
+        with profile.stage("detect"):
+            onsets, offsets = speech_boundaries(
+                rms, step_ms, self.threshold_db, self.min_silence_ms, self.min_speech_ms,
+            )
+            onsets += offset_ms
+            offsets += offset_ms
+            if visible is not None:
+                onsets = onsets[(onsets >= visible[0]) & (onsets <= visible[1])]
+                offsets = offsets[(offsets >= visible[0]) & (offsets <= visible[1])]
+        return onsets, offsets
+
+    def execute(self, context):
+        if not HAS_NUMPY:
+            self.report({'ERROR'}, "Snapping to audio needs NumPy.")
+            return {'CANCELLED'}
+
+        profile = start_profile(context, "Snap subtitles to audio")
+        try:
+            onsets, offsets = self.find_speech(context, profile)
+        except (OSError, ValueError, wave.Error) as e:
+            self.report({'ERROR'}, f"Could not read the audio: {e}")
+            return {'CANCELLED'}
+        if not len(onsets):
+            self.report({'WARNING'}, "No speech found in the audio.")
+            return {'CANCELLED'}
+
+        if self.target == 'TEXT':
+            result = self.snap_text_block(onsets, offsets, profile)
+        else:
+            result = self.snap_selected_strips(context, onsets, offsets, profile)
+        if result == {'FINISHED'}:
+            finish_profile(self, context, profile)
+        return result
+
+    def snap_selected_strips(self, context, onsets, offsets, profile):
+        sequencer = context.scene.sequence_editor
+        strips = selected_text_strips(sequencer) if sequencer else []
+        if not strips:
+            self.report({'WARNING'}, "No selected text strips to snap.")
+            return {'CANCELLED'}
+        with profile.stage("snap"):
+            moved = snap_strips(strips, render_frame_rate(context.scene.render), onsets, offsets, self.tolerance_ms)
+        self.report({'INFO'}, f"Snapped {moved} of {len(strips)} selected subtitles to {len(onsets)} speech regions.")
+        return {'FINISHED'}
+
+    def snap_text_block(self, onsets, offsets, profile):
+        text_block = bpy.data.texts.get(self.text_block_name)
+        if not text_block:
+            self.report({'ERROR'}, f"No text block named '{self.text_block_name}' found.")
+            return {'CANCELLED'}
+
+        # Parse with the block's own codec so markup and settings survive
+        codec = get_codec(text_block_format(text_block))
+        with profile.stage("parse"):
+            document = codec.parse(text_block_lines(text_block))
+        if not document.cues:
+            self.report({'WARNING'}, "No valid subtitles found in the text block.")
+            return {'CANCELLED'}
+        with profile.stage("snap"):
+            changed = snap_cues(document.cues, onsets, offsets, self.tolerance_ms)
+
+        with profile.stage("write"):
+            rewrite_text_block(text_block, codec, document)
+        self.report({'INFO'}, f"Snapped {changed} of {len(document)} subtitles in '{text_block.name}'.")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        sequencer = context.scene.sequence_editor
+        if sequencer and not self.sound_strip_name:
+            sounds = [strip for strip in sequencer.sequences_all if strip.type == 'SOUND']
+            if sounds:
+                self.sound_strip_name = min(sounds, key=attrgetter("channel", "frame_final_start")).name
+        return context.window_manager.invoke_props_dialog(self)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "target")
+        if self.target == 'TEXT':
+            layout.prop_search(self, "text_block_name", bpy.data, "texts", text="Text Block")
+        layout.prop(self, "audio_source")
+        sequencer = context.scene.sequence_editor
+        if self.audio_source == 'FILE':
+            layout.prop(self, "filepath")
+        elif sequencer:
+            layout.prop_search(self, "sound_strip_name", sequencer, "sequences_all", text="Sound Strip")
+        layout.prop(self, "tolerance_ms")
+        col = layout.column(align=True)
+        col.prop(self, "threshold_db")
+        col.prop(self, "min_silence_ms")
+        col.prop(self, "min_speech_ms")
+
+class VSE_MT_subtitle_menu(bpy.types.Menu):
+    """Subtitles Menu for VSE"""
+    bl_label = "Subtitles"
+    bl_idname = "VSE_MT_subtitle_menu"
+
+    def draw(self, context):
+        layout = self.layout
+        layout.operator("vse.import_subtitles", text="Import Subtitles", icon='TRACKING_REFINE_BACKWARDS')
+        op = layout.operator("vse.import_subtitle_tracks", text="Import Subtitle Tracks (Files)", icon='FILE_FOLDER')
+        op.source_type = 'FILES'
+        op = layout.operator("vse.import_subtitle_tracks", text="Import Subtitle Tracks (Text Blocks)", icon='TEXT')
+        op.source_type = 'TEXT_BLOCKS'
+        layout.operator("vse.export_subtitles", text="Export Subtitles", icon='TRACKING_REFINE_FORWARDS')
+        op = layout.operator("vse.export_subtitles", text="Export Subtitles to File", icon='EXPORT')
+        op.export_to_file = True
+        layout.operator("vse.export_subtitle_tracks", text="Export All Subtitle Tracks", icon='FILE_FOLDER')
+        layout.separator()
+        layout.operator("vse.retime_subtitles", text="Retime Subtitles", icon='TIME')
+        layout.operator("vse.snap_subtitles_to_audio", text="Snap Subtitles to Audio", icon='SOUND')
+
+def draw_subtitle_menu(self, context):
+    """Add Subtitles menu to the Sequencer menu bar."""
+    self.layout.menu(VSE_MT_subtitle_menu.bl_idname)
+
+@persistent
+def clear_text_stats(*args):
+    """Drop cached footer statistics when text blocks may change behind the cursor."""
+    clear_caches()
+    clear_track_indexes()
+    qc_results.clear()
+
+@persistent
+def update_subtitle_tracks(scene, *args):
+    """Show the cue under the playhead on every subtitle track strip."""
+    update_tracks(scene)
+
+# ----------------------- Preferences ------------------------
+
+class SubtitleEditorPreferences(bpy.types.AddonPreferences):
+    bl_idname = __package__
+
+    use_parse_cache: bpy.props.BoolProperty(
+        name="Cache Parsed Subtitles",
+        default=True,
+        description="Keep parsed subtitles on disk so re-importing an unchanged file skips parsing"
+    )
+    cache_location: bpy.props.EnumProperty(
+        name="Cache Location",
+        items=[
+            ('USER', "User Cache", "Shared cache in the add-on's user directory"),
+            ('BLEND', "Next to .blend File", f"'{BLEND_CACHE_DIR}' folder next to the saved .blend file "
+                                             "(the user cache is used while the file is unsaved)"),
+        ],
+        default='USER',
+    )
+    cache_size: bpy.props.IntProperty(
+        name="Cache Size (MB)",
+        default=256,
+        min=16,
+        description="Least recently used entries are removed when the cache grows beyond this"
+    )
+    profile_output: bpy.props.EnumProperty(
+        name="Profile Output",
+        description="File written for every import and export run, to attach to bug reports",
+        items=[
+            ('NONE', "None", "Only report stage timings"),
+            ('TRACE', "JSON Trace", "Stage timeline in Chrome trace format (chrome://tracing, Perfetto)"),
+            ('CPROFILE', "cProfile", "Python profiler statistics (.prof, for pstats or snakeviz)"),
+            ('BOTH', "JSON Trace and cProfile", "Write both files"),
+        ],
+        default='NONE',
+    )
+    profile_directory: bpy.props.StringProperty(
+        name="Profile Folder",
+        subtype='DIR_PATH',
+        description="Where profile files are written (default: the add-on's user directory)"
+    )
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "use_parse_cache")
+        col = layout.column()
+        col.active = self.use_parse_cache
+        col.prop(self, "cache_location")
+        row = col.row()
+        row.prop(self, "cache_size")
+        row.operator(SUBTITLE_OT_clear_parse_cache.bl_idname, icon='TRASH')
+        layout.separator()
+        layout.prop(self, "profile_output")
+        col = layout.column()
+        col.active = self.profile_output != 'NONE'
+        col.prop(self, "profile_directory")
+
+
+def addon_preferences(context):
+    addon = context.preferences.addons.get(__package__)
+    return addon.preferences if addon else None
+
+
+def user_directory(name):
+    """Return a folder for add-on data in the user's Blender directory."""
+    try:
+        return bpy.utils.extension_path_user(__package__, path=name, create=True)
+    except (AttributeError, ValueError):
+        # Legacy add-on install (not an extension)
+        return os.path.join(bpy.utils.user_resource('DATAFILES'), "b_subeditor", name)
+
+
+def parse_cache_directory(preferences):
+    if preferences.cache_location == 'BLEND' and bpy.data.filepath:
+        return os.path.join(os.path.dirname(bpy.data.filepath), BLEND_CACHE_DIR)
+    return user_directory("parse_cache")
+
+
+def start_profile(context, name):
+    """Return a RunProfile recording what the preferences ask for."""
+    preferences = addon_preferences(context)
+    output = preferences.profile_output if preferences else 'NONE'
+    return RunProfile(name, trace=output in {'TRACE', 'BOTH'}, cprofile=output in {'CPROFILE', 'BOTH'})
+
+
+def finish_profile(operator, context, profile):
+    """Stop a run's clock, report its stage timings and write the requested profile files."""
+    profile.finish()
+    operator.report({'INFO'}, profile.summary())
+    preferences = addon_preferences(context)
+    if preferences is not None and preferences.profile_output != 'NONE':
+        directory = bpy.path.abspath(preferences.profile_directory) or user_directory("profiles")
+        try:
+            for path in profile.write_reports(directory):
+                operator.report({'INFO'}, f"Profile written to: {path}")
+        except OSError as e:
+            operator.report({'WARNING'}, f"Could not write profile: {e}")
+    for area in context.screen.areas if context.screen else ():
+        if area.type in {'TEXT_EDITOR', 'SEQUENCE_EDITOR'}:
+            area.tag_redraw()
+
+
+def parse_cache(context):
+    """Return the ParseCache set up in the preferences, or None when disabled."""
+    preferences = addon_preferences(context)
+    if preferences is None or not preferences.use_parse_cache:
+        return None
+    return ParseCache(parse_cache_directory(preferences), preferences.cache_size * 1024 * 1024)
+
+
+class SUBTITLE_OT_clear_parse_cache(bpy.types.Operator):
+    """Delete all cached parsed subtitles in the current cache location"""
+    bl_idname = "subtitle.clear_parse_cache"
+    bl_label = "Clear Cache"
+
+    def execute(self, context):
+        preferences = addon_preferences(context)
+        if preferences is None:
+            return {'CANCELLED'}
+        cache = ParseCache(parse_cache_directory(preferences))
+        count = len(cache.entries())
+        cache.clear()
+        self.report({'INFO'}, f"Removed {count} cached subtitle file(s).")
+        return {'FINISHED'}
+
+# ----------------------- Registration ------------------------
+
+classes = (
+    SUBTITLE_OT_import,
+    SUBTITLE_OT_export,
+    TextInfoSettings,
+    SubtitleQCSettings,
+    SUBTITLE_OT_check,
+    SUBTITLE_OT_fix,
+    SUBTITLE_OT_jump_to_line,
+    SUBTITLE_OT_jump_to_strip,
+    TEXT_HT_footer,
+    TEXT_Pannel,
+    TEXT_PT_subtitle_qc,
+    TEXT_PT_subtitle_timing,
+    SEQUENCER_PT_subtitle_timing,
+    VSEImportSubtitlesOperator,
+    SubtitleTrackItem,
+    VSEImportSubtitleTracksOperator,
+    VSEExportSubtitlesOperator,
+    VSEExportSubtitleTracksOperator,
+    VSERetimeSubtitlesOperator,
+    VSESnapSubtitlesToAudioOperator,
+    VSE_MT_subtitle_menu,
+    SUBTITLE_OT_clear_parse_cache,
+    SubtitleEditorPreferences,
+)
+
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+    bpy.types.TEXT_MT_text.append(menu_func_sub)
+    bpy.types.SEQUENCER_MT_editor_menus.append(draw_subtitle_menu)
+    bpy.types.Scene.text_info_settings = bpy.props.PointerProperty(type=TextInfoSettings)
+    bpy.types.Scene.subtitle_qc_settings = bpy.props.PointerProperty(type=SubtitleQCSettings)
+    for handlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post, bpy.app.handlers.load_post):
+        handlers.append(clear_text_stats)
+    bpy.app.handlers.frame_change_pre.append(update_subtitle_tracks)
+
+
+def unregister():
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
+    bpy.types.TEXT_MT_text.remove(menu_func_sub)
+    bpy.types.SEQUENCER_MT_editor_menus.remove(draw_subtitle_menu)
+    del bpy.types.Scene.text_info_settings
+    del bpy.types.Scene.subtitle_qc_settings
+    for handlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post, bpy.app.handlers.load_post):
+        if clear_text_stats in handlers:
+            handlers.remove(clear_text_stats)
+    if update_subtitle_tracks in bpy.app.handlers.frame_change_pre:
+        bpy.app.handlers.frame_change_pre.remove(update_subtitle_tracks)
+    clear_track_indexes()
+    clear_caches()
+    clear_parsers()
+    clear_envelopes()
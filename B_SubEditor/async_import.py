@@ -0,0 +1,135 @@
+"""Background import jobs.
+
+A job runs its ``load`` function (file reading, decoding, parsing) in a
+worker thread, then feeds the result to an ``apply`` generator from a
+``bpy.app.timers`` callback. The generator does one bounded chunk of work
+per step (text block writes, strip creation) and yields the fraction done,
+and every timer tick runs steps until its time budget is spent, so Blender
+keeps redrawing while large files come in.
+
+Operators mix in BackgroundImportMixin to wrap a job in an Esc-cancellable
+modal loop that reports progress through the window manager.
+"""
+
+import threading
+import time
+
+import bpy
+
+# Seconds of main-thread work per timer tick
+TICK_BUDGET = 0.02
+TICK_INTERVAL = 0.01
+POLL_INTERVAL = 0.05
+
+
+class BackgroundJob:
+    """Load in a worker thread, then apply in bounded chunks on the main thread.
+
+    ``load(job)`` runs in the thread and returns a payload; it may check
+    ``job.cancelled`` and set ``job.progress`` (0-1). ``apply(payload)`` is a
+    generator run on the main thread that yields its own progress (0-1) and
+    returns the job result.
+    """
+
+    def __init__(self, load, apply, load_share=0.3):
+        self.load = load
+        self.apply = apply
+        self.load_share = load_share  # part of the progress bar used by loading
+        self.progress = 0.0
+        self.payload = None
+        self.result = None
+        self.error = None
+        self.done = False
+        self.cancelled = False
+        self._steps = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        try:
+            self.payload = self.load(self)
+        except Exception as e:
+            self.error = e
+
+    def start(self):
+        self._thread.start()
+        bpy.app.timers.register(self.tick, first_interval=POLL_INTERVAL)
+
+    def tick(self):
+        """Timer callback; returns the delay to the next tick or None when finished."""
+        if self.cancelled or self.done:
+            return None
+        if self._thread.is_alive():
+            return POLL_INTERVAL
+        if self.error is not None:
+            self.done = True
+            return None
+
+        try:
+            if self._steps is None:
+                self._steps = self.apply(self.payload)
+            deadline = time.perf_counter() + TICK_BUDGET
+            while time.perf_counter() < deadline:
+                fraction = next(self._steps)
+                self.progress = self.load_share + (1.0 - self.load_share) * fraction
+        except StopIteration as stop:
+            self.result = stop.value
+            self.progress = 1.0
+            self.done = True
+            return None
+        except Exception as e:
+            self.error = e
+            self.done = True
+            return None
+        return TICK_INTERVAL
+
+    def cancel(self):
+        """Stop applying further chunks; work already applied is kept."""
+        self.cancelled = True
+        if bpy.app.timers.is_registered(self.tick):
+            bpy.app.timers.unregister(self.tick)
+
+
+class BackgroundImportMixin:
+    """Modal wrapper for a BackgroundJob; Esc cancels.
+
+    Subclasses call ``start_job`` from ``execute`` and implement
+    ``job_finished(context, result)`` returning the operator result.
+    """
+
+    _job = None
+    _timer = None
+
+    def start_job(self, context, job):
+        self._job = job
+        wm = context.window_manager
+        wm.progress_begin(0, 100)
+        self._timer = wm.event_timer_add(0.1, window=context.window)
+        wm.modal_handler_add(self)
+        job.start()
+        return {'RUNNING_MODAL'}
+
+    def end_job(self, context):
+        wm = context.window_manager
+        wm.progress_end()
+        if self._timer is not None:
+            wm.event_timer_remove(self._timer)
+            self._timer = None
+
+    def modal(self, context, event):
+        job = self._job
+        if event.type == 'ESC':
+            job.cancel()
+            self.end_job(context)
+            self.report({'WARNING'}, "Subtitle import cancelled")
+            return {'CANCELLED'}
+
+        if event.type == 'TIMER':
+            context.window_manager.progress_update(int(job.progress * 100))
+            if job.done:
+                self.end_job(context)
+                if job.error is not None:
+                    self.report({'ERROR'}, f"Subtitle import failed: {job.error}")
+                    return {'CANCELLED'}
+                return self.job_finished(context, job.result)
+
+        return {'PASS_THROUGH'}
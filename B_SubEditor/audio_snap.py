@@ -0,0 +1,212 @@
+"""Snapping of subtitle timings to speech in an audio track.
+
+The audio is reduced to an RMS energy envelope of one value per
+ENVELOPE_STEP_MS window, computed with NumPy a chunk at a time so a
+two-hour mix never sits in memory at once. Windows louder than the noise
+floor (a low percentile of the envelope) by ``threshold_db`` count as
+speech; short pauses inside speech and short bursts of noise are ignored.
+The starts and ends of the speech regions are the onsets and offsets every
+cue start and end snaps to, when one lies within the tolerance.
+
+WAV files are read with the standard library ``wave`` module; other
+formats are decoded by the caller (e.g. with Blender's ``aud``) and passed
+in as sample arrays, or as a stream of chunks for long recordings.
+"""
+
+import os
+import wave
+
+from .retime import MIN_DURATION_MS, frames_to_ms, ms_to_frames, place_strips
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAS_NUMPY = np is not None
+
+# Length of one envelope window
+ENVELOPE_STEP_MS = 10
+# Envelope windows per chunk read from a WAV file (about 40 s at 10 ms)
+CHUNK_WINDOWS = 4096
+# Percentile of the envelope taken as the noise floor
+NOISE_PERCENTILE = 10
+# Envelopes kept for repeated snaps of the same audio
+MAX_ENVELOPES = 4
+
+# Full-scale value of PCM samples by sample width in bytes
+PCM_SCALE = {1: 128.0, 2: 32768.0, 3: 8388608.0, 4: 2147483648.0}
+
+_envelopes = {}
+
+
+def decode_pcm(data, sample_width):
+    """Decode little-endian PCM bytes into float32 samples, not yet scaled (see PCM_SCALE)."""
+    if sample_width == 1:
+        # 8-bit WAV is unsigned
+        return np.frombuffer(data, dtype=np.uint8).astype(np.float32) - 128.0
+    if sample_width == 2:
+        return np.frombuffer(data, dtype="<i2").astype(np.float32)
+    if sample_width == 3:
+        raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        samples = raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)
+        # Sign-extend from 24 bits
+        return ((samples << 8) >> 8).astype(np.float32)
+    if sample_width == 4:
+        return np.frombuffer(data, dtype="<i4").astype(np.float32)
+    raise ValueError(f"Unsupported WAV sample width: {sample_width * 8} bits")
+
+
+def window_power(samples, size):
+    """Return the mean square of every ``size`` interleaved samples.
+
+    A last, partial window is padded with silence.
+    """
+    remainder = len(samples) % size
+    if remainder:
+        samples = np.concatenate((samples, np.zeros(size - remainder, dtype=samples.dtype)))
+    windows = samples.reshape(-1, size)
+    # Row-wise dot products avoid a squared copy of the samples
+    return np.einsum("ij,ij->i", windows, windows) / size
+
+
+def wav_envelope(path, step_ms=ENVELOPE_STEP_MS):
+    """Return ``(rms, step_ms)`` for a PCM WAV file, read a chunk at a time.
+
+    ``step_ms`` comes back exact for the file's sample rate.
+    """
+    with wave.open(path, "rb") as wav:
+        channels = wav.getnchannels()
+        sample_width = wav.getsampwidth()
+        rate = wav.getframerate()
+        window = max(rate * step_ms // 1000, 1)
+        chunks = []
+        while True:
+            data = wav.readframes(window * CHUNK_WINDOWS)
+            if not data:
+                break
+            chunks.append(window_power(decode_pcm(data, sample_width), window * channels))
+    power = np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.float32)
+    return np.sqrt(power) / PCM_SCALE[sample_width], window * 1000 / rate
+
+
+def samples_envelope(samples, rate, step_ms=ENVELOPE_STEP_MS):
+    """Return ``(rms, step_ms)`` for an array of samples, shaped (frames,) or (frames, channels)."""
+    samples = np.asarray(samples, dtype=np.float32)
+    channels = samples.shape[1] if samples.ndim == 2 else 1
+    window = max(int(rate * step_ms // 1000), 1)
+    return np.sqrt(window_power(samples.reshape(-1), window * channels)), window * 1000 / rate
+
+
+def chunked_envelope(chunks, rate, step_ms=ENVELOPE_STEP_MS):
+    """Return ``(rms, step_ms)`` for mono samples that arrive in chunks of any size.
+
+    Only one chunk is held at a time; samples left at the end of a chunk
+    carry over into the next window.
+    """
+    window = max(int(rate * step_ms // 1000), 1)
+    powers = []
+    carry = np.zeros(0, dtype=np.float32)
+    for chunk in chunks:
+        samples = np.concatenate((carry, np.asarray(chunk, dtype=np.float32).reshape(-1)))
+        whole = len(samples) - len(samples) % window
+        if whole:
+            powers.append(window_power(samples[:whole], window))
+        carry = samples[whole:]
+    if len(carry):
+        powers.append(window_power(carry, window))
+    power = np.concatenate(powers) if powers else np.zeros(0, dtype=np.float32)
+    return np.sqrt(power), window * 1000 / rate
+
+
+def cached_envelope(path, load):
+    """Return ``load(path)``, reusing the result while the file is unchanged."""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    envelope = _envelopes.pop(key, None)
+    if envelope is None:
+        envelope = load(path)
+        while len(_envelopes) >= MAX_ENVELOPES:
+            del _envelopes[next(iter(_envelopes))]
+    _envelopes[key] = envelope
+    return envelope
+
+
+def clear_envelopes():
+    _envelopes.clear()
+
+
+def speech_boundaries(rms, step_ms, threshold_db=12.0, min_silence_ms=150, min_speech_ms=100):
+    """Return ``(onsets, offsets)``: sorted speech start and end times in milliseconds.
+
+    Pauses shorter than ``min_silence_ms`` are bridged and speech shorter
+    than ``min_speech_ms`` is dropped.
+    """
+    empty = np.zeros(0, dtype=np.int64)
+    if not len(rms):
+        return empty, empty
+    level = 20 * np.log10(np.maximum(rms, 1e-10))
+    speech = level > np.percentile(level, NOISE_PERCENTILE) + threshold_db
+
+    edges = np.diff(speech.astype(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if len(starts) > 1:
+        keep = (starts[1:] - ends[:-1]) * step_ms >= min_silence_ms
+        starts = np.concatenate((starts[:1], starts[1:][keep]))
+        ends = np.concatenate((ends[:-1][keep], ends[-1:]))
+    keep = (ends - starts) * step_ms >= min_speech_ms
+    return (
+        np.rint(starts[keep] * step_ms).astype(np.int64),
+        np.rint(ends[keep] * step_ms).astype(np.int64),
+    )
+
+
+def snap_times(times, targets, tolerance_ms):
+    """Move every time to the nearest target within ``tolerance_ms``; others stay."""
+    times = np.asarray(times, dtype=np.int64)
+    if not len(targets):
+        return times.copy()
+    position = np.searchsorted(targets, times)
+    before = targets[np.maximum(position - 1, 0)]
+    after = targets[np.minimum(position, len(targets) - 1)]
+    nearest = np.where(times - before <= after - times, before, after)
+    return np.where(np.abs(nearest - times) <= tolerance_ms, nearest, times)
+
+
+def snap_arrays(starts, ends, onsets, offsets, tolerance_ms):
+    """Return snapped ``(starts, ends)``: starts to onsets, ends to offsets.
+
+    An end that would no longer follow its start keeps its old time (or
+    the shortest duration, MIN_DURATION_MS).
+    """
+    ends = np.asarray(ends, dtype=np.int64)
+    new_starts = snap_times(starts, onsets, tolerance_ms)
+    new_ends = snap_times(ends, offsets, tolerance_ms)
+    new_ends = np.where(new_ends > new_starts, new_ends, np.maximum(ends, new_starts + MIN_DURATION_MS))
+    return new_starts, new_ends
+
+
+def snap_cues(cues, onsets, offsets, tolerance_ms):
+    """Snap every cue of a CueStore in place; returns the number of cues changed."""
+    starts, ends = cues.as_numpy()
+    new_starts, new_ends = snap_arrays(starts, ends, onsets, offsets, tolerance_ms)
+    changed = int(np.count_nonzero((new_starts != starts) | (new_ends != ends)))
+    starts[:] = new_starts
+    ends[:] = new_ends
+    return changed
+
+
+def snap_strips(strips, rate, onsets, offsets, tolerance_ms):
+    """Snap text strips in bulk (see retime.place_strips); returns the number moved.
+
+    ``rate`` is the exact scene frame rate as a Fraction.
+    """
+    if not strips:
+        return 0
+    starts = [strip.frame_final_start for strip in strips]
+    ends = [strip.frame_final_end for strip in strips]
+    new_starts_ms, new_ends_ms = snap_arrays(
+        frames_to_ms(starts, rate), frames_to_ms(ends, rate), onsets, offsets, tolerance_ms,
+    )
+    return place_strips(strips, starts, ends, ms_to_frames(new_starts_ms, rate), ms_to_frames(new_ends_ms, rate))
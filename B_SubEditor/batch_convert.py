@@ -0,0 +1,163 @@
+"""Convert directory trees of subtitle files without the Blender UI.
+
+Files are parsed and written by the bpy-free codecs, one file per task in
+a process pool, so a large delivery converts on every core. Run it as::
+
+    python -m B_SubEditor.batch_convert SOURCE TARGET --to vtt
+    blender -b --python B_SubEditor/batch_convert.py -- SOURCE TARGET --to vtt
+
+SOURCE may be a single file or a directory; directories are walked
+recursively and mirrored under TARGET with the new extension.
+"""
+
+if __name__ == "__main__" and not __package__:
+    # Run as a plain script (e.g. from blender --python): import the package
+    # so the relative imports resolve, and let worker processes find this
+    # module by its package name
+    import importlib
+    import os
+    import sys
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    sys.path.insert(0, os.path.dirname(package_dir))
+    module = importlib.import_module(os.path.basename(package_dir) + ".batch_convert")
+    __spec__ = module.__spec__
+    sys.exit(module.main())
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .subtitle_formats import CODECS, EXTENSIONS, codec_for_path, get_codec
+from .subtitle_reader import iter_subtitle_lines
+from .subtitle_writer import write_subtitle_stream
+
+# Files handed to a worker process at a time
+TASK_CHUNK_SIZE = 8
+
+
+def convert_file(task):
+    """Convert one file; returns ``(source, cues, malformed, bytes_read, seconds, error)``.
+
+    ``malformed`` lists the ``(line, message)`` of blocks that could not be
+    read. A file without any valid cue is a failure and nothing is written.
+    Runs in a worker process, so failures are returned rather than raised.
+    """
+    source, target, target_format, sort = task
+    start = time.perf_counter()
+    malformed = []
+    try:
+        document = codec_for_path(source).parse(iter_subtitle_lines(source), malformed)
+        if not document.cues:
+            error = f"no valid subtitles ({len(malformed)} malformed block(s))" if malformed else "no valid subtitles"
+            return source, 0, malformed, 0, time.perf_counter() - start, error
+        if sort and not document.cues.is_sorted():
+            document.cues.sort_by_start()
+        os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+        blocks = get_codec(target_format).iter_blocks(document.iter_cues(), document.header, document.format)
+        write_subtitle_stream(target, blocks)
+        return source, len(document), malformed, os.path.getsize(source), time.perf_counter() - start, None
+    except Exception as e:
+        return source, 0, malformed, 0, time.perf_counter() - start, f"{type(e).__name__}: {e}"
+
+
+def iter_tasks(source, target, target_format, extensions, overwrite=False, sort=False):
+    """Yield a task for every convertible file under ``source``."""
+    target_extension = get_codec(target_format).extensions[0]
+    if os.path.isfile(source):
+        if os.path.isdir(target) or not os.path.splitext(target)[1]:
+            name = os.path.splitext(os.path.basename(source))[0] + target_extension
+            target = os.path.join(target, name)
+        if overwrite or not os.path.exists(target):
+            yield source, target, target_format, sort
+        return
+
+    for folder, _, names in os.walk(source):
+        relative = os.path.relpath(folder, source)
+        out_folder = os.path.normpath(os.path.join(target, relative))
+        for name in sorted(names):
+            if os.path.splitext(name)[1].lower() not in extensions:
+                continue
+            out_path = os.path.join(out_folder, os.path.splitext(name)[0] + target_extension)
+            if overwrite or not os.path.exists(out_path):
+                yield os.path.join(folder, name), out_path, target_format, sort
+
+
+def run_tasks(tasks, jobs):
+    """Yield the result of every task, in a process pool unless ``jobs`` is 1."""
+    if jobs == 1 or len(tasks) < 2:
+        yield from map(convert_file, tasks)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(convert_file, tasks, chunksize=TASK_CHUNK_SIZE)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="batch_convert",
+        description="Convert subtitle files between SRT, VTT, SBV, ASS and TXT.",
+    )
+    parser.add_argument("source", help="subtitle file or directory to convert")
+    parser.add_argument("target", help="output directory (or file for a single source file)")
+    parser.add_argument("--to", dest="format", required=True, type=str.upper,
+                        choices=sorted(CODECS), help="output format")
+    parser.add_argument("--from", dest="formats", nargs="+", type=str.upper, choices=sorted(CODECS),
+                        help="only convert files of these formats (default: all known extensions)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: number of CPUs)")
+    parser.add_argument("--overwrite", action="store_true", help="replace existing output files")
+    parser.add_argument("--sort", action="store_true", help="sort cues by start time before writing")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    if argv is None:
+        # Blender passes script arguments after "--"
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    args = parse_args(argv)
+
+    if args.formats:
+        extensions = {ext for name in args.formats for ext in get_codec(name).extensions}
+    else:
+        extensions = set(EXTENSIONS)
+    if not os.path.exists(args.source):
+        print(f"Source not found: {args.source}")
+        return 1
+
+    tasks = list(iter_tasks(args.source, args.target, args.format, extensions, args.overwrite, args.sort))
+    if not tasks:
+        print("No subtitle files to convert.")
+        return 0
+
+    start = time.perf_counter()
+    failures = 0
+    warnings = 0
+    total_cues = 0
+    total_bytes = 0
+    for source, cues, malformed, size, _, error in run_tasks(tasks, max(1, args.jobs)):
+        if error:
+            failures += 1
+            print(f"Failed: {source}: {error}")
+            continue
+        if malformed:
+            warnings += 1
+            line, message = malformed[0]
+            print(f"Warning: {source}: skipped {len(malformed)} malformed block(s), first at line {line}: {message}")
+        total_cues += cues
+        total_bytes += size
+    elapsed = max(time.perf_counter() - start, 1e-9)
+
+    # Files written with malformed blocks skipped still count as converted
+    converted = len(tasks) - failures
+    problems = f" ({warnings} with malformed blocks skipped)" if warnings else ""
+    if failures:
+        problems += f", {failures} failed"
+    print(f"Converted {converted}/{len(tasks)} files to {args.format}{problems} "
+          f"({total_cues} cues, {total_bytes / 1048576:.1f} MB) in {elapsed:.2f}s: "
+          f"{converted / elapsed:.1f} files/s, {total_cues / elapsed:.0f} cues/s")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
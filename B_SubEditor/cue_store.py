@@ -0,0 +1,183 @@
+"""Compact column store for subtitle cues.
+
+Timings are kept as integer milliseconds in ``array`` buffers, text is kept
+in a shared string table and styles (and partial style spans) are interned
+as tuples, so a file with 100k cues costs a few arrays instead of 100k
+tuples and style dicts.
+"""
+
+from array import array
+
+# Order of the fields in an interned style tuple
+STYLE_KEYS = (
+    "use_bold",
+    "use_italic",
+    "use_box",
+    "font_size",
+    "color",
+    "wrap_width",
+    "location[1]",
+)
+
+DEFAULT_STYLE = (False, False, False, 40, "", 0.8, 0.15)
+
+# Per-cue columns, kept in the same order by sorting and slicing
+COLUMNS = ("starts", "ends", "text_ids", "style_ids", "span_ids", "setting_ids", "lines")
+
+
+def style_to_tuple(styles):
+    """Convert a styles dict (as built by process_srt_styles) to a style tuple."""
+    return tuple(styles.get(key, default) for key, default in zip(STYLE_KEYS, DEFAULT_STYLE))
+
+
+class CueStore:
+    """Column-oriented container of cues.
+
+    Indexing returns ``(start_ms, end_ms, text, style_id)``; slicing returns a
+    new store that shares the text and style tables with this one.
+    """
+
+    __slots__ = (
+        "starts", "ends", "text_ids", "style_ids", "span_ids", "setting_ids", "lines",
+        "texts", "styles", "spans", "_text_index", "_style_index", "_span_index",
+    )
+
+    def __init__(self, texts=None, styles=None, spans=None):
+        self.starts = array("q")
+        self.ends = array("q")
+        self.text_ids = array("l")
+        self.style_ids = array("l")
+        self.span_ids = array("l")  # partial style spans (see style_lexer), 0 for none
+        self.setting_ids = array("l")  # format-specific cue settings in the text table, -1 for none
+        self.lines = array("l")  # source line of each cue, 0 when unknown
+
+        # Shared tables; slices and sorted copies reuse them
+        if texts is None:
+            texts = ([], {})
+        if styles is None:
+            styles = ([DEFAULT_STYLE], {DEFAULT_STYLE: 0})
+        if spans is None:
+            spans = ([()], {(): 0})
+        self.texts, self._text_index = texts
+        self.styles, self._style_index = styles
+        self.spans, self._span_index = spans
+
+    def intern_text(self, text):
+        """Return the string table ID for ``text``, adding it if new."""
+        text_id = self._text_index.get(text)
+        if text_id is None:
+            text_id = len(self.texts)
+            self.texts.append(text)
+            self._text_index[text] = text_id
+        return text_id
+
+    def intern_style(self, style):
+        """Return the style table ID for a style tuple, adding it if new."""
+        style_id = self._style_index.get(style)
+        if style_id is None:
+            style_id = len(self.styles)
+            self.styles.append(style)
+            self._style_index[style] = style_id
+        return style_id
+
+    def intern_spans(self, spans):
+        """Return the span table ID for a tuple of style spans, adding it if new."""
+        span_id = self._span_index.get(spans)
+        if span_id is None:
+            span_id = len(self.spans)
+            self.spans.append(spans)
+            self._span_index[spans] = span_id
+        return span_id
+
+    def append(self, start_ms, end_ms, text, style=DEFAULT_STYLE, line=0, settings=None, spans=()):
+        """Add a cue; ``style`` is a style tuple (see STYLE_KEYS).
+
+        ``settings`` is an optional format-specific string, such as WebVTT
+        cue settings or an ASS style name. ``spans`` holds styling that covers
+        only part of the text, as produced by style_lexer.lex_markup.
+        """
+        self.starts.append(start_ms)
+        self.ends.append(end_ms)
+        self.text_ids.append(self.intern_text(text))
+        self.style_ids.append(self.intern_style(style))
+        self.span_ids.append(self.intern_spans(spans) if spans else 0)
+        self.setting_ids.append(-1 if settings is None else self.intern_text(settings))
+        self.lines.append(line)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __bool__(self):
+        return len(self.starts) > 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(range(*index.indices(len(self))))
+        return (
+            self.starts[index],
+            self.ends[index],
+            self.texts[self.text_ids[index]],
+            self.style_ids[index],
+        )
+
+    def __iter__(self):
+        texts = self.texts
+        return zip(
+            self.starts,
+            self.ends,
+            (texts[i] for i in self.text_ids),
+            self.style_ids,
+        )
+
+    def text(self, index):
+        return self.texts[self.text_ids[index]]
+
+    def style(self, index):
+        return self.styles[self.style_ids[index]]
+
+    def cue_spans(self, index):
+        return self.spans[self.span_ids[index]]
+
+    def settings(self, index):
+        setting_id = self.setting_ids[index]
+        return None if setting_id < 0 else self.texts[setting_id]
+
+    def style_dict(self, style_id):
+        """Return the style with the given ID as a dict keyed by STYLE_KEYS."""
+        return dict(zip(STYLE_KEYS, self.styles[style_id]))
+
+    def take(self, indices):
+        """Return a new store with the cues at ``indices``, sharing tables."""
+        store = CueStore(
+            (self.texts, self._text_index),
+            (self.styles, self._style_index),
+            (self.spans, self._span_index),
+        )
+        for column in COLUMNS:
+            source = getattr(self, column)
+            getattr(store, column).extend(source[i] for i in indices)
+        return store
+
+    def is_sorted(self):
+        starts = self.starts
+        return all(starts[i] <= starts[i + 1] for i in range(len(starts) - 1))
+
+    def sort_by_start(self):
+        """Stable in-place sort of all columns by start time."""
+        if self.is_sorted():
+            return
+        order = sorted(range(len(self)), key=self.starts.__getitem__)
+        for column in COLUMNS:
+            source = getattr(self, column)
+            setattr(self, column, array(source.typecode, (source[i] for i in order)))
+
+    def as_numpy(self):
+        """Return (starts, ends) as NumPy views over the buffers, or None without NumPy.
+
+        The store cannot grow while the views are alive.
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            return None
+        return np.frombuffer(self.starts, dtype=np.int64), np.frombuffer(self.ends, dtype=np.int64)
@@ -0,0 +1,119 @@
+"""Incremental re-parsing of SRT text.
+
+SRT cues are separated by blank lines, so the text splits into blocks
+that parse independently. An IncrementalParser keeps the parsed cues of
+every block keyed by the block's text; parsing the text again after an
+edit splits it (a C-level regex scan) and only parses blocks whose text is
+new, so a one-character change re-parses one cue. Files are split with a
+CueOffsetIndex and their blocks keyed by their raw bytes, so only changed
+blocks are even decoded.
+"""
+
+import re
+import threading
+
+from .cue_store import CueStore
+from .srt_parser import iter_srt_cues
+from .subtitle_core import iter_clean_cues
+from .subtitle_reader import CueOffsetIndex
+
+# One or more blank (or whitespace-only) lines
+BLOCK_SEPARATOR_RE = re.compile(r"\n(?:[^\S\n]*\n)+")
+
+# Text blocks with an incremental parser, e.g. keyed by text block pointer
+MAX_PARSERS = 16
+
+
+def iter_text_blocks(content):
+    """Yield ``(first_line, block)`` for the blank-line separated blocks of a string.
+
+    ``first_line`` is 1-based; whitespace-only blocks are skipped.
+    """
+    line = 1
+    position = 0
+    for match in BLOCK_SEPARATOR_RE.finditer(content):
+        block = content[position:match.start()]
+        if block.strip():
+            yield line, block
+        line += block.count("\n") + match.group().count("\n")
+        position = match.end()
+    block = content[position:]
+    if block.strip():
+        yield line, block
+
+
+def parse_block(block):
+    """Parse one SRT block into ``(cues, errors)`` with block-relative line numbers."""
+    errors = []
+    cues = tuple(iter_clean_cues(iter_srt_cues(block, errors)))
+    return cues, tuple(errors)
+
+
+class IncrementalParser:
+    """Parses SRT text, reusing the parse of every block seen in the previous run."""
+
+    __slots__ = ("blocks", "reparsed")
+
+    def __init__(self):
+        self.blocks = {}  # block text (or bytes) -> (cues, errors)
+        self.reparsed = 0  # blocks parsed by the last run
+
+    def parse(self, content, errors=None):
+        """Parse SRT text into a CueStore, like parse_subtitle_data."""
+        return self.parse_blocks(iter_text_blocks(content), str, errors)
+
+    def parse_file(self, file_path, errors=None):
+        """Parse an SRT file into a CueStore, decoding only blocks not seen before."""
+        index = CueOffsetIndex(file_path)
+        return self.parse_blocks(index.iter_raw_blocks(), index.decode, errors)
+
+    def parse_blocks(self, blocks, decode, errors=None):
+        """Parse ``(first_line, block)`` pairs; ``decode(block)`` gives the text of a new block."""
+        previous = self.blocks
+        parsed_blocks = {}
+        reparsed = 0
+        store = CueStore()
+        append = store.append
+        for first_line, block in blocks:
+            parsed = parsed_blocks.get(block)
+            if parsed is None:
+                parsed = previous.get(block)
+                if parsed is None:
+                    parsed = parse_block(decode(block))
+                    reparsed += 1
+                parsed_blocks[block] = parsed
+
+            offset = first_line - 1
+            block_cues, block_errors = parsed
+            for start, end, text, style, line, spans in block_cues:
+                append(start, end, text, style, line + offset, spans=spans)
+            if block_errors and errors is not None:
+                errors.extend((line + offset, message) for line, message in block_errors)
+
+        # Blocks no longer in the text are dropped
+        self.blocks = parsed_blocks
+        self.reparsed = reparsed
+        return store
+
+
+_parsers = {}
+# Multi-track imports look parsers up from several threads
+_parsers_lock = threading.Lock()
+
+
+def incremental_parser(key):
+    """Return the IncrementalParser kept for ``key``, creating it on first use."""
+    with _parsers_lock:
+        parser = _parsers.pop(key, None)
+        if parser is None:
+            parser = IncrementalParser()
+            while len(_parsers) >= MAX_PARSERS:
+                # Drop the least recently used parser
+                del _parsers[next(iter(_parsers))]
+        _parsers[key] = parser
+    return parser
+
+
+def clear_parsers():
+    with _parsers_lock:
+        _parsers.clear()
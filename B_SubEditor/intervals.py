@@ -0,0 +1,103 @@
+"""Static interval index and channel packing.
+
+Intervals are half-open ``[start, end)`` in any integer unit (milliseconds
+for cues, frames for strips). The index is an implicit balanced tree over
+the intervals sorted by start, where every node stores the largest end in
+its subtree, so stabbing and overlap queries cost O(log n + k).
+"""
+
+from array import array
+
+
+class IntervalIndex:
+    """Immutable index over half-open intervals.
+
+    Queries return the ``ids`` given at construction (positions by default).
+    """
+
+    __slots__ = ("starts", "ends", "ids", "max_ends")
+
+    def __init__(self, starts, ends, ids=None):
+        if ids is None:
+            ids = range(len(starts))
+        order = sorted(range(len(starts)), key=starts.__getitem__)
+        self.starts = array("q", (starts[i] for i in order))
+        self.ends = array("q", (ends[i] for i in order))
+        self.ids = [ids[i] for i in order]
+        self.max_ends = array("q", bytes(8 * len(order)))
+        if order:
+            self._build(0, len(order))
+
+    def _build(self, lo, hi):
+        mid = (lo + hi) // 2
+        best = self.ends[mid]
+        if lo < mid:
+            best = max(best, self._build(lo, mid))
+        if mid + 1 < hi:
+            best = max(best, self._build(mid + 1, hi))
+        self.max_ends[mid] = best
+        return best
+
+    def __len__(self):
+        return len(self.starts)
+
+    def _search(self, a, b, first_only=False):
+        """Return sorted positions of intervals with start < b and end > a."""
+        starts, ends, max_ends = self.starts, self.ends, self.max_ends
+        found = []
+        stack = [(0, len(starts))]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            # Prune subtrees that end before the query starts
+            if max_ends[mid] <= a:
+                continue
+            stack.append((lo, mid))
+            # Nodes right of one starting at or after b start later still
+            if starts[mid] < b:
+                if ends[mid] > a:
+                    found.append(mid)
+                    if first_only:
+                        break
+                stack.append((mid + 1, hi))
+        found.sort()
+        return found
+
+    def overlapping(self, a, b):
+        """Return ids of intervals overlapping ``[a, b)`` in start order."""
+        ids = self.ids
+        return [ids[i] for i in self._search(a, b)]
+
+    def at(self, t):
+        """Return ids of intervals active at ``t`` (start <= t < end)."""
+        return self.overlapping(t, t + 1)
+
+    def any_overlap(self, a, b):
+        """Return True if anything overlaps ``[a, b)``."""
+        return bool(self._search(a, b, first_only=True))
+
+
+def pack_channels(starts, ends, base_channel, occupied=None, max_channel=128):
+    """Assign each interval the lowest channel >= ``base_channel`` where it fits.
+
+    ``starts``/``ends`` must be sorted by start. ``occupied`` optionally maps
+    channel numbers to an IntervalIndex of what already sits there. Without
+    obstacles this first-fit sweep uses the minimum number of channels.
+    Returns an ``array`` of channel numbers, one per interval.
+    """
+    occupied = occupied or {}
+    last_end = {}  # channel -> end of the last interval placed on it
+    channels = array("l")
+    for start, end in zip(starts, ends):
+        channel = base_channel
+        while channel < max_channel:
+            if last_end.get(channel, start) <= start:
+                index = occupied.get(channel)
+                if index is None or not index.any_overlap(start, end):
+                    break
+            channel += 1
+        last_end[channel] = max(last_end.get(channel, end), end)
+        channels.append(channel)
+    return channels
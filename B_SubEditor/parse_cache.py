@@ -0,0 +1,346 @@
+"""Persistent on-disk cache of parsed subtitles.
+
+Parsed cues are written as one compact binary file per source: a short
+JSON header (source identity, tables of styles, spans and parse errors)
+followed by the raw CueStore column buffers and the cue texts as one UTF-8
+blob with an offset array. Loading an entry is a few ``frombytes`` calls
+and one decode, so re-importing a large unchanged file skips parsing.
+
+Files are keyed by path and validated by size and modification time,
+falling back to a content hash when only the time changed. Text block
+content is keyed by its hash alone. The cache directory is kept under a
+size budget by evicting the least recently used entries.
+"""
+
+import json
+import os
+import tempfile
+from array import array
+from contextlib import closing
+from hashlib import blake2b
+
+from .cue_store import COLUMNS, CueStore
+from .incremental_parse import incremental_parser
+from .profiling import NO_PROFILE
+from .subtitle_core import parse_subtitle_data
+from .subtitle_formats import codec_for_path, detect_format
+from .subtitle_reader import iter_subtitle_lines
+
+MAGIC = b"BSUBCUE1"
+# Bump when parsing changes, so stale entries are ignored
+CACHE_VERSION = 1
+ENTRY_EXTENSION = ".cues"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+HASH_CHUNK = 1024 * 1024
+# Directory created next to a .blend file for the "store with .blend" option
+BLEND_CACHE_DIR = "subtitle_cache"
+
+COLUMN_TYPES = {column: getattr(CueStore(), column).typecode for column in COLUMNS}
+
+
+def content_hash(data):
+    """Return the hex content hash of a str or bytes."""
+    if isinstance(data, str):
+        data = data.encode("utf-8", errors="surrogatepass")
+    return blake2b(data, digest_size=16).hexdigest()
+
+
+def file_hash(file_path):
+    digest = blake2b(digest_size=16)
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def dump_cues(cues, meta):
+    """Serialise a CueStore and an identity dict into bytes."""
+    texts = cues.texts
+    encoded = [text.encode("utf-8", errors="surrogatepass") for text in texts]
+    # Text boundaries as byte offsets into the blob
+    offsets = array("q", [0])
+    position = 0
+    for text in encoded:
+        position += len(text)
+        offsets.append(position)
+
+    columns = [getattr(cues, column) for column in COLUMNS]
+    header = dict(meta)
+    header.update({
+        "version": CACHE_VERSION,
+        "count": len(cues),
+        "itemsizes": [column.itemsize for column in columns],
+        "text_count": len(texts),
+        "styles": cues.styles,
+        "spans": cues.spans,
+    })
+    header = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    parts = [MAGIC, len(header).to_bytes(4, "little"), header]
+    parts.extend(column.tobytes() for column in columns)
+    parts.append(offsets.tobytes())
+    parts.extend(encoded)
+    return b"".join(parts)
+
+
+def read_header(data):
+    """Return the JSON header of an entry and the offset of its first column, or None."""
+    if data[:len(MAGIC)] != MAGIC:
+        return None
+    start = len(MAGIC) + 4
+    length = int.from_bytes(data[len(MAGIC):start], "little")
+    try:
+        header = json.loads(bytes(data[start:start + length]))
+    except ValueError:
+        return None
+    if header.get("version") != CACHE_VERSION:
+        return None
+    return header, start + length
+
+
+def load_cues(data, header, position):
+    """Rebuild a CueStore from an entry's bytes."""
+    count = header["count"]
+    columns = []
+    for column, itemsize in zip(COLUMNS, header["itemsizes"]):
+        values = array(COLUMN_TYPES[column])
+        if values.itemsize != itemsize:
+            return None  # written on a platform with other C type sizes
+        end = position + count * itemsize
+        values.frombytes(data[position:end])
+        columns.append(values)
+        position = end
+
+    text_count = header["text_count"]
+    offsets = array("q")
+    end = position + (text_count + 1) * offsets.itemsize
+    offsets.frombytes(data[position:end])
+    blob = bytes(data[end:])
+    texts = [
+        blob[offsets[i]:offsets[i + 1]].decode("utf-8", errors="surrogatepass")
+        for i in range(text_count)
+    ]
+
+    styles = [tuple(style) for style in header["styles"]]
+    spans = [tuple(tuple(span) for span in entry) for entry in header["spans"]]
+    store = CueStore(
+        (texts, {text: i for i, text in enumerate(texts)}),
+        (styles, {style: i for i, style in enumerate(styles)}),
+        (spans, {entry: i for i, entry in enumerate(spans)}),
+    )
+    for column, values in zip(COLUMNS, columns):
+        setattr(store, column, values)
+    return store
+
+
+class ParseCache:
+    """A directory of cached parse results with a size budget."""
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def entry_path(self, key):
+        return os.path.join(self.directory, blake2b(key.encode("utf-8"), digest_size=16).hexdigest() + ENTRY_EXTENSION)
+
+    def _read(self, path):
+        try:
+            with open(path, 'rb') as file:
+                data = file.read()
+        except OSError:
+            return None, None, None
+        parsed = read_header(data)
+        if parsed is None:
+            return None, None, None
+        header, position = parsed
+        return data, header, position
+
+    def _load(self, path, data, header, position):
+        cues = load_cues(data, header, position)
+        if cues is None:
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        return cues, [tuple(error) for error in header.get("errors", ())]
+
+    def _write(self, path, cues, meta):
+        os.makedirs(self.directory, exist_ok=True)
+        # A unique name per write, so concurrent writers (threads or
+        # processes) never share a temporary file
+        with tempfile.NamedTemporaryFile(dir=self.directory, suffix=".tmp", delete=False) as file:
+            temporary = file.name
+            try:
+                file.write(dump_cues(cues, meta))
+            except BaseException:
+                file.close()
+                os.remove(temporary)
+                raise
+        os.replace(temporary, path)
+        self.prune()
+
+    def get_file(self, file_path, format=None):
+        """Return ``(cues, errors)`` cached for a subtitle file, or None.
+
+        Size and modification time must match; when only the time differs,
+        the file's content hash decides. ``format``, if given, must match
+        the format the entry was parsed as.
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        path = self.entry_path(f"file:{os.path.abspath(file_path)}")
+        data, header, position = self._read(path)
+        if header is None or header.get("size") != stat.st_size:
+            return None
+        if format is not None and header.get("format") != format:
+            return None
+        if header.get("mtime_ns") != stat.st_mtime_ns:
+            if header.get("hash") != file_hash(file_path):
+                return None
+        return self._load(path, data, header, position)
+
+    def put_file(self, file_path, format, cues, errors=()):
+        stat = os.stat(file_path)
+        meta = {
+            "format": format,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "hash": file_hash(file_path),
+            "errors": list(errors),
+        }
+        self._write(self.entry_path(f"file:{os.path.abspath(file_path)}"), cues, meta)
+
+    def get_text(self, content, format):
+        """Return ``(cues, errors)`` cached for subtitle text (e.g. a text block), or None."""
+        path = self.entry_path(f"text:{content_hash(content)}:{format}")
+        data, header, position = self._read(path)
+        if header is None:
+            return None
+        return self._load(path, data, header, position)
+
+    def put_text(self, content, format, cues, errors=()):
+        meta = {"format": format, "errors": list(errors)}
+        self._write(self.entry_path(f"text:{content_hash(content)}:{format}"), cues, meta)
+
+    def entries(self):
+        """Return ``(path, size, mtime)`` of every entry."""
+        try:
+            scanned = list(os.scandir(self.directory))
+        except OSError:
+            return []
+        entries = []
+        for entry in scanned:
+            if entry.name.endswith(ENTRY_EXTENSION):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def prune(self):
+        """Delete least recently used entries until the directory fits the budget."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return 0
+        removed = 0
+        for path, size, _ in sorted(entries, key=lambda entry: entry[2]):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+            if total <= self.max_bytes:
+                break
+        return removed
+
+    def clear(self):
+        for path, _, _ in self.entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def cached_parse(cache, content, format, parse, profile=NO_PROFILE):
+    """Return ``(cues, errors)`` for subtitle text, using ``cache`` when given.
+
+    ``parse(content, errors)`` does the actual parse on a miss. Cache
+    failures never stop an import.
+    """
+    if cache is not None:
+        with profile.stage("cache"):
+            try:
+                hit = cache.get_text(content, format)
+            except Exception as e:
+                print(f"Subtitle cache read failed: {e}")
+                hit = None
+        if hit is not None:
+            profile.count("cached cues", len(hit[0]))
+            return hit
+
+    errors = []
+    cues = parse(content, errors)
+    if cache is not None and cues:
+        with profile.stage("cache"):
+            try:
+                cache.put_text(content, format, cues, errors)
+            except Exception as e:
+                print(f"Subtitle cache write failed: {e}")
+    return cues, errors
+
+
+def load_subtitle_file(file_path, cache=None, format=None, profile=NO_PROFILE):
+    """Read and parse a subtitle file; returns ``(cues, errors)``.
+
+    With a cache, an unchanged file is loaded without reading or parsing
+    it. ``format`` defaults to the format detected from the content, then
+    from the extension, as for text blocks. The file is streamed line by
+    line into the parser; SRT files go through an IncrementalParser kept
+    per path, so re-importing an edited file only decodes and parses the
+    cue blocks that changed.
+    """
+    if cache is not None:
+        with profile.stage("cache"):
+            try:
+                hit = cache.get_file(file_path, format)
+            except Exception as e:
+                print(f"Subtitle cache read failed: {e}")
+                hit = None
+        if hit is not None:
+            profile.count("cached cues", len(hit[0]))
+            return hit
+
+    try:
+        size = os.path.getsize(file_path)
+        if format is None and size:
+            with closing(iter_subtitle_lines(file_path)) as lines:
+                codec = codec_for_path(file_path)
+                format = detect_format(lines) or (codec.name if codec else 'SRT')
+    except Exception as e:
+        print(f"Error reading file: {e}")
+        return None, []
+    if not size:
+        return None, []
+    profile.count("bytes", size)
+
+    errors = []
+    if format == 'SRT':
+        parser = incremental_parser(("file", os.path.abspath(file_path)))
+        with profile.stage("parse"):
+            cues = parser.parse_file(file_path, errors)
+        profile.count("reparsed blocks", parser.reparsed)
+        profile.count("cues", len(cues))
+    else:
+        cues = parse_subtitle_data(iter_subtitle_lines(file_path), errors, format, profile)
+    if cache is not None and cues:
+        with profile.stage("cache"):
+            try:
+                cache.put_file(file_path, format, cues, errors)
+            except Exception as e:
+                print(f"Subtitle cache write failed: {e}")
+    return cues, errors
@@ -0,0 +1,219 @@
+"""Per-stage timing and counters for import and export runs.
+
+A RunProfile times named stages (file decoding, parsing, style lexing,
+strip creation, ...) and counts cues, strips and bytes. Stage times are
+exclusive: time spent in a nested stage or a timed call is not counted
+again in the stage around it, so the stages of a run add up to its total.
+
+Optionally a run records a JSON trace (Chrome trace event format, opens in
+chrome://tracing or Perfetto) and cProfile statistics, written next to
+each other for bug reports. Recent runs are kept for the sidebar panels.
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+# Runs kept for display
+RECENT_RUNS = 10
+
+recent_runs = deque(maxlen=RECENT_RUNS)
+
+
+class NullProfile:
+    """Stand-in that records nothing, for calls made without instrumentation."""
+
+    def stage(self, name):
+        return nullcontext()
+
+    def timed(self, name, func):
+        return func
+
+    def count(self, name, amount=1):
+        pass
+
+    def profiled(self, func):
+        return func
+
+    def profiled_steps(self, steps):
+        return steps
+
+
+NO_PROFILE = NullProfile()
+
+
+class RunProfile(NullProfile):
+    """Stage times and counters of one operator run.
+
+    Not meant for concurrent use: stages may run in a worker thread and
+    later on the main thread, but not in both at once.
+    """
+
+    def __init__(self, name, trace=False, cprofile=False):
+        self.name = name
+        self.created = time.time()
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+        self.stages = {}  # stage name -> exclusive seconds, in first-use order
+        self.counts = {}
+        self.events = [] if trace else None
+        self.profilers = [] if cprofile else None
+        self._nested = []  # seconds spent in nested stages, per open stage
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        self._nested.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed - self._nested.pop()
+            if self._nested:
+                self._nested[-1] += elapsed
+            if self.events is not None:
+                self.events.append({
+                    "name": name,
+                    "ph": "X",
+                    "ts": (started - self.started) * 1e6,
+                    "dur": elapsed * 1e6,
+                    "pid": os.getpid(),
+                    "tid": threading.get_ident(),
+                })
+
+    def timed(self, name, func):
+        """Wrap a function called many times (per cue or strip) to add its time to a stage."""
+        stages = self.stages
+        nested = self._nested
+
+        def timed_call(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                stages[name] = stages.get(name, 0.0) + elapsed
+                if nested:
+                    nested[-1] += elapsed
+        return timed_call
+
+    def count(self, name, amount=1):
+        self.counts[name] = self.counts.get(name, 0) + amount
+
+    def profiled(self, func):
+        """Wrap a function to run under cProfile when enabled."""
+        if self.profilers is None:
+            return func
+
+        def profiled_call(*args, **kwargs):
+            profiler = cProfile.Profile()
+            self.profilers.append(profiler)
+            profiler.enable()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.disable()
+        return profiled_call
+
+    def profiled_steps(self, steps):
+        """Run each step of a step generator under cProfile when enabled."""
+        if self.profilers is None:
+            return steps
+        return self._profiled_steps(steps)
+
+    def _profiled_steps(self, steps):
+        profiler = cProfile.Profile()
+        self.profilers.append(profiler)
+        while True:
+            profiler.enable()
+            try:
+                fraction = next(steps)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                profiler.disable()
+            yield fraction
+
+    def finish(self):
+        """Stop the clock and keep the run for display."""
+        self.seconds = time.perf_counter() - self.started
+        recent_runs.append(self)
+        return self
+
+    def rows(self):
+        """Return ``(stage, seconds, share of the total)`` for every stage."""
+        total = self.seconds or sum(self.stages.values()) or 1.0
+        return [(name, seconds, seconds / total) for name, seconds in self.stages.items()]
+
+    def summary(self):
+        stages = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.stages.items())
+        counts = ", ".join(format_count(name, value) for name, value in self.counts.items())
+        text = f"{self.name}: {self.seconds:.2f}s"
+        if stages:
+            text += f" ({stages})"
+        if counts:
+            text += f" | {counts}"
+        return text
+
+    def as_dict(self):
+        return {
+            "name": self.name,
+            "created": self.created,
+            "seconds": self.seconds,
+            "stages": self.stages,
+            "counts": self.counts,
+        }
+
+    def write_trace(self, path):
+        trace = {
+            "traceEvents": self.events or [],
+            "displayTimeUnit": "ms",
+            "otherData": self.as_dict(),
+        }
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(trace, file)
+
+    def write_cprofile(self, path):
+        profilers = [profiler for profiler in self.profilers or () if profiler.getstats()]
+        if not profilers:
+            return False
+        stats = pstats.Stats(profilers[0])
+        for profiler in profilers[1:]:
+            stats.add(profiler)
+        stats.dump_stats(path)
+        return True
+
+    def write_reports(self, directory):
+        """Write the recorded trace and cProfile stats to ``directory``; returns the paths."""
+        if self.events is None and self.profilers is None:
+            return []
+        os.makedirs(directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.created))
+        stem = os.path.join(directory, f"{re.sub(r'[^A-Za-z0-9_.-]+', '_', self.name)}-{stamp}")
+        paths = []
+        if self.events is not None:
+            self.write_trace(f"{stem}.json")
+            paths.append(f"{stem}.json")
+        if self.profilers is not None and self.write_cprofile(f"{stem}.prof"):
+            paths.append(f"{stem}.prof")
+        return paths
+
+
+def format_count(name, value):
+    if name == "bytes":
+        return format_bytes(value)
+    return f"{value} {name}"
+
+
+def format_bytes(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
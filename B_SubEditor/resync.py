@@ -0,0 +1,118 @@
+"""Incremental re-sync of a CueStore onto previously imported strips.
+
+Imported strips carry three custom properties: the text block they came
+from, a cue key (the cue's position in start order) and a content hash of
+timing, text and style. Re-syncing matches unchanged cues by hash first,
+then pairs leftovers by key, so an edit only touches the strips whose cues
+actually changed. Cues with partial styling also keep it as SRT markup,
+since a strip can only be styled as a whole.
+"""
+
+from hashlib import blake2b
+
+SOURCE_PROP = "b_sub_source"
+KEY_PROP = "b_sub_key"
+HASH_PROP = "b_sub_hash"
+MARKUP_PROP = "b_sub_markup"
+
+
+def cue_hash(start_ms, end_ms, text, style, spans=()):
+    """Return a short content hash for one cue."""
+    # Without spans the hash matches strips tagged before spans were tracked
+    content = (start_ms, end_ms, text, style, spans) if spans else (start_ms, end_ms, text, style)
+    return blake2b(repr(content).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def set_markup(strip, markup):
+    """Store the partially styled text of a strip, or clear it when ``markup`` is empty."""
+    if markup:
+        strip[MARKUP_PROP] = markup
+    elif strip.get(MARKUP_PROP) is not None:
+        del strip[MARKUP_PROP]
+
+
+def tag_strip(strip, source, key, content_hash):
+    """Record where a strip came from so it can be re-synced later."""
+    strip[SOURCE_PROP] = source
+    strip[KEY_PROP] = key
+    strip[HASH_PROP] = content_hash
+
+
+def diff_cues(existing, hashes):
+    """Work out the minimal set of changes between tagged strips and new cues.
+
+    ``existing`` is a list of ``(strip, key, hash)``; ``hashes`` holds one
+    hash per new cue, in start order (the cue key is the position). Returns
+    ``(updates, additions, removals, rekeys, unchanged)`` where ``updates``
+    and ``rekeys`` pair strips with cue positions, ``additions`` lists cue
+    positions and ``removals`` lists strips. ``rekeys`` are unchanged strips
+    whose cue moved to a new position.
+    """
+    by_hash = {}
+    for position, content_hash in enumerate(hashes):
+        by_hash.setdefault(content_hash, []).append(position)
+
+    # Unchanged cues: same content, wherever they moved to
+    matched = set()
+    leftover_strips = {}
+    rekeys = []
+    unchanged = 0
+    for strip, key, content_hash in existing:
+        positions = by_hash.get(content_hash)
+        if positions:
+            # Prefer the cue at the strip's own key among equal contents
+            position = key if key in positions else positions[-1]
+            positions.remove(position)
+            matched.add(position)
+            if position != key:
+                rekeys.append((strip, position))
+            unchanged += 1
+        else:
+            leftover_strips.setdefault(key, []).append(strip)
+
+    # Changed cues: reuse the strip that had the same key
+    updates = []
+    additions = []
+    for position in range(len(hashes)):
+        if position in matched:
+            continue
+        strips = leftover_strips.get(position)
+        if strips:
+            updates.append((strips.pop(), position))
+        else:
+            additions.append(position)
+
+    removals = [strip for strips in leftover_strips.values() for strip in strips]
+    return updates, additions, removals, rekeys, unchanged
+
+
+def tagged_strips(sequencer, source):
+    """Return ``(strip, key, hash)`` for every strip imported from ``source``."""
+    return [
+        (strip, strip.get(KEY_PROP, -1), strip.get(HASH_PROP, ""))
+        for strip in sequencer.sequences_all
+        if strip.type == 'TEXT' and strip.get(SOURCE_PROP) == source
+    ]
+
+
+def remove_strip(sequencer, strip):
+    """Remove a strip from the sequencer or from the meta strip holding it."""
+    parent_meta = getattr(strip, "parent_meta", None)
+    owner = parent_meta() if parent_meta else None
+    (owner or sequencer).sequences.remove(strip)
+
+
+def update_strip(strip, frame_start, frame_end, text, style, markup=None):
+    """Rewrite the timing, text and style of an existing TEXT strip."""
+    strip.frame_start = frame_start
+    strip.frame_final_duration = frame_end - frame_start
+    strip.name = text[:15]
+    strip.text = text
+    strip.use_bold = style["use_bold"]
+    strip.use_italic = style["use_italic"]
+    strip.use_box = style["use_box"]
+    strip.font_size = style["font_size"]
+    strip.color = style["color"]
+    strip.wrap_width = style["wrap_width"]
+    strip.location[1] = style["location[1]"]
+    set_markup(strip, markup)
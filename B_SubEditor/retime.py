@@ -0,0 +1,169 @@
+"""Vectorized retiming of subtitle cues and text strips.
+
+Every retime is an affine map ``t -> t * scale + offset`` on milliseconds:
+a plain offset, a linear stretch around an anchor, a two-point sync (two
+known source times moved to two target times) or a frame rate conversion.
+The map is applied to all start and end times in one NumPy operation and
+rounded back to integer milliseconds; a plain Python loop does the same
+when NumPy is not available. Cues pushed entirely before zero are dropped
+rather than piled up there.
+"""
+
+from array import array
+from fractions import Fraction
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .timebase import MAX_BASE_DENOMINATOR, iter_ms_to_frames
+
+# Shortest cue left by a retime, in milliseconds
+MIN_DURATION_MS = 1
+
+
+def offset_map(offset_ms):
+    return Fraction(1), Fraction(offset_ms)
+
+
+def stretch_map(factor, anchor_ms=0):
+    """Scale times by ``factor`` around ``anchor_ms``, which stays in place."""
+    factor = Fraction(factor).limit_denominator(1000000)
+    return factor, anchor_ms * (1 - factor)
+
+
+def sync_map(source_a, target_a, source_b, target_b):
+    """Move ``source_a`` to ``target_a`` and ``source_b`` to ``target_b``, linearly."""
+    if source_a == source_b:
+        raise ValueError("The two sync points need different source times")
+    scale = Fraction(target_b - target_a, source_b - source_a)
+    if scale <= 0:
+        raise ValueError("The sync points would reverse the subtitle order")
+    return scale, target_a - source_a * scale
+
+
+def framerate_map(source_fps, target_fps):
+    """Retime cues made for ``source_fps`` video to play in sync at ``target_fps``.
+
+    The same frame number falls at ``source_fps / target_fps`` times the
+    original time, e.g. a PAL (25 fps) speed-up played back at 23.976.
+    """
+    source = Fraction(source_fps).limit_denominator(MAX_BASE_DENOMINATOR)
+    target = Fraction(target_fps).limit_denominator(MAX_BASE_DENOMINATOR)
+    if source <= 0 or target <= 0:
+        raise ValueError("Frame rates must be positive")
+    return source / target, Fraction(0)
+
+
+def retime_arrays(starts, ends, scale, offset):
+    """Return retimed ``(starts, ends, kept)``, times as integer millisecond sequences.
+
+    Times are rounded to the nearest millisecond. ``kept`` lists the
+    positions of the cues still ending after zero; the others would fall
+    entirely before the start and are left for the caller to drop. A cue
+    straddling zero starts at zero, and every cue keeps at least
+    MIN_DURATION_MS.
+    """
+    if np is not None:
+        starts = np.rint(np.asarray(starts, dtype=np.float64) * float(scale) + float(offset))
+        ends = np.rint(np.asarray(ends, dtype=np.float64) * float(scale) + float(offset)).astype(np.int64)
+        kept = np.flatnonzero(ends > 0)
+        starts = np.maximum(starts, 0).astype(np.int64)
+        ends = np.maximum(ends, starts + MIN_DURATION_MS)
+        return starts, ends, kept
+
+    new_ends = [round(end * scale + offset) for end in ends]
+    kept = [i for i, end in enumerate(new_ends) if end > 0]
+    new_starts = [max(round(start * scale + offset), 0) for start in starts]
+    new_ends = [max(end, start + MIN_DURATION_MS) for end, start in zip(new_ends, new_starts)]
+    return new_starts, new_ends, kept
+
+
+def retime_cues(cues, scale, offset):
+    """Retime every cue of a CueStore in place.
+
+    Returns the cues left after dropping those that would end before zero:
+    ``cues`` itself when none do, else a new store (see CueStore.take).
+    """
+    new_starts, new_ends, kept = retime_arrays(cues.starts, cues.ends, scale, offset)
+    views = cues.as_numpy()
+    if views is not None:
+        views[0][:] = new_starts
+        views[1][:] = new_ends
+    else:
+        cues.starts = array("q", new_starts)
+        cues.ends = array("q", new_ends)
+    if len(kept) == len(cues):
+        return cues
+    return cues.take(kept)
+
+
+def frames_to_ms(frames, rate):
+    """Convert frame numbers to rounded milliseconds (see timebase.frame_to_ms)."""
+    numerator = rate.numerator
+    denominator = rate.denominator
+    if np is not None:
+        frames = np.asarray(frames, dtype=np.int64)
+        return (frames * 2000 * denominator + numerator) // (2 * numerator)
+    return [(frame * 2000 * denominator + numerator) // (2 * numerator) for frame in frames]
+
+
+def ms_to_frames(values, rate):
+    """Convert milliseconds to the nearest frames (see timebase.ms_to_frame)."""
+    if np is not None:
+        values = np.asarray(values, dtype=np.int64)
+        return (values * rate.numerator + rate.denominator * 500) // (rate.denominator * 1000)
+    return list(iter_ms_to_frames(values, rate))
+
+
+def retime_strips(strips, rate, scale, offset):
+    """Retime text strips in bulk; returns ``(moved, dropped)``.
+
+    Frames are converted to milliseconds with the exact frame rate ``rate``
+    (a Fraction), mapped, and converted back. ``dropped`` lists the strips
+    that would end before zero; they are not moved, for the caller to
+    remove.
+    """
+    if not strips:
+        return 0, []
+    starts = [strip.frame_final_start for strip in strips]
+    ends = [strip.frame_final_end for strip in strips]
+    new_starts_ms, new_ends_ms, kept = retime_arrays(
+        frames_to_ms(starts, rate), frames_to_ms(ends, rate), scale, offset,
+    )
+    new_starts = ms_to_frames(new_starts_ms, rate)
+    new_ends = ms_to_frames(new_ends_ms, rate)
+    kept = [int(i) for i in kept]
+    kept_set = set(kept)
+    dropped = [strip for i, strip in enumerate(strips) if i not in kept_set]
+    moved = place_strips(
+        [strips[i] for i in kept], [starts[i] for i in kept], [ends[i] for i in kept],
+        [new_starts[i] for i in kept], [new_ends[i] for i in kept],
+    )
+    return moved, dropped
+
+
+def place_strips(strips, starts, ends, new_starts, new_ends):
+    """Move strips from frames ``starts``/``ends`` to ``new_starts``/``new_ends``.
+
+    Strips moving earlier are placed first in start order and strips moving
+    later last in reverse order, so no strip is dropped onto one that has
+    not moved yet. Every strip keeps at least one frame. Returns the number
+    of strips moved.
+    """
+    new_starts = [int(frame) for frame in new_starts]
+    new_ends = [max(int(frame), start + 1) for frame, start in zip(new_ends, new_starts)]
+
+    order = sorted(range(len(strips)), key=starts.__getitem__)
+    earlier = [i for i in order if new_starts[i] <= starts[i]]
+    later = [i for i in reversed(order) if new_starts[i] > starts[i]]
+    moved = 0
+    for i in earlier + later:
+        strip = strips[i]
+        if new_starts[i] == starts[i] and new_ends[i] == ends[i]:
+            continue
+        strip.frame_start += new_starts[i] - strip.frame_final_start
+        strip.frame_final_duration = new_ends[i] - new_starts[i]
+        moved += 1
+    return moved
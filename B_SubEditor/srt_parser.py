@@ -0,0 +1,140 @@
+"""Streaming SRT parser.
+
+Walks subtitle input one line at a time and yields cues as soon as each
+block is complete, so memory stays flat regardless of file size. Works on
+plain strings, open file objects or any iterable of lines (for example the
+bodies of a Blender text block).
+"""
+
+import re
+from collections import namedtuple
+
+# Timecode line, tolerant of missing leading zeros, '.' instead of ',' and
+# trailing SRT position hints ("X1:... Y1:...").
+TIMING_RE = re.compile(
+    r"^\s*(\d+):(\d{1,2}):(\d{1,2})[,.](\d{1,3})"
+    r"\s*-->\s*"
+    r"(\d+):(\d{1,2}):(\d{1,2})[,.](\d{1,3})"
+)
+
+BOM = "\ufeff"
+
+# index: cue number from the file (None when the index line is missing)
+# start_ms/end_ms: integer milliseconds
+# line: 1-based line number of the cue's first line in the source
+SrtCue = namedtuple("SrtCue", "index start_ms end_ms text line")
+
+
+def iter_lines(source):
+    """Yield lines without line endings from a string, file or iterable of lines."""
+    if isinstance(source, str):
+        # Walk the string in place instead of splitlines() to avoid a second copy
+        pos = 0
+        length = len(source)
+        while pos < length:
+            end = source.find("\n", pos)
+            if end < 0:
+                end = length
+            yield source[pos:end].rstrip("\r")
+            pos = end + 1
+    else:
+        for line in source:
+            yield line.rstrip("\r\n")
+
+
+def match_to_ms(match, offset):
+    """Convert four timecode groups of a TIMING_RE match to milliseconds."""
+    h, m, s, ms = match.group(offset, offset + 1, offset + 2, offset + 3)
+    return ((int(h) * 60 + int(m)) * 60 + int(s)) * 1000 + int(ms.ljust(3, "0"))
+
+
+def ms_to_timecode(ms, separator=","):
+    """Format integer milliseconds as an SRT timecode (HH:MM:SS,mmm)."""
+    s, ms = divmod(ms, 1000)
+    m, s = divmod(s, 60)
+    h, m = divmod(m, 60)
+    return f"{h:02}:{m:02}:{s:02}{separator}{ms:03}"
+
+
+def iter_srt_cues(source, errors=None):
+    """Yield SrtCue tuples from SRT input without loading it all at once.
+
+    Blocks without a valid timecode line are skipped; when ``errors`` is a
+    list, ``(line_number, message)`` is appended for each of them. Blocks
+    made only of ``#`` lines (like the metadata header of SRT exports) are
+    comments and skipped silently.
+    """
+    index = None
+    start_ms = end_ms = None
+    text_lines = []
+    block_line = 0  # first line of the current block, 0 when between blocks
+    block_bad = False
+    block_comment = True  # every line of the block so far starts with '#'
+
+    def flush():
+        if start_ms is not None:
+            return SrtCue(index, start_ms, end_ms, "\n".join(text_lines), block_line)
+        if block_line and errors is not None and not block_comment:
+            errors.append((block_line, "Missing or malformed timecode line"))
+        return None
+
+    line_no = 0
+    for line in iter_lines(source):
+        line_no += 1
+        if line.startswith(BOM):
+            line = line.lstrip(BOM)
+        stripped = line.strip()
+
+        if not stripped:
+            cue = flush()
+            if cue is not None:
+                yield cue
+            index, start_ms, end_ms, text_lines = None, None, None, []
+            block_line, block_bad, block_comment = 0, False, True
+            continue
+
+        match = TIMING_RE.match(line)
+        if match:
+            if start_ms is not None or block_bad:
+                # New cue without a separating blank line; a trailing number
+                # in the previous text is the index of this one
+                new_index = None
+                new_line = line_no
+                if text_lines and text_lines[-1].strip().isdigit():
+                    new_index = int(text_lines.pop().strip())
+                    new_line = line_no - 1
+                if start_ms is not None:
+                    cue = flush()
+                    if cue is not None:
+                        yield cue
+                elif errors is not None and not all(text.lstrip().startswith("#") for text in text_lines):
+                    errors.append((block_line, "Missing or malformed timecode line"))
+                index, text_lines = new_index, []
+                block_line, block_bad, block_comment = new_line, False, True
+            elif not block_line:
+                block_line = line_no
+            start_ms = match_to_ms(match, 1)
+            end_ms = match_to_ms(match, 5)
+            continue
+
+        if start_ms is not None:
+            text_lines.append(line)
+            continue
+        if not stripped.startswith("#"):
+            block_comment = False
+        if not block_line:
+            # First line of a block: expect the index
+            block_line = line_no
+            if stripped.isdigit():
+                index = int(stripped)
+            else:
+                block_bad = True
+                text_lines.append(line)
+        else:
+            # Second non-timecode line before any timecode
+            block_bad = True
+            text_lines.append(line)
+
+    cue = flush()
+    if cue is not None:
+        yield cue
@@ -0,0 +1,265 @@
+"""Batched creation of VSE text strips.
+
+Strip creation through RNA is the slow part of a large import, so the work
+per strip is cut down to ``new_effect``, the text and only those style
+values that differ from the defaults of a fresh TEXT strip. Style values
+are resolved once per style group, and batches of strips can optionally be
+wrapped in meta strips to keep the timeline light.
+"""
+
+import time
+from array import array
+
+from .intervals import IntervalIndex, pack_channels
+from .profiling import NO_PROFILE
+from .resync import (
+    KEY_PROP, cue_hash, diff_cues, remove_strip, set_markup, tag_strip, tagged_strips, update_strip,
+)
+from .style_lexer import render_spans
+from .timebase import iter_ms_to_frames
+
+MAX_CHANNEL = 128
+
+# Style keys that map directly to TEXT strip properties
+STRIP_STYLE_ATTRS = ("use_bold", "use_italic", "use_box", "font_size", "color", "wrap_width")
+
+
+def deselect_all(sequencer):
+    """Deselect every strip with a single bulk call where possible."""
+    strips = sequencer.sequences_all
+    try:
+        strips.foreach_set("select", [False] * len(strips))
+    except (AttributeError, TypeError, RuntimeError):
+        for strip in strips:
+            if strip.select:
+                strip.select = False
+
+
+def read_strip_defaults(strip):
+    """Read the style values of a freshly created TEXT strip."""
+    defaults = {attr: getattr(strip, attr) for attr in STRIP_STYLE_ATTRS}
+    defaults["location"] = tuple(strip.location)
+    return defaults
+
+
+def style_changes(style, defaults):
+    """Return the (attribute, value) pairs of ``style`` that differ from ``defaults``."""
+    changes = []
+    for attr in STRIP_STYLE_ATTRS:
+        value = style[attr]
+        default = defaults[attr]
+        if attr == "color":
+            if tuple(default) != tuple(value):
+                changes.append((attr, tuple(value)))
+        elif default != value:
+            changes.append((attr, value))
+    location = (defaults["location"][0], style["location[1]"])
+    if location != defaults["location"]:
+        changes.append(("location", location))
+    return changes
+
+
+def cue_frame_ranges(cues, fps):
+    """Return (frame_starts, frame_ends) arrays for the cues of a CueStore.
+
+    ``fps`` may be a Fraction (see timebase.render_frame_rate); times are
+    rounded to the nearest frame. Every range is at least one frame long,
+    since TEXT strips cannot be empty.
+    """
+    frame_starts = array("q", iter_ms_to_frames(cues.starts, fps))
+    frame_ends = array("q", (
+        max(frame, start + 1)
+        for frame, start in zip(iter_ms_to_frames(cues.ends, fps), frame_starts)
+    ))
+    return frame_starts, frame_ends
+
+
+def existing_channel_index(sequencer, first_channel, last_channel):
+    """Build an IntervalIndex of the strip frame ranges on each channel in a range."""
+    ranges = {}
+    for strip in sequencer.sequences:
+        if first_channel <= strip.channel <= last_channel:
+            ranges.setdefault(strip.channel, ([], []))
+            ranges[strip.channel][0].append(strip.frame_final_start)
+            ranges[strip.channel][1].append(strip.frame_final_end)
+    return {channel: IntervalIndex(starts, ends) for channel, (starts, ends) in ranges.items()}
+
+
+def pack_cue_channels(sequencer, cues, channel, fps):
+    """Place overlapping cues on the fewest extra channels above ``channel``.
+
+    ``cues`` is sorted by start in place. Strips already in the sequencer
+    count as obstacles. Returns an array of channels, one per cue.
+    """
+    cues.sort_by_start()
+    frame_starts, frame_ends = cue_frame_ranges(cues, fps)
+    occupied = existing_channel_index(sequencer, channel, MAX_CHANNEL)
+    return pack_channels(frame_starts, frame_ends, channel, occupied, MAX_CHANNEL)
+
+
+def pack_batch_channels(sequencer, cues, channel, fps, batch_size, auto_channels=False):
+    """Place the meta strip of every batch of ``batch_size`` cues, and optionally the cues in it.
+
+    ``cues`` is sorted by start in place. Each meta spans its batch's frames
+    and takes the lowest free channel from ``channel`` up, with strips
+    already in the sequencer and earlier metas as obstacles. With
+    ``auto_channels`` the cues of a batch are packed against each other
+    only, since nothing else sits inside a new meta. Returns
+    ``(meta_channels, cue_channels)``, ``cue_channels`` None without
+    ``auto_channels``.
+    """
+    cues.sort_by_start()
+    frame_starts, frame_ends = cue_frame_ranges(cues, fps)
+    firsts = range(0, len(cues), batch_size)
+    meta_starts = array("q", (frame_starts[first] for first in firsts))
+    meta_ends = array("q", (max(frame_ends[first:first + batch_size]) for first in firsts))
+    occupied = existing_channel_index(sequencer, channel, MAX_CHANNEL)
+    meta_channels = pack_channels(meta_starts, meta_ends, channel, occupied, MAX_CHANNEL)
+
+    cue_channels = None
+    if auto_channels:
+        cue_channels = array("l")
+        for first in firsts:
+            stop = first + batch_size
+            cue_channels.extend(
+                pack_channels(frame_starts[first:stop], frame_ends[first:stop], channel, max_channel=MAX_CHANNEL)
+            )
+    return meta_channels, cue_channels
+
+
+def build_text_strips(sequencer, cues, channel, fps, style_table, batch_size=0, channels=None,
+                      source=None, keys=None, profile=NO_PROFILE, meta_channels=None):
+    """Create one TEXT strip per cue of a CueStore.
+
+    ``cues`` is sorted by start in place. ``style_table`` maps style IDs to
+    resolved style dicts (colours already converted to RGBA). With
+    ``batch_size`` > 0 every batch of consecutive cues goes into its own meta
+    strip, on the channel given per batch by ``meta_channels`` (see
+    pack_batch_channels; default ``channel``). ``channels`` optionally gives
+    a channel per cue (in start order), as returned by pack_cue_channels or
+    pack_batch_channels. With ``source`` every strip is tagged
+    for re-sync, using ``keys`` (default: positions) as cue keys. Cues with
+    partial style spans keep them on the strip as SRT markup. ``profile``
+    times the ``new_effect`` calls and counts strips. Returns
+    ``(strip_count, seconds)``.
+    """
+    started = time.perf_counter()
+    cues.sort_by_start()
+
+    frame_starts, frame_ends = cue_frame_ranges(cues, fps)
+    texts = cues.texts
+    text_ids = cues.text_ids
+    style_ids = cues.style_ids
+    styles = cues.styles
+    span_ids = cues.span_ids
+    span_table = cues.spans
+    count = len(cues)
+    use_meta = batch_size > 0
+    if not use_meta:
+        batch_size = count
+
+    defaults = None
+    changes_by_style = {}
+    created = 0
+
+    for batch_start in range(0, count, batch_size):
+        batch = range(batch_start, min(batch_start + batch_size, count))
+
+        target = sequencer.sequences
+        if use_meta:
+            # Number metas by cue position in the whole import, not in this chunk
+            batch_number = batch_start if keys is None else keys[batch_start]
+            meta = sequencer.sequences.new_meta(
+                name=f"Subtitles {batch_number + 1}-{batch_number + len(batch)}",
+                channel=channel if meta_channels is None else meta_channels[batch_start // batch_size],
+                frame_start=frame_starts[batch.start],
+            )
+            target = meta.sequences
+        new_effect = profile.timed("new_effect", target.new_effect)
+
+        # Group the batch by style so shared values are resolved once
+        groups = {}
+        for i in batch:
+            groups.setdefault(style_ids[i], []).append(i)
+
+        for style_id, indices in groups.items():
+            changes = changes_by_style.get(style_id)
+            for i in indices:
+                text = texts[text_ids[i]]
+                strip = new_effect(
+                    name=text[:15],
+                    type='TEXT',
+                    channel=channel if channels is None else channels[i],
+                    frame_start=frame_starts[i],
+                    frame_end=frame_ends[i],
+                )
+                if changes is None:
+                    if defaults is None:
+                        defaults = read_strip_defaults(strip)
+                    changes = style_changes(style_table[style_id], defaults)
+                    changes_by_style[style_id] = changes
+
+                strip.text = text
+                for attr, value in changes:
+                    setattr(strip, attr, value)
+                spans = span_table[span_ids[i]]
+                if spans:
+                    set_markup(strip, render_spans(text, spans))
+                if source is not None:
+                    content_hash = cue_hash(
+                        cues.starts[i], cues.ends[i], text, styles[style_id], spans
+                    )
+                    tag_strip(strip, source, i if keys is None else keys[i], content_hash)
+                created += 1
+
+    profile.count("strips", created)
+    return created, time.perf_counter() - started
+
+
+def sync_text_strips(sequencer, cues, source, channel, fps, style_table, auto_channels=False,
+                     profile=NO_PROFILE):
+    """Bring the strips imported from ``source`` in line with ``cues``.
+
+    Only strips whose cue changed are touched: unchanged cues keep their
+    strip, edited cues update it in place, and new or removed cues add or
+    delete strips. Returns ``(updated, added, removed, unchanged, seconds)``.
+    """
+    started = time.perf_counter()
+    cues.sort_by_start()
+    styles = cues.styles
+    hashes = [
+        cue_hash(start, end, text, styles[style_id], cues.spans[span_id])
+        for (start, end, text, style_id), span_id in zip(cues, cues.span_ids)
+    ]
+    updates, additions, removals, rekeys, unchanged = diff_cues(
+        tagged_strips(sequencer, source), hashes
+    )
+
+    for strip in removals:
+        remove_strip(sequencer, strip)
+
+    frame_starts, frame_ends = cue_frame_ranges(cues, fps)
+    for strip, position in updates:
+        style_id = cues.style_ids[position]
+        text = cues.text(position)
+        spans = cues.cue_spans(position)
+        update_strip(
+            strip, frame_starts[position], frame_ends[position],
+            text, style_table[style_id], render_spans(text, spans) if spans else None,
+        )
+        tag_strip(strip, source, position, hashes[position])
+
+    for strip, position in rekeys:
+        strip[KEY_PROP] = position
+
+    if additions:
+        new_cues = cues.take(additions)
+        channels = None
+        if auto_channels:
+            channels = pack_cue_channels(sequencer, new_cues, channel, fps)
+        build_text_strips(
+            sequencer, new_cues, channel, fps, style_table,
+            channels=channels, source=source, keys=additions, profile=profile,
+        )
+
+    return len(updates), len(additions), len(removals), unchanged, time.perf_counter() - started
@@ -0,0 +1,220 @@
+"""Single-pass lexer for SRT style tags.
+
+One compiled pattern splits the cue text into text and tags in a single
+pass, handling ``<b>``, ``<i>``, ``<u>``, ``<font size=".." color="..">``,
+``<br>``, literal ``\\n`` and a ``{\\anN}`` position tag, and dropping any
+other ``<...>`` tag. What a tag does is worked out once per distinct tag
+string, and the styling produced by a whole sequence of tags once per
+distinct sequence, so most cues only pay for the split and a join.
+
+The result is the clean text plus styling in two parts: attributes that
+cover every visible character of the cue (these become the strip style)
+and spans for styling that covers only part of it, so ``<b>one</b> word``
+no longer makes the whole strip bold.
+"""
+
+import re
+
+from .cue_store import DEFAULT_STYLE
+
+TOKEN_RE = re.compile(r"(<[^>]*>|\{\\an\d\}|\\n)")
+TAG_RE = re.compile(r"<\s*(/?)\s*([a-z]+)\b([^>]*)>", re.IGNORECASE)
+FONT_SIZE_RE = re.compile(r'size\s*=\s*"?(\d+)', re.IGNORECASE)
+FONT_COLOR_RE = re.compile(r'color\s*=\s*"?(#[0-9A-Fa-f]{6}|[a-zA-Z]+)', re.IGNORECASE)
+
+# Tag actions
+IGNORE, NEWLINE, BOLD, ITALIC, UNDERLINE, FONT_OPEN, FONT_CLOSE, ANCHOR = range(8)
+FLAG_ACTIONS = {"b": BOLD, "i": ITALIC, "u": UNDERLINE}
+
+# Span state: (bold, italic, underline, font_size, color); 0 / "" mean unset
+PLAIN = (False, False, False, 0, "")
+
+# Vertical strip position for {\anN}: bottom, middle and top rows
+ANCHOR_LOCATIONS = {1: 0.15, 2: 0.15, 3: 0.15, 4: 0.5, 5: 0.5, 6: 0.5, 7: 0.85, 8: 0.85, 9: 0.85}
+
+MAX_CACHED_TAGS = 4096
+_tag_actions = {}
+_programs = {}
+
+
+def tag_action(tag):
+    """Return the cached ``(action, value)`` of one tag string."""
+    action = _tag_actions.get(tag)
+    if action is not None:
+        return action
+
+    if tag.startswith("{"):
+        action = (ANCHOR, int(tag[4]))
+    elif tag == "\\n":
+        action = (NEWLINE, None)
+    else:
+        match = TAG_RE.match(tag)
+        name = match.group(2).lower() if match else ""
+        closing = bool(match and match.group(1))
+        if name == "br":
+            action = (NEWLINE, None)
+        elif name in FLAG_ACTIONS:
+            action = (FLAG_ACTIONS[name], -1 if closing else 1)
+        elif name == "font" and closing:
+            action = (FONT_CLOSE, None)
+        elif name == "font":
+            size = FONT_SIZE_RE.search(match.group(3))
+            color = FONT_COLOR_RE.search(match.group(3))
+            action = (FONT_OPEN, (int(size.group(1)) if size else 0, color.group(1) if color else ""))
+        else:
+            action = (IGNORE, None)
+
+    if len(_tag_actions) >= MAX_CACHED_TAGS:
+        _tag_actions.clear()
+    _tag_actions[tag] = action
+    return action
+
+
+def compile_tags(tags):
+    """Return the cached ``(separators, states, anchor, main, others)`` of a tag sequence.
+
+    ``separators`` replaces each tag in the text (a newline for line breaks,
+    otherwise empty) and ``states`` gives the span state of the text before
+    the first tag and after each tag. ``main`` is the most specific of those
+    states and ``others`` the text slots in a different state; when all of
+    them are blank the whole cue is styled with ``main``.
+    """
+    program = _programs.get(tags)
+    if program is not None:
+        return program
+
+    separators = []
+    states = [PLAIN]
+    counts = [0, 0, 0]  # open b / i / u tags
+    fonts = []
+    anchor = 0
+    state = PLAIN
+    for tag in tags:
+        action, value = tag_action(tag)
+        separators.append("\n" if action == NEWLINE else "")
+        if action == ANCHOR:
+            anchor = value
+        elif action == FONT_OPEN:
+            size, color = value
+            parent_size, parent_color = fonts[-1] if fonts else (0, "")
+            fonts.append((size or parent_size, color or parent_color))
+        elif action == FONT_CLOSE:
+            if fonts:
+                fonts.pop()
+        elif BOLD <= action <= UNDERLINE:
+            slot = action - BOLD
+            counts[slot] = max(counts[slot] + value, 0)
+        if action not in (IGNORE, NEWLINE, ANCHOR):
+            size, color = fonts[-1] if fonts else (0, "")
+            state = (counts[0] > 0, counts[1] > 0, counts[2] > 0, size, color)
+        states.append(state)
+
+    main = max(states, key=lambda state: sum(map(bool, state)))
+    others = tuple(k for k, state in enumerate(states) if state != main)
+    program = (separators, tuple(states), anchor, main, others)
+    if len(_programs) >= MAX_CACHED_TAGS:
+        _programs.clear()
+    _programs[tags] = program
+    return program
+
+
+def lex_markup(text):
+    """Split styled cue text into ``(clean_text, whole, spans, anchor)``.
+
+    ``whole`` is the span state shared by every visible character, ``spans``
+    a tuple of ``(start, end, bold, italic, underline, font_size, color)``
+    for the remaining, partial styling (offsets into the clean text) and
+    ``anchor`` the ``{\\anN}`` number, or 0.
+    """
+    if "<" not in text and "{" not in text and "\\" not in text:
+        return text.strip(), PLAIN, (), 0
+
+    parts = TOKEN_RE.split(text)
+    if len(parts) == 1:
+        return text.strip(), PLAIN, (), 0
+    separators, states, anchor, main, others = compile_tags(tuple(parts[1::2]))
+    texts = parts[0::2]
+    parts[1::2] = separators
+    joined = "".join(parts)
+    clean = joined.strip()
+    if not clean:
+        return clean, PLAIN, (), anchor
+
+    # Uniformly styled (the common case): no spans needed
+    for k in others:
+        if texts[k] and not texts[k].isspace():
+            break
+    else:
+        return clean, main, (), anchor
+
+    # Offsets of the visible text pieces in the clean text
+    lead = len(joined) - len(joined.lstrip())
+    segments = []
+    offset = -lead
+    for k, piece in enumerate(texts):
+        if k:
+            offset += len(separators[k - 1])
+        if piece and not piece.isspace():
+            segments.append((max(offset, 0), min(offset + len(piece), len(clean)), states[k]))
+        offset += len(piece)
+
+    # An attribute set to the same value on every visible piece styles the whole cue
+    first = segments[0][2]
+    whole = tuple(
+        value if value and all(state[k] == value for _, _, state in segments) else PLAIN[k]
+        for k, value in enumerate(first)
+    )
+
+    spans = []
+    for start, end, state in segments:
+        rest = tuple(PLAIN[k] if whole[k] else value for k, value in enumerate(state))
+        if rest == PLAIN or start >= end:
+            continue
+        # Neighbouring spans with the same styling merge across whitespace
+        gap = clean[spans[-1][1]:start] if spans else None
+        if spans and spans[-1][2:] == rest and (not gap or gap.isspace()):
+            spans[-1] = (spans[-1][0], end, *rest)
+        else:
+            spans.append((start, end, *rest))
+    return clean, whole, tuple(spans), anchor
+
+
+def parse_styles(text):
+    """Return ``(clean_text, style_tuple, spans)`` for one cue (see STYLE_KEYS)."""
+    clean, whole, spans, anchor = lex_markup(text)
+    bold, italic, underline, size, color = whole
+    default = DEFAULT_STYLE
+    style = (
+        bold,
+        italic,
+        underline,  # Map underline to use_box for visibility
+        size or default[3],
+        color,
+        default[5],
+        ANCHOR_LOCATIONS.get(anchor, default[6]),
+    )
+    return clean, style, spans
+
+
+def render_spans(text, spans):
+    """Wrap the spans of ``text`` in SRT tags; the inverse of lex_markup."""
+    if not spans:
+        return text
+    parts = []
+    position = 0
+    for start, end, bold, italic, underline, size, color in spans:
+        parts.append(text[position:start])
+        piece = text[start:end]
+        if underline:
+            piece = f"<u>{piece}</u>"
+        if italic:
+            piece = f"<i>{piece}</i>"
+        if bold:
+            piece = f"<b>{piece}</b>"
+        attributes = (f' size="{size}"' if size else "") + (f' color="{color}"' if color else "")
+        if attributes:
+            piece = f"<font{attributes}>{piece}</font>"
+        parts.append(piece)
+        position = end
+    parts.append(text[position:])
+    return "".join(parts)
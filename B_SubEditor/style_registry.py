@@ -0,0 +1,120 @@
+"""Interned subtitle styles with pre-resolved strip values and SRT tags.
+
+A file with tens of thousands of cues typically uses a handful of styles,
+so everything derived from a style (the RGBA colour, the strip property
+values, the SRT tags that reproduce it) is worked out once per distinct
+style and looked up by ID afterwards. Registries are bounded and drop the
+least recently used styles first.
+"""
+
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
+
+from .cue_store import STYLE_KEYS
+from .subtitle_formats import NAMED_COLORS
+
+WHITE = (1.0, 1.0, 1.0, 1.0)
+DEFAULT_FONT_SIZE = 40
+MAX_STYLES = 1024
+
+# values: strip property values keyed by STYLE_KEYS (colour as RGBA), or None
+# prefix / suffix: SRT tags for bold, italic, box (as underline) and font size
+# color_prefix / color_suffix: SRT font colour tags, empty for white
+ResolvedStyle = namedtuple("ResolvedStyle", "values prefix suffix color_prefix color_suffix")
+
+
+@lru_cache(maxsize=256)
+def resolve_color(color):
+    """Convert a colour name or #RRGGBB string to an RGBA tuple (white if unknown)."""
+    color = NAMED_COLORS.get(color.lower(), color)
+    if color.startswith("#"):
+        try:
+            return (*(int(color[i:i + 2], 16) / 255 for i in (1, 3, 5)), 1.0)
+        except ValueError:
+            pass
+    return WHITE
+
+
+def rgb_to_hex(rgb):
+    return "".join(f"{int(c * 255):02X}" for c in rgb[:3])
+
+
+def srt_tags(bold, italic, box, font_size, color_hex):
+    """Return ``(prefix, suffix, color_prefix, color_suffix)`` for a style."""
+    prefix = ""
+    suffix = ""
+    for used, tag in ((bold, "b"), (italic, "i"), (box, "u")):
+        if used:
+            prefix = f"<{tag}>{prefix}"
+            suffix = f"{suffix}</{tag}>"
+    # Skip the font size if it is the default
+    if font_size != DEFAULT_FONT_SIZE:
+        prefix = f'<font size="{font_size}">{prefix}'
+        suffix = f"{suffix}</font>"
+    # Skip the colour if it is the default white
+    if color_hex.upper() == "FFFFFF":
+        return prefix, suffix, "", ""
+    return prefix, suffix, f'<font color="#{color_hex}">', "</font>"
+
+
+def resolve_cue_style(style):
+    """Resolve a CueStore style tuple (see STYLE_KEYS)."""
+    values = dict(zip(STYLE_KEYS, style))
+    values["color"] = rgba = resolve_color(values["color"])
+    return ResolvedStyle(values, *srt_tags(
+        values["use_bold"], values["use_italic"], values["use_box"], values["font_size"], rgb_to_hex(rgba),
+    ))
+
+
+def resolve_strip_style(key):
+    """Resolve a ``(use_bold, use_italic, use_box, font_size, rgb)`` strip style key."""
+    bold, italic, box, font_size, rgb = key
+    return ResolvedStyle(None, *srt_tags(bold, italic, box, font_size, rgb_to_hex(rgb)))
+
+
+class StyleRegistry:
+    """Bounded LRU registry that interns style keys and their resolved form."""
+
+    __slots__ = ("resolve", "max_size", "_ids", "_entries", "_next_id")
+
+    def __init__(self, resolve, max_size=MAX_STYLES):
+        self.resolve = resolve
+        self.max_size = max_size
+        self._ids = OrderedDict()  # key -> ID, least recently used first
+        self._entries = {}  # ID -> ResolvedStyle
+        self._next_id = 0
+
+    def __len__(self):
+        return len(self._ids)
+
+    def intern(self, key):
+        """Return the ID of a style key, resolving it if it is new."""
+        style_id = self._ids.get(key)
+        if style_id is not None:
+            self._ids.move_to_end(key)
+            return style_id
+
+        style_id = self._next_id
+        self._next_id += 1
+        self._ids[key] = style_id
+        self._entries[style_id] = self.resolve(key)
+        if len(self._ids) > self.max_size:
+            _, evicted = self._ids.popitem(last=False)
+            del self._entries[evicted]
+        return style_id
+
+    def __getitem__(self, style_id):
+        """Return the resolved style with the given ID (KeyError once evicted)."""
+        return self._entries[style_id]
+
+    def lookup(self, key):
+        return self._entries[self.intern(key)]
+
+    def clear(self):
+        self._ids.clear()
+        self._entries.clear()
+
+
+# Shared by imports and exports for the whole session
+cue_styles = StyleRegistry(resolve_cue_style)
+strip_styles = StyleRegistry(resolve_strip_style)
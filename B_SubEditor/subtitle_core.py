@@ -0,0 +1,185 @@
+"""Subtitle reading, parsing, conversion and writing without Blender.
+
+Everything here imports without ``bpy``, so it can be used from the batch
+converter, benchmarks and other scripts as well as from the add-on.
+"""
+
+import os
+import re
+
+from .cue_store import STYLE_KEYS, CueStore
+from .profiling import NO_PROFILE
+from .srt_parser import iter_lines, ms_to_timecode
+from .subtitle_formats import CODECS, convert, get_codec
+from .subtitle_reader import read_text
+from .style_lexer import parse_styles
+from .style_registry import WHITE, resolve_color
+
+COMMENT_RE = re.compile(r"<!--.*?-->")
+
+def read_subtitle_file(file_path):
+    """Reads subtitle file content, detecting BOMs and UTF-16/cp1252 encodings."""
+    try:
+        return read_text(file_path)
+    except Exception as e:
+        print(f"Error reading file: {e}")
+        return None
+
+def write_subtitle_file(file_path, content):
+    """Writes content to a subtitle file."""
+    try:
+        with open(file_path, 'w', encoding='utf-8') as file:
+            file.write(content)
+        return True
+    except Exception as e:
+        print(f"Error writing file: {e}")
+        return False
+
+def ensure_unique_filepath(base_path, extension):
+    """Generates a unique file path by appending a numerical suffix if needed."""
+    return unique_filepaths([(base_path, extension)])[0]
+
+def unique_filepaths(requests):
+    """Resolve many ``(base_path, extension)`` outputs to unique paths.
+
+    Each folder is listed once instead of probing every candidate on disk,
+    and paths handed out earlier in the same call count as taken. Names
+    get the same ``_001`` style suffixes as ensure_unique_filepath and are
+    compared case-insensitively, as on Windows and macOS.
+    """
+    taken = {}
+    paths = []
+    for base_path, extension in requests:
+        directory, name = os.path.split(base_path)
+        names = taken.get(directory)
+        if names is None:
+            try:
+                names = {entry.casefold() for entry in os.listdir(directory or ".")}
+            except OSError:
+                names = set()
+            taken[directory] = names
+
+        candidate = f"{name}{extension}"
+        counter = 1
+        while candidate.casefold() in names:
+            candidate = f"{name}_{counter:03d}{extension}"
+            counter += 1
+        names.add(candidate.casefold())
+        paths.append(os.path.join(directory, candidate))
+    return paths
+
+def convert_to_srt(content, format):
+    """Converts the given subtitle content to SRT format."""
+    if format in CODECS and format != 'SRT':
+        return convert(content, format, 'SRT')
+    return content
+
+def convert_from_srt(content, format):
+    """Converts the given SRT content to the specified format."""
+    if format in CODECS and format != 'SRT':
+        return convert(content, 'SRT', format)
+    return content
+
+# Parse color string to Blender-compatible RGBA tuple
+def parse_color(color_string):
+    """Convert a color string (name or hex) to a Blender-compatible color tuple."""
+    try:
+        return resolve_color(color_string)
+    except Exception:
+        return WHITE
+
+
+def iter_clean_cues(cues, lex=parse_styles):
+    """Yield ``(start_ms, end_ms, text, style, line, spans)`` for codec cues.
+
+    Comment lines are removed and styles lexed with ``lex`` (see
+    style_lexer.parse_styles); cues left empty are skipped.
+    """
+    for cue in cues:
+        filtered_text = cue.text
+        # Ignore lines starting with '#' or enclosed within '<!-- -->'
+        if "#" in filtered_text or "<!--" in filtered_text:
+            lines = filtered_text.splitlines()
+            filtered_lines = [
+                line for line in lines
+                if not line.strip().startswith("#") and not COMMENT_RE.match(line.strip())
+            ]
+            filtered_text = "\n".join(filtered_lines)
+
+        # Process styles
+        filtered_text, style, spans = lex(filtered_text)
+
+        # Skip empty subtitle blocks
+        if not filtered_text:
+            continue
+
+        yield cue.start_ms, cue.end_ms, filtered_text, style, cue.line, spans
+
+
+def parse_subtitle_data(content, errors=None, format='SRT', profile=NO_PROFILE):
+    """Parse subtitle content into a CueStore of cleaned text and interned styles.
+
+    ``content`` may be a string, an open file or any iterable of lines in
+    any registered format. Line numbers of malformed blocks are appended to
+    ``errors`` if given. With a RunProfile, parsing and style lexing are
+    timed as separate stages.
+    """
+    subtitles = CueStore()
+    cues = get_codec(format).iter_cues(iter_lines(content), errors)
+    with profile.stage("parse"):
+        for start, end, text, style, line, spans in iter_clean_cues(cues, profile.timed("styles", parse_styles)):
+            subtitles.append(start, end, text, style, line, spans=spans)
+
+    profile.count("cues", len(subtitles))
+    return subtitles
+
+
+def parse_srt_data(content, errors=None):
+    """Parse SRT content into a CueStore; see parse_subtitle_data."""
+    return parse_subtitle_data(content, errors, 'SRT')
+
+
+def timecode_to_seconds(timecode):
+    """Convert SRT-style timecode (HH:MM:SS,MS) to seconds."""
+    h, m, s_ms = timecode.split(":")
+    s, ms = s_ms.split(",")
+    return int(h) * 3600 + int(m) * 60 + int(s) + int(ms) / 1000
+
+
+# Process SRT styles
+def process_srt_styles(text):
+    """Extract and map SRT styles to Blender text strip styles.
+
+    Only styling that covers the whole text is returned; see
+    style_lexer.lex_markup for the partial spans.
+    """
+    clean_text, style, _ = parse_styles(text)
+    return clean_text, dict(zip(STYLE_KEYS, style))
+
+
+def run_steps(steps):
+    """Exhaust a step generator and return its return value."""
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+
+def scale_steps(steps, offset, share):
+    """Re-yield a step generator's progress mapped into ``offset + share * fraction``.
+
+    Lets several step generators share one progress bar; returns the
+    wrapped generator's return value.
+    """
+    while True:
+        try:
+            fraction = next(steps)
+        except StopIteration as stop:
+            return stop.value
+        yield offset + share * fraction
+
+
+def seconds_to_timecode(seconds):
+    """Convert seconds to SRT timecode (HH:MM:SS,MS), rounded to the nearest millisecond."""
+    return ms_to_timecode(round(seconds * 1000))
@@ -0,0 +1,659 @@
+"""Subtitle codecs.
+
+Every format parses straight into the shared cue representation (a
+CueStore inside a SubtitleDocument) and serialises from it in one pass, so
+converting between any two formats never goes through SRT text.
+
+Cue text uses SRT-style markup as the neutral form: ``<b>``, ``<i>``,
+``<u>``, ``<font color="..." size="...">`` and a leading ``{\\anN}``
+position tag. Each codec translates its own markup to and from it.
+Format-specific extras (WebVTT cue settings, STYLE/NOTE blocks, ASS style
+names and script headers) travel with the document and are written back
+only by the codec that produced them. Header blocks are written before
+the first cue; WebVTT NOTE blocks between cues ride with the next cue.
+"""
+
+import os
+import re
+from collections import namedtuple
+
+from .cue_store import CueStore
+from .srt_parser import BOM, TIMING_RE, iter_lines, iter_srt_cues, ms_to_timecode
+
+# settings: format-specific string or None; line: 1-based source line
+Cue = namedtuple("Cue", "start_ms end_ms text settings line")
+
+NAMED_COLORS = {
+    "red": "#FF0000",
+    "green": "#00FF00",
+    "blue": "#0000FF",
+    "black": "#000000",
+    "yellow": "#FFFF00",
+    "cyan": "#00FFFF",
+    "magenta": "#FF00FF",
+    "white": "#FFFFFF",
+}
+
+HEX_TO_NAME = {value: name for name, value in NAMED_COLORS.items()}
+
+# Neutral markup tags
+MARKUP_RE = re.compile(r"<(/?)(b|i|u|font)\b([^>]*)>|\{\\an(\d)\}", re.IGNORECASE)
+FONT_ATTR_RE = re.compile(r'(color|size)\s*=\s*"?([^"\s>]+)"?', re.IGNORECASE)
+
+
+class SubtitleDocument:
+    """Cues of one subtitle file plus the format-specific parts around them."""
+
+    __slots__ = ("format", "cues", "header")
+
+    def __init__(self, format, cues=None, header=None):
+        self.format = format
+        self.cues = CueStore() if cues is None else cues
+        self.header = [] if header is None else header  # raw blocks, e.g. VTT STYLE
+
+    def __len__(self):
+        return len(self.cues)
+
+    def iter_cues(self):
+        """Yield ``(start_ms, end_ms, text, settings)`` for every cue."""
+        cues = self.cues
+        texts = cues.texts
+        for start, end, text_id, setting_id in zip(cues.starts, cues.ends, cues.text_ids, cues.setting_ids):
+            yield start, end, texts[text_id], None if setting_id < 0 else texts[setting_id]
+
+
+def iter_markup(text):
+    """Split neutral markup into ``('text', str)`` and ``(tag, closing, attrs)`` tokens."""
+    position = 0
+    for match in MARKUP_RE.finditer(text):
+        if match.start() > position:
+            yield 'text', text[position:match.start()]
+        if match.group(4):
+            yield 'an', False, match.group(4)
+        else:
+            yield match.group(2).lower(), bool(match.group(1)), match.group(3)
+        position = match.end()
+    if position < len(text):
+        yield 'text', text[position:]
+
+
+def font_attributes(attrs):
+    return {key.lower(): value for key, value in FONT_ATTR_RE.findall(attrs)}
+
+
+def color_to_hex(color):
+    """Return '#RRGGBB' for a hex or named colour, or None."""
+    if color.startswith("#") and len(color) == 7:
+        return color.upper()
+    return NAMED_COLORS.get(color.lower())
+
+
+def strip_markup(text):
+    """Remove neutral markup, keeping only the text."""
+    return "".join(token[1] for token in iter_markup(text) if token[0] == 'text')
+
+
+def iter_line_blocks(lines):
+    """Group lines into blank-line separated blocks; yields ``(first_line, lines)``."""
+    block = []
+    first = 0
+    for number, line in enumerate(lines, 1):
+        if number == 1 and line.startswith(BOM):
+            line = line.lstrip(BOM)
+        if line.strip():
+            if not block:
+                first = number
+            block.append(line)
+        elif block:
+            yield first, block
+            block = []
+    if block:
+        yield first, block
+
+
+# ----------------------- Codec registry ------------------------
+
+CODECS = {}
+EXTENSIONS = {}
+
+
+def register_codec(codec):
+    """Make a codec available under its name and file extensions."""
+    CODECS[codec.name] = codec
+    for extension in codec.extensions:
+        EXTENSIONS[extension] = codec
+    return codec
+
+
+def get_codec(format):
+    """Return the codec for a format name such as 'SRT' (KeyError if unknown)."""
+    return CODECS[format.upper()]
+
+
+def codec_for_path(file_path):
+    """Return the codec matching a file's extension, or None."""
+    return EXTENSIONS.get(os.path.splitext(file_path)[1].lower())
+
+
+class SubtitleCodec:
+    """Base class; subclasses implement iter_cues and iter_blocks."""
+
+    name = ""
+    extensions = ()
+
+    def iter_cues(self, lines, errors=None, header=None):
+        """Yield Cue tuples from lines of text.
+
+        Line numbers of malformed blocks go to ``errors``; format-specific
+        header blocks go to ``header`` when they are lists.
+        """
+        raise NotImplementedError
+
+    def iter_blocks(self, cues, header=None, source_format=None):
+        """Yield the serialised file block by block.
+
+        ``cues`` yields ``(start_ms, end_ms, text, settings)``; ``header`` and
+        settings are only used when ``source_format`` is this codec's format.
+        """
+        raise NotImplementedError
+
+    def parse(self, source, errors=None):
+        """Parse a string, file or iterable of lines into a SubtitleDocument."""
+        document = SubtitleDocument(self.name)
+        cues = document.cues
+        for cue in self.iter_cues(iter_lines(source), errors, document.header):
+            cues.append(cue.start_ms, cue.end_ms, cue.text, line=cue.line, settings=cue.settings)
+        return document
+
+    def dumps(self, document):
+        return "".join(self.iter_blocks(document.iter_cues(), document.header, document.format))
+
+
+def convert(source, source_format, target_format, errors=None):
+    """Convert subtitle text between two formats and return the result."""
+    document = get_codec(source_format).parse(source, errors)
+    return get_codec(target_format).dumps(document)
+
+
+def detect_format(lines, limit=20):
+    """Guess the format of subtitle text from its first lines, or None."""
+    for number, line in enumerate(lines):
+        if number >= limit:
+            break
+        line = line.lstrip(BOM).strip()
+        if not line:
+            continue
+        if line.startswith("WEBVTT"):
+            return 'VTT'
+        if line.lower() in ("[script info]", "[v4+ styles]", "[v4 styles]", "[events]"):
+            return 'ASS'
+        if SBV_TIMING_RE.match(line):
+            return 'SBV'
+        if TIMING_RE.match(line):
+            return 'SRT'
+    return None
+
+
+# ----------------------- SRT ------------------------
+
+class SrtCodec(SubtitleCodec):
+    name = 'SRT'
+    extensions = ('.srt',)
+
+    def iter_cues(self, lines, errors=None, header=None):
+        for cue in iter_srt_cues(lines, errors):
+            yield Cue(cue.start_ms, cue.end_ms, cue.text, None, cue.line)
+
+    def iter_blocks(self, cues, header=None, source_format=None, legacy_newlines=False):
+        """With ``legacy_newlines`` line breaks in cue text are written as a literal ``\\n``."""
+        for index, (start, end, text, _) in enumerate(cues, 1):
+            if legacy_newlines:
+                text = text.replace("\n", "\\n")
+            yield f"{index}\n{ms_to_timecode(start)} --> {ms_to_timecode(end)}\n{text}\n\n"
+
+
+# ----------------------- Plain text ------------------------
+
+class TxtCodec(SubtitleCodec):
+    """One cue per non-empty line in fixed 3-second slots; writes text only."""
+
+    name = 'TXT'
+    extensions = ('.txt',)
+
+    def iter_cues(self, lines, errors=None, header=None):
+        for number, line in enumerate(lines, 1):
+            line = line.strip()
+            if line:
+                start = (number - 1) * 3000 + 1000
+                yield Cue(start, start + 2000, line, None, number)
+
+    def iter_blocks(self, cues, header=None, source_format=None):
+        for _, _, text, _ in cues:
+            yield strip_markup(text) + "\n"
+
+
+# ----------------------- WebVTT ------------------------
+
+VTT_TIMING_RE = re.compile(
+    r"^\s*(?:(\d+):)?(\d{1,2}):(\d{2})\.(\d{3})"
+    r"\s+-->\s+"
+    r"(?:(\d+):)?(\d{1,2}):(\d{2})\.(\d{3})(.*)$"
+)
+VTT_TAG_RE = re.compile(r"<(/?)([a-z]+)((?:\.[\w-]+)*)(?:\s[^>]*)?>|<\d[\d:.]*>")
+VTT_ENTITIES = (("&lt;", "<"), ("&gt;", ">"), ("&nbsp;", "\u00a0"), ("&amp;", "&"))
+
+# {\anN} numpad positions as WebVTT cue settings
+AN_TO_VTT = {
+    "1": "align:start line:100%", "2": "", "3": "align:end line:100%",
+    "4": "align:start line:50%", "5": "line:50%", "6": "align:end line:50%",
+    "7": "align:start line:0", "8": "line:0", "9": "align:end line:0",
+}
+
+
+def vtt_group_ms(match, offset):
+    h, m, s, ms = match.group(offset, offset + 1, offset + 2, offset + 3)
+    return ((int(h or 0) * 60 + int(m)) * 60 + int(s)) * 1000 + int(ms)
+
+
+def vtt_to_markup(text):
+    """Translate WebVTT cue markup to neutral markup."""
+    pieces = []
+    class_stack = []  # per open <c>: whether it became a <font>
+    position = 0
+    for match in VTT_TAG_RE.finditer(text):
+        pieces.append(text[position:match.start()])
+        position = match.end()
+        closing, tag, classes = match.group(1), match.group(2), match.group(3)
+        if tag in ("b", "i", "u"):
+            pieces.append(f"<{closing}{tag}>")
+        elif tag == "c":
+            if closing:
+                if class_stack and class_stack.pop():
+                    pieces.append("</font>")
+            else:
+                colors = [c for c in (classes or "").split(".") if c.lower() in NAMED_COLORS]
+                class_stack.append(bool(colors))
+                if colors:
+                    pieces.append(f'<font color="{colors[0].lower()}">')
+        # Voice, language, ruby and timestamp tags carry no style
+    pieces.append(text[position:])
+    result = "".join(pieces)
+    for entity, char in VTT_ENTITIES:
+        result = result.replace(entity, char)
+    return result
+
+
+def markup_to_vtt(text):
+    """Translate neutral markup to WebVTT; returns ``(text, position_settings)``."""
+    pieces = []
+    font_stack = []
+    settings = ""
+    for token in iter_markup(text):
+        kind = token[0]
+        if kind == 'text':
+            pieces.append(token[1].replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;"))
+        elif kind == 'an':
+            settings = AN_TO_VTT.get(token[2], "")
+        elif kind == 'font':
+            if token[1]:
+                if font_stack and font_stack.pop():
+                    pieces.append("</c>")
+            else:
+                color = font_attributes(token[2]).get("color", "").lower()
+                color = HEX_TO_NAME.get(color.upper(), color)
+                font_stack.append(color in NAMED_COLORS)
+                if color in NAMED_COLORS:
+                    pieces.append(f"<c.{color}>")
+        else:
+            pieces.append(f"<{'/' if token[1] else ''}{kind}>")
+    return "".join(pieces), settings
+
+
+def pack_vtt_settings(settings, notes_before=(), notes_after=()):
+    """Return cue settings with the NOTE blocks around the cue folded in.
+
+    Blocks never contain blank lines and settings never start with NOTE,
+    so the parts are joined by blank lines (see unpack_vtt_settings).
+    """
+    if not (notes_before or notes_after):
+        return settings
+    return "\n\n".join((*notes_before, settings or "", *notes_after))
+
+
+def unpack_vtt_settings(settings):
+    """Return ``(notes_before, settings, notes_after)`` of packed cue settings."""
+    if not settings or "\n" not in settings:
+        return (), settings, ()
+    parts = settings.split("\n\n")
+    for position, part in enumerate(parts):
+        if not part.startswith("NOTE"):
+            return parts[:position], part or None, parts[position + 1:]
+    return parts, None, ()
+
+
+class VttCodec(SubtitleCodec):
+    """WebVTT. NOTE blocks between cues travel in the settings of the cue
+    that follows them (of the last cue, for notes at the end), so they are
+    written back in place even after the cues were edited or reordered.
+    """
+
+    name = 'VTT'
+    extensions = ('.vtt',)
+
+    def iter_cues(self, lines, errors=None, header=None):
+        notes = []
+        last = None
+        for first, block in iter_line_blocks(lines):
+            head = block[0].strip()
+            if head.startswith("WEBVTT"):
+                continue
+            if head.startswith("NOTE") and last is not None:
+                notes.append("\n".join(block))
+                continue
+            if head.startswith(("NOTE", "STYLE", "REGION")):
+                if header is not None:
+                    header.append("\n".join(block))
+                continue
+
+            # Optional cue identifier before the timing line
+            timing = 1 if len(block) > 1 and "-->" not in block[0] else 0
+            match = VTT_TIMING_RE.match(block[timing])
+            if not match:
+                if errors is not None:
+                    errors.append((first, "Missing or malformed timecode line"))
+                continue
+            if last is not None:
+                yield last
+            settings = pack_vtt_settings(match.group(9).strip() or None, notes)
+            notes = []
+            text = vtt_to_markup("\n".join(block[timing + 1:]))
+            last = Cue(vtt_group_ms(match, 1), vtt_group_ms(match, 5), text, settings, first)
+        if last is not None:
+            # Notes after the last cue are written after it
+            yield last._replace(settings=pack_vtt_settings(last.settings, notes_after=notes))
+
+    def iter_blocks(self, cues, header=None, source_format=None):
+        native = source_format == self.name
+        yield "WEBVTT\n\n"
+        if native and header:
+            for block in header:
+                yield block + "\n\n"
+        for start, end, text, settings in cues:
+            text, position = markup_to_vtt(text)
+            notes_before = notes_after = ()
+            if native:
+                notes_before, settings, notes_after = unpack_vtt_settings(settings)
+            else:
+                settings = None
+            for block in notes_before:
+                yield block + "\n\n"
+            if not settings:
+                settings = position
+            timing = f"{ms_to_timecode(start, '.')} --> {ms_to_timecode(end, '.')}"
+            if settings:
+                timing = f"{timing} {settings}"
+            yield f"{timing}\n{text}\n\n"
+            for block in notes_after:
+                yield block + "\n\n"
+
+
+# ----------------------- SBV ------------------------
+
+SBV_TIMING_RE = re.compile(
+    r"^\s*(\d+):(\d{1,2}):(\d{1,2})\.(\d{1,3}),(\d+):(\d{1,2}):(\d{1,2})\.(\d{1,3})\s*$"
+)
+
+
+def sbv_timecode(ms):
+    """Format milliseconds as an SBV timecode (H:MM:SS.mmm)."""
+    s, ms = divmod(ms, 1000)
+    m, s = divmod(s, 60)
+    h, m = divmod(m, 60)
+    return f"{h}:{m:02}:{s:02}.{ms:03}"
+
+
+def sbv_group_ms(match, offset):
+    h, m, s, ms = match.group(offset, offset + 1, offset + 2, offset + 3)
+    return ((int(h) * 60 + int(m)) * 60 + int(s)) * 1000 + int(ms.ljust(3, "0"))
+
+
+class SbvCodec(SubtitleCodec):
+    """YouTube SBV; the format has no markup, so styles are dropped on write."""
+
+    name = 'SBV'
+    extensions = ('.sbv',)
+
+    def iter_cues(self, lines, errors=None, header=None):
+        for first, block in iter_line_blocks(lines):
+            match = SBV_TIMING_RE.match(block[0])
+            if not match:
+                if errors is not None:
+                    errors.append((first, "Missing or malformed timecode line"))
+                continue
+            yield Cue(sbv_group_ms(match, 1), sbv_group_ms(match, 5), "\n".join(block[1:]), None, first)
+
+    def iter_blocks(self, cues, header=None, source_format=None):
+        for start, end, text, _ in cues:
+            yield f"{sbv_timecode(start)},{sbv_timecode(end)}\n{strip_markup(text)}\n\n"
+
+
+# ----------------------- ASS / SSA ------------------------
+
+ASS_TIME_RE = re.compile(r"^\s*(\d+):(\d{1,2}):(\d{1,2})[.:](\d{1,3})\s*$")
+ASS_OVERRIDE_RE = re.compile(r"\{([^}]*)\}")
+ASS_TAG_RE = re.compile(r"\\(\d?[a-z]+)([^\\]*)", re.IGNORECASE)
+ASS_COLOR_RE = re.compile(r"&H([0-9A-Fa-f]{2})?([0-9A-Fa-f]{2})([0-9A-Fa-f]{2})([0-9A-Fa-f]{2})&?")
+
+ASS_EVENT_FORMAT = "Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text"
+ASS_DEFAULT_HEADER = (
+    "[Script Info]\n"
+    "ScriptType: v4.00+\n"
+    "WrapStyle: 0\n"
+    "ScaledBorderAndShadow: yes\n"
+    "PlayResX: 1920\n"
+    "PlayResY: 1080",
+    "[V4+ Styles]\n"
+    "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, "
+    "BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, "
+    "BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding\n"
+    "Style: Default,Arial,48,&H00FFFFFF,&H000000FF,&H00000000,&H64000000,"
+    "0,0,0,0,100,100,0,0,1,2,1,2,20,20,40,1",
+)
+
+
+def ass_time_ms(value):
+    match = ASS_TIME_RE.match(value)
+    if not match:
+        return None
+    h, m, s, fraction = match.groups()
+    # The fraction is centiseconds in ASS, but tolerate milliseconds
+    ms = int(fraction) * 10 if len(fraction) <= 2 else int(fraction)
+    return ((int(h) * 60 + int(m)) * 60 + int(s)) * 1000 + ms
+
+
+def ass_timecode(ms):
+    """Format milliseconds as an ASS timecode (H:MM:SS.cc)."""
+    cs = (ms + 5) // 10
+    s, cs = divmod(cs, 100)
+    m, s = divmod(s, 60)
+    h, m = divmod(m, 60)
+    return f"{h}:{m:02}:{s:02}.{cs:02}"
+
+
+def ass_to_hex(value):
+    match = ASS_COLOR_RE.match(value)
+    if not match:
+        return None
+    _, b, g, r = match.groups()
+    return f"#{r}{g}{b}".upper()
+
+
+def hex_to_ass(color):
+    return f"&H{color[5:7]}{color[3:5]}{color[1:3]}&"
+
+
+def ass_to_markup(text):
+    """Translate ASS override tags to neutral markup."""
+    pieces = []
+    prefix = ""
+    open_tags = []  # neutral tags currently open, innermost last
+
+    def close(tag):
+        if tag in open_tags:
+            # Close and reopen anything opened inside it to keep nesting valid
+            index = open_tags.index(tag)
+            inner = open_tags[index + 1:]
+            for name in reversed(open_tags[index:]):
+                pieces.append(f"</{name.split()[0]}>")
+            del open_tags[index:]
+            for name in inner:
+                open_(name)
+
+    def open_(tag):
+        pieces.append(f"<{tag}>")
+        open_tags.append(tag)
+
+    position = 0
+    for match in ASS_OVERRIDE_RE.finditer(text):
+        pieces.append(text[position:match.start()])
+        position = match.end()
+        for name, value in ASS_TAG_RE.findall(match.group(1)):
+            name = name.lower()
+            value = value.strip()
+            if name in ("b", "i", "u"):
+                on = value not in ("", "0") if name != "b" else (value == "1" or (value.isdigit() and int(value) >= 700))
+                if on and name not in open_tags:
+                    open_(name)
+                elif not on:
+                    close(name)
+            elif name in ("c", "1c"):
+                close_font = [tag for tag in open_tags if tag.startswith("font color")]
+                for tag in close_font:
+                    close(tag)
+                color = ass_to_hex(value)
+                if color:
+                    open_(f'font color="{color}"')
+            elif name == "fs" and value:
+                for tag in [tag for tag in open_tags if tag.startswith("font size")]:
+                    close(tag)
+                open_(f'font size="{value.split(".")[0]}"')
+            elif name == "an" and value.isdigit():
+                prefix = f"{{\\an{value}}}"
+            elif name == "r":
+                for tag in list(reversed(open_tags)):
+                    close(tag)
+    pieces.append(text[position:])
+    for tag in reversed(open_tags):
+        pieces.append(f"</{tag.split()[0]}>")
+    result = "".join(pieces).replace("\\N", "\n").replace("\\n", " ").replace("\\h", "\u00a0")
+    return prefix + result
+
+
+def markup_to_ass(text):
+    """Translate neutral markup to ASS override tags."""
+    pieces = []
+    flags = {"b": False, "i": False, "u": False}
+    font_stack = []  # dicts of font attributes, innermost last
+
+    def font_overrides(attributes):
+        tags = []
+        color = color_to_hex(attributes.get("color", ""))
+        if color:
+            tags.append(f"\\c{hex_to_ass(color)}")
+        size = attributes.get("size", "")
+        if size.isdigit():
+            tags.append(f"\\fs{size}")
+        return "".join(tags)
+
+    for token in iter_markup(text):
+        kind = token[0]
+        if kind == 'text':
+            pieces.append(token[1].replace("\n", "\\N"))
+        elif kind == 'an':
+            pieces.append(f"{{\\an{token[2]}}}")
+        elif kind == 'font':
+            if not token[1]:
+                attributes = font_attributes(token[2])
+                font_stack.append(attributes)
+                overrides = font_overrides(attributes)
+                if overrides:
+                    pieces.append(f"{{{overrides}}}")
+            elif font_stack:
+                font_stack.pop()
+                # Reset, then restore whatever is still in effect
+                restore = "".join(f"\\{name}1" for name, on in flags.items() if on)
+                restore += "".join(font_overrides(attributes) for attributes in font_stack)
+                pieces.append(f"{{\\r{restore}}}")
+        else:
+            flags[kind] = not token[1]
+            pieces.append(f"{{\\{kind}{0 if token[1] else 1}}}")
+    return "".join(pieces)
+
+
+class AssCodec(SubtitleCodec):
+    """Advanced SubStation Alpha; also reads SSA (v4) files."""
+
+    name = 'ASS'
+    extensions = ('.ass', '.ssa')
+
+    def iter_cues(self, lines, errors=None, header=None):
+        section = None
+        section_lines = []
+        fields = [name.strip().lower() for name in ASS_EVENT_FORMAT.split(",")]
+
+        def flush_section():
+            if header is not None and section_lines and section != "[events]":
+                header.append("\n".join(section_lines))
+
+        for number, line in enumerate(lines, 1):
+            if number == 1:
+                line = line.lstrip(BOM)
+            stripped = line.strip()
+            if stripped.startswith("[") and stripped.endswith("]"):
+                flush_section()
+                section = stripped.lower()
+                section_lines = [stripped]
+                continue
+            if section != "[events]":
+                if stripped and not stripped.startswith(";"):
+                    section_lines.append(stripped)
+                continue
+
+            key, _, value = stripped.partition(":")
+            key = key.strip().lower()
+            if key == "format":
+                fields = [name.strip().lower() for name in value.split(",")]
+            elif key == "dialogue":
+                raw = value.split(",", len(fields) - 1)
+                if len(raw) != len(fields):
+                    if errors is not None:
+                        errors.append((number, "Dialogue line has too few fields"))
+                    continue
+                event = dict(zip(fields, (part.strip() for part in raw)))
+                start = ass_time_ms(event.get("start", ""))
+                end = ass_time_ms(event.get("end", ""))
+                if start is None or end is None:
+                    if errors is not None:
+                        errors.append((number, "Malformed Dialogue timecode"))
+                    continue
+                # Keep the raw text field: its leading spaces are significant
+                text = raw[fields.index("text")] if "text" in fields else ""
+                yield Cue(start, end, ass_to_markup(text), event.get("style") or None, number)
+        flush_section()
+
+    def iter_blocks(self, cues, header=None, source_format=None):
+        native = source_format == self.name
+        # SSA (v4) styles do not fit the v4+ events written below
+        reuse_header = native and header and not any(
+            block.lower().startswith("[v4 styles]") for block in header
+        )
+        for block in (header if reuse_header else ASS_DEFAULT_HEADER):
+            yield block + "\n\n"
+        yield f"[Events]\nFormat: {ASS_EVENT_FORMAT}\n"
+        for start, end, text, settings in cues:
+            style = settings if native and settings else "Default"
+            yield f"Dialogue: 0,{ass_timecode(start)},{ass_timecode(end)},{style},,0,0,0,,{markup_to_ass(text)}\n"
+
+
+for codec in (SrtCodec(), TxtCodec(), VttCodec(), SbvCodec(), AssCodec()):
+    register_codec(codec)
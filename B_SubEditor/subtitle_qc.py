@@ -0,0 +1,147 @@
+"""Subtitle quality checks and timing fixes.
+
+``check_cues`` walks a CueStore once in source order and reports every
+problem a delivery spec usually rejects: cues out of order or overlapping,
+zero or negative, too short or too long durations, reading speeds above a
+characters-per-second limit, gaps shorter than the minimum and lines that
+are too long or too many. Issues carry the source line of their cue, so
+the Text Editor can jump to them.
+
+The fixes work on the same store: cue ends are trimmed so no cue overlaps
+the next one or, optionally, leaves less than the minimum gap. Writing the
+store back renumbers the cues.
+"""
+
+from collections import namedtuple
+
+from .subtitle_formats import strip_markup
+
+# Durations and gaps in milliseconds; max_cps in characters per second
+QCSettings = namedtuple(
+    "QCSettings", "min_duration_ms max_duration_ms max_cps min_gap_ms max_line_length max_lines"
+)
+
+# 5/6 s minimum, 7 s maximum, 17 cps, 2 frames at 24 fps, 42 x 2 lines
+DEFAULT_SETTINGS = QCSettings(833, 7000, 17.0, 83, 42, 2)
+
+# Issue kinds, in rough order of severity
+MALFORMED = 'MALFORMED'
+ORDER = 'ORDER'
+OVERLAP = 'OVERLAP'
+DURATION = 'DURATION'
+SHORT = 'SHORT'
+LONG = 'LONG'
+READING_SPEED = 'CPS'
+GAP = 'GAP'
+LINE_LENGTH = 'LINE_LENGTH'
+LINE_COUNT = 'LINE_COUNT'
+
+# line: source line (0 if unknown); cue: 1-based cue number, 0 for malformed blocks
+# value: the measured amount (or the parser message); limit: the setting it breaks
+Issue = namedtuple("Issue", "line cue kind value limit")
+
+MESSAGES = {
+    MALFORMED: "{value}",
+    ORDER: "Cue {cue} starts before the previous cue",
+    OVERLAP: "Cue {cue} overlaps an earlier cue by {value} ms",
+    DURATION: "Cue {cue} has a duration of {value} ms",
+    SHORT: "Cue {cue} lasts {value} ms (minimum {limit} ms)",
+    LONG: "Cue {cue} lasts {value} ms (maximum {limit} ms)",
+    READING_SPEED: "Cue {cue} reads at {value:.1f} cps (maximum {limit:g})",
+    GAP: "Cue {cue} starts {value} ms after the previous cue (minimum {limit} ms)",
+    LINE_LENGTH: "Cue {cue} has a line of {value} characters (maximum {limit})",
+    LINE_COUNT: "Cue {cue} has {value} lines (maximum {limit})",
+}
+
+# Shortest cue left by a fix, in milliseconds
+MIN_FIXED_DURATION_MS = 1
+
+
+def issue_message(issue):
+    """Describe an Issue; messages are only formatted for the issues shown."""
+    return MESSAGES[issue.kind].format(**issue._asdict())
+
+
+def plain_text(text):
+    """Return cue text without markup, skipping the tokenizer for plain text."""
+    if "<" in text or "{" in text:
+        return strip_markup(text)
+    return text
+
+
+def check_cues(cues, settings=DEFAULT_SETTINGS, errors=()):
+    """Check a CueStore in one pass; returns Issues sorted by line.
+
+    ``cues`` is checked in its current (source) order. ``errors`` are the
+    ``(line, message)`` pairs collected while parsing, reported as
+    malformed blocks.
+    """
+    issues = [Issue(line, 0, MALFORMED, message, None) for line, message in errors]
+    add = issues.append
+    min_duration, max_duration, max_cps, min_gap, max_length, max_lines = settings
+    texts = cues.texts
+    # Latest end seen so far, for overlaps with any earlier cue
+    latest_end = None
+    previous_start = None
+    # Reading speed and line checks only depend on the text
+    text_cache = {}
+
+    cue_columns = zip(cues.starts, cues.ends, cues.text_ids, cues.lines)
+    for cue, (start, end, text_id, line) in enumerate(cue_columns, 1):
+        if previous_start is not None and start < previous_start:
+            add(Issue(line, cue, ORDER, None, None))
+        elif latest_end is not None:
+            if start < latest_end:
+                add(Issue(line, cue, OVERLAP, latest_end - start, None))
+            elif start - latest_end < min_gap:
+                add(Issue(line, cue, GAP, start - latest_end, min_gap))
+        previous_start = start
+        if latest_end is None or end > latest_end:
+            latest_end = end
+
+        duration = end - start
+        if duration <= 0:
+            add(Issue(line, cue, DURATION, duration, None))
+        elif duration < min_duration:
+            add(Issue(line, cue, SHORT, duration, min_duration))
+        elif duration > max_duration:
+            add(Issue(line, cue, LONG, duration, max_duration))
+
+        measured = text_cache.get(text_id)
+        if measured is None:
+            text_lines = plain_text(texts[text_id]).split("\n")
+            measured = text_cache[text_id] = (
+                sum(map(len, text_lines)),
+                max(map(len, text_lines)),
+                len(text_lines),
+            )
+        characters, longest, line_count = measured
+
+        if duration > 0 and characters * 1000 > max_cps * duration:
+            add(Issue(line, cue, READING_SPEED, characters * 1000 / duration, max_cps))
+        if longest > max_length:
+            add(Issue(line, cue, LINE_LENGTH, longest, max_length))
+        if line_count > max_lines:
+            add(Issue(line, cue, LINE_COUNT, line_count, max_lines))
+
+    issues.sort(key=lambda issue: issue.line)
+    return issues
+
+
+def fix_timing(cues, min_gap_ms=0):
+    """Sort cues by start and trim ends so each cue ends ``min_gap_ms`` before the next.
+
+    With ``min_gap_ms`` = 0 only overlaps are removed. An end is never
+    moved before its own start (cues starting together stay overlapping).
+    Returns the number of cues changed.
+    """
+    cues.sort_by_start()
+    starts = cues.starts
+    ends = cues.ends
+    changed = 0
+    for position in range(len(starts) - 1):
+        limit = max(starts[position + 1] - min_gap_ms, starts[position] + MIN_FIXED_DURATION_MS)
+        if ends[position] > limit:
+            ends[position] = limit
+            changed += 1
+    return changed
@@ -0,0 +1,211 @@
+"""Memory-mapped subtitle file reader.
+
+Files are mapped instead of read, the encoding is sniffed from the BOM or
+the first few KB, and text is decoded one line at a time straight from the
+mapping. A byte-offset index of cue blocks lets a single cue be re-read
+without decoding the rest of the file.
+
+A file sniffed as UTF-8 is checked to the end before anything is decoded
+(a chunked pass that keeps no text), and a file that turns out not to be
+UTF-8 is decoded as LEGACY_ENCODING throughout. Every reader goes through
+map_subtitle_file, so a file decodes the same whichever way it is read.
+"""
+
+import codecs
+import mmap
+import os
+from array import array
+from contextlib import contextmanager
+
+from .srt_parser import iter_srt_cues
+
+SNIFF_SIZE = 64 * 1024
+# Bytes validated at a time when checking a whole file is UTF-8
+CHECK_CHUNK_SIZE = 1024 * 1024
+
+# Longest BOMs first so UTF-32 LE is not mistaken for UTF-16 LE
+BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+
+# Fallback for files that are not valid UTF-8, common in broadcast deliveries
+LEGACY_ENCODING = "cp1252"
+
+
+def sniff_encoding(head):
+    """Guess the encoding of a file from its first bytes.
+
+    Returns ``(encoding, bom_length)``.
+    """
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding, len(bom)
+
+    # BOM-less UTF-16: ASCII text leaves every other byte zero
+    sample = head[:4096]
+    if len(sample) >= 4:
+        even_zeros = sample[0::2].count(0)
+        odd_zeros = sample[1::2].count(0)
+        half = len(sample) // 2
+        if odd_zeros > half * 0.4 and even_zeros < half * 0.05:
+            return "utf-16-le", 0
+        if even_zeros > half * 0.4 and odd_zeros < half * 0.05:
+            return "utf-16-be", 0
+
+    # A truncated multi-byte sequence at the end of the sample is fine
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+        return "utf-8", 0
+    except UnicodeDecodeError:
+        return LEGACY_ENCODING, 0
+
+
+def is_utf8(buffer, start=0):
+    """Return True if ``buffer`` from ``start`` on is valid UTF-8, checked a chunk at a time."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    with memoryview(buffer) as view:
+        try:
+            for position in range(start, len(view), CHECK_CHUNK_SIZE):
+                decoder.decode(view[position:position + CHECK_CHUNK_SIZE])
+            decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            return False
+    return True
+
+
+@contextmanager
+def map_subtitle_file(file_path):
+    """Map a file read-only; yields ``(buffer, encoding, bom_length)``.
+
+    ``encoding`` holds for the whole file (see the module notes). Empty
+    files yield an empty bytes object, since they cannot be mapped.
+    """
+    with open(file_path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            yield b"", "utf-8", 0
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            encoding, bom_length = sniff_encoding(mapped[:SNIFF_SIZE])
+            if encoding == "utf-8" and len(mapped) > SNIFF_SIZE and not is_utf8(mapped, bom_length):
+                encoding = LEGACY_ENCODING
+            yield mapped, encoding, bom_length
+
+
+def newline_bytes(encoding):
+    return "\n".encode(encoding)
+
+
+def iter_line_spans(buffer, encoding, start=0, end=None):
+    """Yield the ``(start, end)`` byte range of each line of a mapped file, without its newline."""
+    newline = newline_bytes(encoding)
+    step = len(newline)
+    if end is None:
+        end = len(buffer)
+    position = start
+    while position < end:
+        found = buffer.find(newline, position, end)
+        # Multi-byte encodings: only accept matches on a character boundary
+        while found >= 0 and (found - start) % step:
+            found = buffer.find(newline, found + 1, end)
+        line_end = end if found < 0 else found
+        yield position, line_end
+        position = line_end + step
+
+
+def iter_line_offsets(buffer, encoding, start=0, end=None):
+    """Yield ``(byte_offset, line)`` for each line of a mapped file.
+
+    Lines are decoded one at a time and returned without line endings.
+    """
+    for position, line_end in iter_line_spans(buffer, encoding, start, end):
+        yield position, str(buffer[position:line_end], encoding, errors="replace").rstrip("\r")
+
+
+def iter_subtitle_lines(file_path):
+    """Yield the decoded lines of a subtitle file, one at a time."""
+    with map_subtitle_file(file_path) as (buffer, encoding, bom_length):
+        for _, line in iter_line_offsets(buffer, encoding, bom_length):
+            yield line
+
+
+def read_text(file_path):
+    """Decode a whole subtitle file with the sniffed encoding.
+
+    Decodes straight from the mapping, so the file bytes are never copied
+    into a separate bytes object first.
+    """
+    with map_subtitle_file(file_path) as (buffer, encoding, bom_length):
+        with memoryview(buffer) as view:
+            return str(view[bom_length:], encoding, errors="replace")
+
+
+class CueOffsetIndex:
+    """Byte offsets of the cue blocks of a subtitle file.
+
+    Built in one pass over the mapped file; in ASCII-compatible encodings
+    blank lines are found in the raw bytes, so next to nothing is decoded.
+    ``read_cue`` then decodes only the lines of the requested block and
+    ``iter_raw_blocks`` hands out the undecoded bytes of every block.
+    """
+
+    __slots__ = ("file_path", "encoding", "offsets", "ends", "first_lines")
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.offsets = array("q")
+        self.ends = array("q")
+        self.first_lines = array("q")  # 1-based line number of each block's first line
+        with map_subtitle_file(file_path) as (buffer, encoding, bom_length):
+            self.encoding = encoding
+            ascii_compatible = encoding in ("utf-8", LEGACY_ENCODING)
+            in_block = False
+            block_end = 0
+            for number, (position, line_end) in enumerate(iter_line_spans(buffer, encoding, bom_length), 1):
+                data = buffer[position:line_end]
+                if ascii_compatible:
+                    data = data.strip()
+                    # Only lines not starting with printable ASCII need decoding
+                    # to tell, e.g. no-break spaces only
+                    blank = not data or (not 0x20 < data[0] < 0x7f and not self.decode(data).strip())
+                else:
+                    blank = not self.decode(data).strip()
+                if not blank:
+                    if not in_block:
+                        self.offsets.append(position)
+                        self.first_lines.append(number)
+                        in_block = True
+                    block_end = line_end
+                elif in_block:
+                    self.ends.append(block_end)
+                    in_block = False
+            if in_block:
+                self.ends.append(block_end)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def decode(self, data):
+        """Decode the raw bytes of a block (see iter_raw_blocks) to text."""
+        return str(data, self.encoding, errors="replace")
+
+    def iter_raw_blocks(self):
+        """Yield ``(first_line, data)`` for every block, ``data`` its undecoded bytes."""
+        with map_subtitle_file(self.file_path) as (buffer, _, _):
+            for first_line, start, end in zip(self.first_lines, self.offsets, self.ends):
+                yield first_line, buffer[start:end]
+
+    def read_block(self, number):
+        """Return the decoded lines of block ``number`` (0-based)."""
+        with map_subtitle_file(self.file_path) as (buffer, encoding, _):
+            start = self.offsets[number]
+            return [line for _, line in iter_line_offsets(buffer, encoding, start, self.ends[number])]
+
+    def read_cue(self, number):
+        """Parse block ``number`` into an SrtCue, or None if it is malformed."""
+        for cue in iter_srt_cues(self.read_block(number)):
+            return cue
+        return None
@@ -0,0 +1,163 @@
+"""Subtitle tracks: one text strip driven by a frame change handler.
+
+Instead of one strip per cue, a track is a single TEXT strip spanning all
+of its cues. The cues live on the scene as compact ID properties (integer
+millisecond arrays, one joined string of texts and a JSON style table),
+and a ``frame_change_pre`` handler finds the cues under the playhead with
+an interval index (see intervals.IntervalIndex); overlapping cues are
+shown together, one per line. The strip's text and style are written only
+when those cues change, so scrubbing and rendering stay cheap on timelines
+with tens of thousands of subtitles.
+"""
+
+import json
+from array import array
+
+from .intervals import IntervalIndex
+from .strip_batch import deselect_all
+from .style_registry import cue_styles
+from .timebase import frame_to_ms, ms_to_frame, render_frame_rate
+
+TRACKS_PROP = "b_sub_tracks"  # scene: track name -> cue data
+TRACK_PROP = "b_sub_track"  # strip: name of the track it shows
+
+# Joins cue texts in one string property; not found in subtitle text
+TEXT_SEPARATOR = "\x1e"
+
+TRACK_STYLE_ATTRS = ("use_bold", "use_italic", "use_box", "font_size", "color", "wrap_width")
+
+_indexes = {}
+
+
+def clear_track_indexes():
+    """Drop the cached lookups, e.g. after undo or loading a file."""
+    _indexes.clear()
+
+
+class TrackIndex:
+    """Sorted cue lookup for one track."""
+
+    __slots__ = ("strip_name", "starts", "ends", "texts", "text_ids", "styles", "style_ids",
+                 "intervals", "current", "current_style")
+
+    def __init__(self, data):
+        self.strip_name = data["strip"]
+        self.starts = array("q", data["starts"])
+        self.ends = array("q", data["ends"])
+        self.texts = data["texts"].split(TEXT_SEPARATOR)
+        self.text_ids = array("l", data["text_ids"])
+        self.styles = [tuple(style) for style in json.loads(data["styles"])]
+        self.style_ids = array("l", data["style_ids"])
+        self.intervals = IntervalIndex(self.starts, self.ends)
+        self.current = None
+        self.current_style = None
+
+    def __len__(self):
+        return len(self.starts)
+
+    def cues_at(self, ms):
+        """Return the positions of every cue shown at ``ms``, in start order."""
+        return tuple(self.intervals.at(ms))
+
+    def show(self, sequencer, ms):
+        """Put the cues at ``ms`` on the track strip; returns True if the strip changed.
+
+        Overlapping cues are stacked one per line in start order, styled
+        like the latest-starting one.
+        """
+        positions = self.cues_at(ms)
+        if positions == self.current:
+            return False
+        strip = sequencer.sequences_all.get(self.strip_name)
+        if strip is None:
+            return False
+
+        self.current = positions
+        if not positions:
+            strip.text = ""
+            return True
+        strip.text = "\n".join(self.texts[self.text_ids[position]] for position in positions)
+
+        style_id = self.style_ids[positions[-1]]
+        if style_id != self.current_style:
+            self.current_style = style_id
+            values = cue_styles.lookup(self.styles[style_id]).values
+            for attr in TRACK_STYLE_ATTRS:
+                setattr(strip, attr, values[attr])
+            strip.location[1] = values["location[1]"]
+        return True
+
+
+def track_index(scene, name):
+    """Return the cached TrackIndex of a track, building it on first use."""
+    key = (scene.as_pointer(), name)
+    index = _indexes.get(key)
+    if index is None:
+        index = _indexes[key] = TrackIndex(scene[TRACKS_PROP][name])
+    return index
+
+
+def update_tracks(scene):
+    """Show the current cue of every track of a scene (the frame change handler body)."""
+    tracks = scene.get(TRACKS_PROP)
+    sequencer = scene.sequence_editor
+    if not tracks or sequencer is None:
+        return
+    ms = frame_to_ms(scene.frame_current, render_frame_rate(scene.render))
+    for name in tracks.keys():
+        track_index(scene, name).show(sequencer, ms)
+
+
+def track_data(cues, strip_name):
+    """Pack a CueStore (sorted by start) into ID-property friendly values."""
+    used = sorted(set(cues.text_ids))
+    remap = {text_id: position for position, text_id in enumerate(used)}
+    return {
+        "strip": strip_name,
+        "starts": cues.starts.tolist(),
+        "ends": cues.ends.tolist(),
+        "texts": TEXT_SEPARATOR.join(cues.texts[text_id].replace(TEXT_SEPARATOR, " ") for text_id in used),
+        "text_ids": [remap[text_id] for text_id in cues.text_ids],
+        "styles": json.dumps(cues.styles),
+        "style_ids": cues.style_ids.tolist(),
+    }
+
+
+def create_subtitle_track(scene, cues, channel, name):
+    """Create or replace the track ``name`` from a CueStore.
+
+    Returns ``(strip, cue_count)``. An existing track strip is reused and
+    resized, so re-importing a text block keeps its channel and edits.
+    """
+    cues.sort_by_start()
+    sequencer = scene.sequence_editor or scene.sequence_editor_create()
+    rate = render_frame_rate(scene.render)
+    frame_start = ms_to_frame(cues.starts[0], rate)
+    frame_end = max(ms_to_frame(max(cues.ends), rate), frame_start + 1)
+
+    tracks = scene.get(TRACKS_PROP)
+    old = tracks.get(name) if tracks else None
+    strip = sequencer.sequences_all.get(old["strip"]) if old else None
+    if strip is None:
+        deselect_all(sequencer)
+        strip = sequencer.sequences.new_effect(
+            name=f"Subtitles: {name}",
+            type='TEXT',
+            channel=channel,
+            frame_start=frame_start,
+            frame_end=frame_end,
+        )
+        strip[TRACK_PROP] = name
+    else:
+        strip.frame_start += frame_start - strip.frame_final_start
+        strip.frame_final_duration = frame_end - frame_start
+
+    if tracks is None:
+        scene[TRACKS_PROP] = {}
+        tracks = scene[TRACKS_PROP]
+    tracks[name] = track_data(cues, strip.name)
+
+    _indexes.pop((scene.as_pointer(), name), None)
+    track_index(scene, name).show(sequencer, frame_to_ms(scene.frame_current, rate))
+    return strip, len(cues)
+
@@ -0,0 +1,33 @@
+"""Streaming subtitle writers.
+
+Codecs render cues block by block through generators (see
+subtitle_formats), so output can go straight to a buffered file or into a
+text block in bounded chunks instead of being built up as one growing
+string.
+"""
+
+# Characters handed to a text block per write
+CHUNK_SIZE = 256 * 1024
+# Buffer size for files opened by write_subtitle_stream
+WRITE_BUFFER = 1024 * 1024
+
+
+def iter_chunks(blocks, chunk_size=CHUNK_SIZE):
+    """Group rendered blocks into strings of roughly ``chunk_size`` characters."""
+    pending = []
+    size = 0
+    for block in blocks:
+        pending.append(block)
+        size += len(block)
+        if size >= chunk_size:
+            yield "".join(pending)
+            pending = []
+            size = 0
+    if pending:
+        yield "".join(pending)
+
+
+def write_subtitle_stream(file_path, blocks):
+    """Write rendered blocks to a file through a large buffer."""
+    with open(file_path, 'w', encoding='utf-8', newline='\n', buffering=WRITE_BUFFER) as file:
+        file.writelines(blocks)
@@ -0,0 +1,271 @@
+"""Cached statistics for the Text Editor footer.
+
+Each text block gets a cache of per-line character and non-space counts in
+Fenwick trees, so the size of any selection is a couple of prefix-sum
+lookups instead of a walk over every selected line. The cache also tracks
+which lines are SRT timecode lines for the subtitle stats.
+
+Every draw first makes a cheap check that does not depend on the size of
+the text: the line count and the lines under the cursor, at the selection
+end and at both ends of the text must match the cache. Text Editor edits
+(typing, indenting a selection, Replace All) always change one of those;
+operators that rewrite a block drop its cache (forget_text), as does undo
+(clear_caches). Only when the check fails is the whole text compared with
+the cached lines from both ends, a C-level list comparison, and only the
+lines in between are re-counted. The Fenwick trees are built lazily, when
+a selection spans several lines.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+
+from .srt_parser import TIMING_RE, match_to_ms
+
+
+class FenwickTree:
+    """Binary indexed tree over integers with O(log n) update and prefix sum."""
+
+    __slots__ = ("tree",)
+
+    def __init__(self, values):
+        tree = array("q", [0])
+        tree.extend(values)
+        size = len(tree)
+        for i in range(1, size):
+            parent = i + (i & -i)
+            if parent < size:
+                tree[parent] += tree[i]
+        self.tree = tree
+
+    def add(self, index, delta):
+        """Add ``delta`` to the value at ``index`` (0-based)."""
+        tree = self.tree
+        i = index + 1
+        size = len(tree)
+        while i < size:
+            tree[i] += delta
+            i += i & -i
+
+    def prefix(self, index):
+        """Return the sum of the values before ``index`` (0-based, exclusive)."""
+        tree = self.tree
+        total = 0
+        i = index
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+
+def non_space_count(body):
+    return len(body) - body.count(" ")
+
+
+def is_timing_line(body):
+    return "-->" in body and TIMING_RE.match(body) is not None
+
+
+def common_prefix(old, new):
+    """Return how many leading items two lists share."""
+    low, high = 0, min(len(old), len(new))
+    # Each comparison covers only the part not known to match yet
+    while low < high:
+        middle = (low + high + 1) // 2
+        if old[low:middle] == new[low:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def common_suffix(old, new, limit):
+    """Return how many trailing items (at most ``limit``) two lists share."""
+    low, high = 0, limit
+    old_size, new_size = len(old), len(new)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if old[old_size - middle:old_size - low] == new[new_size - middle:new_size - low]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+class TextStats:
+    """Per-line statistics of one text block."""
+
+    __slots__ = ("signature", "bodies", "lengths", "non_spaces", "_trees", "timing_lines")
+
+    def __init__(self, bodies, signature=None):
+        self.signature = signature
+        self.bodies = []
+        self.lengths = array("q")
+        self.non_spaces = array("q")
+        self.timing_lines = []
+        self._trees = None
+        self.splice(0, 0, bodies)
+
+    @property
+    def line_count(self):
+        return len(self.bodies)
+
+    def looks_current(self, lines, line_indices=()):
+        """Return True if ``lines`` has the cached line count and the cached
+        bodies at the first and last lines and at ``line_indices``."""
+        count = len(lines)
+        bodies = self.bodies
+        if count != len(bodies):
+            return False
+        for index in {0, count - 1, *line_indices}:
+            if 0 <= index < count and lines[index].body != bodies[index]:
+                return False
+        return True
+
+    def update(self, bodies, signature=None):
+        """Bring the cache up to date with the text's current lines."""
+        old = self.bodies
+        prefix = common_prefix(old, bodies)
+        suffix = common_suffix(old, bodies, min(len(old), len(bodies)) - prefix)
+        if prefix + suffix < len(old) or len(old) != len(bodies):
+            self.splice(prefix, len(old) - suffix, bodies[prefix:len(bodies) - suffix])
+        self.signature = signature
+
+    def splice(self, first, stop, bodies):
+        """Replace the cached lines ``first`` to ``stop`` (exclusive) with new lines."""
+        bodies = list(bodies)
+        lengths = array("q", map(len, bodies))
+        non_spaces = array("q", map(non_space_count, bodies))
+        shift = len(bodies) - (stop - first)
+        if self._trees is not None and not shift:
+            # Same line count: patch the trees instead of dropping them
+            length_tree, non_space_tree = self._trees
+            for offset in range(len(bodies)):
+                length_tree.add(first + offset, lengths[offset] - self.lengths[first + offset])
+                non_space_tree.add(first + offset, non_spaces[offset] - self.non_spaces[first + offset])
+        else:
+            self._trees = None
+        self.bodies[first:stop] = bodies
+        self.lengths[first:stop] = lengths
+        self.non_spaces[first:stop] = non_spaces
+
+        timing_lines = self.timing_lines
+        before = bisect_left(timing_lines, first)
+        after = bisect_left(timing_lines, stop)
+        timing_lines[before:] = [
+            *(first + offset for offset, body in enumerate(bodies) if is_timing_line(body)),
+            *(index + shift for index in timing_lines[after:]),
+        ]
+
+    def range_count(self, first, last, count_spaces=True):
+        """Count the characters of lines ``first`` to ``last`` (exclusive)."""
+        if last <= first:
+            return 0
+        if last - first == 1:
+            return self.lengths[first] if count_spaces else self.non_spaces[first]
+        if self._trees is None:
+            self._trees = (FenwickTree(self.lengths), FenwickTree(self.non_spaces))
+        tree = self._trees[0 if count_spaces else 1]
+        return tree.prefix(last) - tree.prefix(first)
+
+    def current_cue(self, line_index):
+        """Return ``(cue_number, timing_line)`` of the cue containing a line, or None."""
+        position = bisect_right(self.timing_lines, line_index)
+        if position == 0:
+            return None
+        return position, self.timing_lines[position - 1]
+
+    @property
+    def cue_count(self):
+        return len(self.timing_lines)
+
+
+_caches = {}
+
+
+def clear_caches():
+    """Drop every cached text block, e.g. after undo or loading a file."""
+    _caches.clear()
+
+
+def forget_text(text):
+    """Drop the cache of one text block, e.g. after an operator rewrote it."""
+    _caches.pop(text.as_pointer(), None)
+
+
+def text_stats(text):
+    """Return the up-to-date TextStats of a Blender text block."""
+    key = text.as_pointer()
+    stats = _caches.get(key)
+    lines = text.lines
+    if stats is not None and stats.looks_current(lines, (text.current_line_index, text.select_end_line_index)):
+        return stats
+
+    content = text.as_string()
+    signature = hash(content)
+    if stats is not None and stats.signature == signature:
+        return stats
+
+    bodies = content.split("\n")
+    if len(bodies) != len(lines):
+        bodies = [line.body for line in lines]
+    if stats is None:
+        stats = _caches[key] = TextStats(bodies, signature)
+    else:
+        stats.update(bodies, signature)
+    return stats
+
+
+def cue_block(text, stats, line_index):
+    """Return ``(cue_number, start_ms, end_ms, text)`` of the cue at a line, or None.
+
+    Only the lines of that cue are read: its timecode line and the text up
+    to the next blank line. If the cached timecode line is no longer one,
+    ``stats`` is rebuilt from the text first.
+    """
+    lines = text.lines
+    cue = stats.current_cue(line_index)
+    match = None
+    if cue is not None and cue[1] < len(lines):
+        match = TIMING_RE.match(lines[cue[1]].body)
+    if cue is not None and match is None:
+        # The cache is out of step with the text: re-read every line in place
+        stats.splice(0, stats.line_count, [line.body for line in lines])
+        cue = stats.current_cue(line_index)
+        if cue is not None:
+            match = TIMING_RE.match(lines[cue[1]].body)
+    if match is None:
+        return None
+    cue_number, timing_line = cue
+    text_lines = []
+    for index in range(timing_line + 1, len(lines)):
+        body = lines[index].body
+        if not body.strip():
+            break
+        text_lines.append(body)
+    return cue_number, match_to_ms(match, 1), match_to_ms(match, 5), "\n".join(text_lines)
+
+
+def selected_character_count(text, count_spaces=True, stats=None):
+    """Count the characters selected in a text block from its cached statistics.
+
+    Line breaks are not counted. ``stats`` may be passed when the caller
+    already has the block's up-to-date TextStats.
+    """
+    if stats is None:
+        stats = text_stats(text)
+    start = (text.current_line_index, text.current_character)
+    end = (text.select_end_line_index, text.select_end_character)
+    (start_line, start_col), (end_line, end_col) = sorted((start, end))
+
+    # Whole lines strictly between the two ends come from the prefix sums
+    total = stats.range_count(start_line + 1, end_line, count_spaces)
+
+    # Partial first and last lines are sliced directly
+    lines = text.lines
+    if start_line == end_line:
+        pieces = (lines[start_line].body[start_col:end_col],)
+    else:
+        pieces = (lines[start_line].body[start_col:], lines[end_line].body[:end_col])
+    for piece in pieces:
+        total += len(piece) if count_spaces else non_space_count(piece)
+    return total
@@ -0,0 +1,58 @@
+"""Exact conversion between integer milliseconds and frames.
+
+Frame rates are kept as fractions (``render.fps / render.fps_base``), so
+23.976 and 29.97 fps projects convert without drift over a feature, and
+all conversions are integer arithmetic rounded to the nearest frame or
+millisecond.
+"""
+
+import re
+from fractions import Fraction
+
+# NTSC rates use fps_base 1.001, stored by Blender as a float
+MAX_BASE_DENOMINATOR = 1001
+
+# [h:]mm:ss[,.]mmm, as typed into retime fields
+TIMECODE_RE = re.compile(r"^\s*(?:(\d+):)?(\d{1,2}):(\d{1,2})(?:[,.](\d{1,3}))?\s*$")
+
+
+def frame_rate(fps, fps_base=1.0):
+    """Return ``fps / fps_base`` as an exact Fraction."""
+    base = Fraction(fps_base).limit_denominator(MAX_BASE_DENOMINATOR)
+    return Fraction(fps) / base
+
+
+def render_frame_rate(render):
+    """Return the frame rate of a scene's render settings as a Fraction."""
+    return frame_rate(render.fps, getattr(render, "fps_base", 1.0))
+
+
+def ms_to_frame(ms, rate):
+    """Return the frame nearest to ``ms`` milliseconds."""
+    rate = Fraction(rate)
+    return (ms * rate.numerator + rate.denominator * 500) // (rate.denominator * 1000)
+
+
+def frame_to_ms(frame, rate):
+    """Return the start of ``frame`` in whole milliseconds (rounded)."""
+    rate = Fraction(rate)
+    return (frame * 2000 * rate.denominator + rate.numerator) // (2 * rate.numerator)
+
+
+def iter_ms_to_frames(values, rate):
+    """Convert many millisecond values to frames with the same rounding as ms_to_frame."""
+    rate = Fraction(rate)
+    numerator = rate.numerator
+    half = rate.denominator * 500
+    divisor = rate.denominator * 1000
+    return ((ms * numerator + half) // divisor for ms in values)
+
+
+def parse_timecode(value):
+    """Parse ``[h:]mm:ss[,mmm]`` or plain seconds into milliseconds (ValueError if invalid)."""
+    match = TIMECODE_RE.match(value)
+    if not match:
+        return round(float(value) * 1000)
+    hours, minutes, seconds, fraction = match.groups()
+    ms = int((fraction or "0").ljust(3, "0"))
+    return ((int(hours or 0) * 60 + int(minutes)) * 60 + int(seconds)) * 1000 + ms
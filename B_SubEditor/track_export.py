@@ -0,0 +1,64 @@
+"""Grouping of text strips into subtitle tracks for a one-pass export.
+
+All TEXT strips are split into tracks in a single walk, either by channel
+(strips inside meta strips get tracks of their own, keyed by the channels
+of their metas) or by the ``[Speaker]`` tag that imports put in front of strip names and
+texts, and each track is sorted by start so it can be written straight to
+disk.
+"""
+
+import re
+from operator import attrgetter
+
+SPEAKER_RE = re.compile(r"^\[(.*?)\]")
+# Characters kept in track names used as file names
+UNSAFE_NAME_RE = re.compile(r"[^\w.-]+")
+
+start_order = attrgetter("frame_final_start", "channel")
+
+
+def strip_speaker(strip):
+    """Return the ``[Speaker]`` tag of a strip's name or text, or an empty string."""
+    match = SPEAKER_RE.match(strip.name) or SPEAKER_RE.match(strip.text)
+    return match.group(1).strip() if match else ""
+
+
+def channel_path(strip):
+    """Return the channels from the main timeline down to a strip.
+
+    Strips inside a meta have channels relative to the meta, so the meta's
+    own channels come first: ``(3,)`` on the timeline, ``(3, 1)`` inside the
+    meta strip on channel 3.
+    """
+    channels = [strip.channel]
+    meta = strip.parent_meta()
+    while meta is not None:
+        channels.append(meta.channel)
+        meta = meta.parent_meta()
+    return tuple(reversed(channels))
+
+
+def group_strips(strips, by='CHANNEL', skip=None):
+    """Group TEXT strips into tracks in one walk.
+
+    ``by`` is 'CHANNEL' (keys are channel_path tuples) or 'SPEAKER';
+    ``skip(strip)`` may exclude strips. Returns ``(key, strips)`` pairs sorted by key, with the strips of every
+    track sorted by start.
+    """
+    key = channel_path if by == 'CHANNEL' else strip_speaker
+    groups = {}
+    for strip in strips:
+        if strip.type != 'TEXT' or (skip is not None and skip(strip)):
+            continue
+        groups.setdefault(key(strip), []).append(strip)
+    for group in groups.values():
+        group.sort(key=start_order)
+    return sorted(groups.items())
+
+
+def track_file_stem(prefix, key, by='CHANNEL'):
+    """Return the output file name (without extension) of a track."""
+    if by == 'CHANNEL':
+        return f"{prefix}_channel_{'_'.join(map(str, key))}"
+    speaker = UNSAFE_NAME_RE.sub("_", key).strip("_")
+    return f"{prefix}_{speaker}" if speaker else prefix
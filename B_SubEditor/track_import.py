@@ -0,0 +1,57 @@
+"""Concurrent parsing of several subtitle tracks for a multi-track import.
+
+A multi-language delivery is a set of files or text blocks, one per
+language. They are parsed together in a thread pool (file reads, cache
+loads and hashing overlap with parsing) and come back in input order, each
+with its own cues, errors and parse time, ready to be placed on its own
+channel.
+"""
+
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from .parse_cache import cached_parse, load_subtitle_file
+from .subtitle_core import parse_subtitle_data
+
+MAX_WORKERS = 8
+
+# name: track name, also the re-sync source of its strips
+# path: subtitle file to read, or None for ``content`` (e.g. a text block)
+# format: subtitle format, or None to detect it (files only)
+TrackSource = namedtuple("TrackSource", "name path content format")
+
+# cues: CueStore or None; errors: (line, message) pairs; seconds: parse time
+ParsedTrack = namedtuple("ParsedTrack", "name cues errors seconds")
+
+
+def file_track(path, format=None):
+    return TrackSource(os.path.basename(path), path, None, format)
+
+
+def parse_track(source, cache=None):
+    """Parse one track; errors are reported in the result, never raised."""
+    started = time.perf_counter()
+    try:
+        if source.path:
+            cues, errors = load_subtitle_file(source.path, cache, source.format)
+        else:
+            format = source.format or 'SRT'
+            cues, errors = cached_parse(
+                cache, source.content, format,
+                lambda content, errors: parse_subtitle_data(content, errors, format),
+            )
+    except Exception as e:
+        cues, errors = None, [(0, str(e))]
+    return ParsedTrack(source.name, cues, errors, time.perf_counter() - started)
+
+
+def parse_tracks(sources, cache=None, max_workers=None):
+    """Parse several TrackSources concurrently; returns ParsedTracks in input order."""
+    if max_workers is None:
+        max_workers = min(MAX_WORKERS, os.cpu_count() or 1)
+    if len(sources) < 2 or max_workers < 2:
+        return [parse_track(source, cache) for source in sources]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(sources))) as executor:
+        return list(executor.map(lambda source: parse_track(source, cache), sources))
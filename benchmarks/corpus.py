@@ -0,0 +1,71 @@
+"""Synthetic SRT corpora for the benchmarks.
+
+Cue text, styling and timing follow a fixed pattern, so the same size and
+profile always produce the same file and runs can be compared.
+"""
+
+from itertools import cycle
+
+from B_SubEditor.srt_parser import ms_to_timecode
+
+WORDS = (
+    "the quick brown fox jumps over a lazy dog while subtitles roll past "
+    "every frame of the cut until the last reel fades out to black"
+).split()
+
+# (opening, closing) tag pairs used by the styled profiles
+STYLES = (
+    ("", ""),
+    ("<b>", "</b>"),
+    ("<i>", "</i>"),
+    ('<font color="#FFCC00">', "</font>"),
+    ('<font size="52" color="yellow"><b>', "</b></font>"),
+    ("<u><i>", "</i></u>"),
+    ("{\\an8}<b>", "</b>"),
+)
+
+# name: (styled, crlf, multiline)
+PROFILES = {
+    "plain": (False, False, False),
+    "styled": (True, False, False),
+    "crlf": (False, True, False),
+    "multiline": (False, False, True),
+    "heavy": (True, True, True),
+}
+
+
+def cue_text(number, styled, multiline):
+    words = [WORDS[(number * 7 + i) % len(WORDS)] for i in range(4 + number % 6)]
+    if multiline and number % 3:
+        half = len(words) // 2
+        lines = [" ".join(words[:half]), " ".join(words[half:])]
+        if number % 5 == 0:
+            lines.append("- " + WORDS[number % len(WORDS)])
+    else:
+        lines = [" ".join(words)]
+    if styled:
+        opening, closing = STYLES[number % len(STYLES)]
+        if number % 4 == 0 and len(lines) > 1:
+            # Styling applied to part of the cue only
+            lines[0] = f"{opening}{lines[0]}{closing}"
+        else:
+            lines = [f"{opening}{line}{closing}" for line in lines]
+    return "\n".join(lines)
+
+
+def iter_srt_blocks(count, styled=False, crlf=False, multiline=False):
+    """Yield ``count`` SRT cue blocks."""
+    newline = "\r\n" if crlf else "\n"
+    start = 1000
+    gaps = cycle((80, 120, 400, 40, 1500))
+    for number in range(1, count + 1):
+        end = start + 900 + (number % 9) * 250
+        text = cue_text(number, styled, multiline).replace("\n", newline)
+        yield f"{number}{newline}{ms_to_timecode(start)} --> {ms_to_timecode(end)}{newline}{text}{newline}{newline}"
+        start = end + next(gaps)
+
+
+def make_srt(count, profile="heavy"):
+    """Return an SRT document of ``count`` cues in one of PROFILES."""
+    styled, crlf, multiline = PROFILES[profile]
+    return "".join(iter_srt_blocks(count, styled, crlf, multiline))
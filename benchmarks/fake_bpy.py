@@ -0,0 +1,183 @@
+"""A minimal stand-in for ``bpy`` so strip creation can be timed without Blender.
+
+Only what the add-on touches at import time and during strip creation is
+modelled: RNA base classes and property functions are inert, and the
+sequencer keeps plain Python strip objects in lists. Call install() before
+importing B_SubEditor.
+"""
+
+import sys
+import types
+
+
+class FakeStrip:
+    """A TEXT (or META) strip with the properties the add-on reads and writes."""
+
+    def __init__(self, name, type, channel, frame_start, frame_end, parent=None):
+        self.name = name
+        self.type = type
+        self.channel = channel
+        self.frame_start = frame_start
+        self.frame_final_duration = frame_end - frame_start
+        self.select = True
+        self.text = ""
+        self.use_bold = False
+        self.use_italic = False
+        self.use_box = False
+        self.font_size = 60
+        self.color = (1.0, 1.0, 1.0, 1.0)
+        self.wrap_width = 1.0
+        self._location = [0.5, 0.5]
+        self._parent = parent
+        self._props = {}
+        if type == 'META':
+            self.sequences = FakeStrips(self)
+
+    @property
+    def location(self):
+        return self._location
+
+    @location.setter
+    def location(self, value):
+        # Like Blender's float array: assignment copies the values in place
+        self._location = list(value)
+
+    @property
+    def frame_final_start(self):
+        return self.frame_start
+
+    @property
+    def frame_final_end(self):
+        return self.frame_start + self.frame_final_duration
+
+    def parent_meta(self):
+        return self._parent
+
+    def get(self, key, default=None):
+        return self._props.get(key, default)
+
+    def __getitem__(self, key):
+        return self._props[key]
+
+    def __setitem__(self, key, value):
+        self._props[key] = value
+
+    def __delitem__(self, key):
+        del self._props[key]
+
+
+class FakeStrips(list):
+    """The ``sequences`` collection of a sequence editor or meta strip."""
+
+    def __init__(self, owner=None):
+        super().__init__()
+        self.owner = owner
+
+    def new_effect(self, name, type, channel, frame_start, frame_end):
+        strip = FakeStrip(name, type, channel, frame_start, frame_end, self.owner)
+        self.append(strip)
+        return strip
+
+    def new_meta(self, name, channel, frame_start):
+        strip = FakeStrip(name, 'META', channel, frame_start, frame_start + 1, self.owner)
+        self.append(strip)
+        return strip
+
+    def get(self, name, default=None):
+        for strip in self:
+            if strip.name == name:
+                return strip
+        return default
+
+    def foreach_set(self, attr, values):
+        for strip, value in zip(self, values):
+            setattr(strip, attr, value)
+
+
+class FakeSequenceEditor:
+    def __init__(self):
+        self.sequences = FakeStrips()
+
+    @property
+    def sequences_all(self):
+        strips = FakeStrips()
+        pending = list(self.sequences)
+        while pending:
+            strip = pending.pop()
+            strips.append(strip)
+            if strip.type == 'META':
+                pending.extend(strip.sequences)
+        return strips
+
+
+class FakeScene(dict):
+    """A scene; ID properties are kept in the dict itself."""
+
+    def __init__(self, fps=25):
+        super().__init__()
+        self.render = types.SimpleNamespace(fps=fps, fps_base=1.0)
+        self.sequence_editor = None
+        self.frame_current = 1
+
+    def as_pointer(self):
+        return id(self)
+
+    def sequence_editor_create(self):
+        self.sequence_editor = FakeSequenceEditor()
+        return self.sequence_editor
+
+
+def fake_context(fps=25):
+    """Return an object with a fresh ``scene``, enough for create_text_strips."""
+    return types.SimpleNamespace(scene=FakeScene(fps))
+
+
+class _Namespace(types.ModuleType):
+    """Module whose unknown attributes resolve to ``factory(name)``."""
+
+    def __init__(self, name, factory):
+        super().__init__(name)
+        self._factory = factory
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        value = self._factory(name)
+        setattr(self, name, value)
+        return value
+
+
+def _property(name):
+    def make(**kwargs):
+        return (name, kwargs)
+    return make
+
+
+def _rna_type(name):
+    return type(name, (), {"append": classmethod(lambda cls, f: None),
+                           "remove": classmethod(lambda cls, f: None)})
+
+
+def install():
+    """Register the fake ``bpy`` modules in sys.modules (no-op if bpy exists)."""
+    if "bpy" in sys.modules:
+        return sys.modules["bpy"]
+
+    bpy = types.ModuleType("bpy")
+    bpy.types = _Namespace("bpy.types", _rna_type)
+    bpy.props = _Namespace("bpy.props", _property)
+    bpy.utils = types.SimpleNamespace(register_class=lambda cls: None, unregister_class=lambda cls: None)
+    bpy.data = types.SimpleNamespace(texts={})
+    bpy.ops = types.SimpleNamespace()
+
+    handlers = types.ModuleType("bpy.app.handlers")
+    handlers.persistent = lambda function: function
+    app = types.ModuleType("bpy.app")
+    app.handlers = handlers
+    app.timers = types.SimpleNamespace(register=lambda *args, **kwargs: None,
+                                       is_registered=lambda function: False,
+                                       unregister=lambda function: None)
+    bpy.app = app
+
+    sys.modules.update({"bpy": bpy, "bpy.app": app, "bpy.app.handlers": handlers})
+    return bpy
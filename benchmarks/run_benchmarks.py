@@ -0,0 +1,217 @@
+"""Time the subtitle pipeline on synthetic corpora and compare with a baseline.
+
+Stages timed per corpus: SRT parsing (parse_srt_data), style extraction
+(process_srt_styles over every raw cue), conversion from SRT to VTT and
+ASS (convert_from_srt), strip creation (create_text_strips, against the
+fake sequencer in fake_bpy) and re-sync of those strips with an edited
+copy of the file (sync_text_strips). Every stage reports its best wall time over
+``--repeat`` runs and, in a separate traced run, its peak Python memory.
+
+    python benchmarks/run_benchmarks.py --sizes 1000 100000 --profiles heavy
+    python benchmarks/run_benchmarks.py --save          # store a new baseline
+    python benchmarks/run_benchmarks.py --sizes 1000000 --no-memory
+
+Results slower (or larger) than the baseline by more than ``--threshold``
+are flagged and make the script exit with status 1.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import fake_bpy  # noqa: E402
+
+fake_bpy.install()
+
+from B_SubEditor import (  # noqa: E402
+    convert_from_srt, create_text_strips, parse_srt_data, process_srt_styles,
+)
+from B_SubEditor.addon import resolve_style_table  # noqa: E402
+from B_SubEditor.srt_parser import iter_srt_cues  # noqa: E402
+from B_SubEditor.strip_batch import sync_text_strips  # noqa: E402
+from B_SubEditor.timebase import render_frame_rate  # noqa: E402
+from corpus import PROFILES, make_srt  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_SIZES = (1000, 10000, 100000)
+# Source name the sync stage tags its strips with
+SYNC_SOURCE = "benchmark.srt"
+# Time differences below this are timer noise, never regressions
+MIN_DELTA_SECONDS = 0.005
+
+
+def stage_parse(content):
+    return lambda: None, lambda _: parse_srt_data(content)
+
+
+def stage_styles(content):
+    texts = [cue.text for cue in iter_srt_cues(content)]
+
+    def run(_):
+        for text in texts:
+            process_srt_styles(text)
+    return lambda: None, run
+
+
+def stage_convert(target_format):
+    def stage(content):
+        return lambda: None, lambda _: convert_from_srt(content, target_format)
+    return stage
+
+
+def stage_strips(content):
+    subtitles = parse_srt_data(content)
+
+    def setup():
+        # A fresh scene and an unsorted copy of the cues for every run
+        return fake_bpy.fake_context(), subtitles.take(range(len(subtitles)))
+
+    def run(args):
+        context, cues = args
+        create_text_strips(context, cues, channel=2)
+    return setup, run
+
+
+def stage_sync(content):
+    subtitles = parse_srt_data(content)
+    # Retexts some cues and moves the top-aligned ones down, so sync updates
+    # text, style and location of a share of the strips
+    edited = parse_srt_data(content.replace("fox", "cat").replace("{\\an8}", ""))
+
+    def setup():
+        context = fake_bpy.fake_context()
+        create_text_strips(context, subtitles.take(range(len(subtitles))), channel=2, source=SYNC_SOURCE)
+        return context.scene, edited.take(range(len(edited)))
+
+    def run(args):
+        scene, cues = args
+        sync_text_strips(
+            scene.sequence_editor, cues, SYNC_SOURCE, 2,
+            render_frame_rate(scene.render), resolve_style_table(cues),
+        )
+    return setup, run
+
+
+STAGES = (
+    ("parse", stage_parse),
+    ("styles", stage_styles),
+    ("convert_vtt", stage_convert('VTT')),
+    ("convert_ass", stage_convert('ASS')),
+    ("strips", stage_strips),
+    ("sync", stage_sync),
+)
+
+
+def measure(setup, run, repeat, memory=True):
+    """Return ``(best_seconds, peak_bytes)`` of ``run(setup())``."""
+    best = None
+    for _ in range(repeat):
+        args = setup()
+        gc.collect()
+        start = time.perf_counter()
+        run(args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        del args
+
+    peak = 0
+    if memory:
+        args = setup()
+        gc.collect()
+        tracemalloc.start()
+        run(args)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return best, peak
+
+
+def run_benchmarks(sizes, profiles, stages, repeat, memory):
+    """Run every stage on every corpus and return ``{key: result}``."""
+    results = {}
+    for profile in profiles:
+        for size in sizes:
+            content = make_srt(size, profile)
+            print(f"{profile} / {size} cues ({len(content) / 1048576:.1f} MB)")
+            for name, stage in STAGES:
+                if stages and name not in stages:
+                    continue
+                setup, run = stage(content)
+                seconds, peak = measure(setup, run, repeat, memory)
+                key = f"{profile}/{size}/{name}"
+                results[key] = {"seconds": round(seconds, 6), "peak_mb": round(peak / 1048576, 3)}
+                memory_note = f"  peak {peak / 1048576:8.1f} MB" if memory else ""
+                print(f"  {name:<12} {seconds:9.4f}s  {size / seconds:12.0f} cues/s{memory_note}")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return a line for every result worse than the baseline by more than ``threshold``."""
+    regressions = []
+    for key, result in results.items():
+        reference = baseline.get(key)
+        if not reference:
+            continue
+        for field in ("seconds", "peak_mb"):
+            old = reference.get(field) or 0
+            new = result[field]
+            if field == "seconds" and new - old < MIN_DELTA_SECONDS:
+                continue
+            if old > 0 and new > old * (1 + threshold):
+                regressions.append(f"{key} {field}: {old} -> {new} (+{(new / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="cue counts")
+    parser.add_argument("--profiles", nargs="+", default=["heavy"], choices=sorted(PROFILES),
+                        help="corpus profiles (default: heavy)")
+    parser.add_argument("--stages", nargs="+", choices=[name for name, _ in STAGES],
+                        help="only run these stages")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage (best is kept)")
+    parser.add_argument("--no-memory", dest="memory", action="store_false",
+                        help="skip the traced run that measures peak memory")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown before a result is flagged (default: 0.25 = 25%%)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    results = run_benchmarks(args.sizes, args.profiles, args.stages, max(1, args.repeat), args.memory)
+
+    if args.save:
+        data = {"python": platform.python_version(), "machine": platform.machine(), "results": results}
+        with open(args.baseline, 'w', encoding='utf-8') as file:
+            json.dump(data, file, indent=1, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save to create one.")
+        return 0
+    with open(args.baseline, encoding='utf-8') as file:
+        baseline = json.load(file)["results"]
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print("Regressions against the baseline:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("No regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,6 @@
+"""Make the add-on package importable without installing it or Blender."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,95 @@
+import wave
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from B_SubEditor.audio_snap import (  # noqa: E402
+    chunked_envelope, samples_envelope, snap_arrays, snap_times, speech_boundaries, wav_envelope,
+)
+
+RATE = 8000
+
+
+def tone_track(sections, rate=RATE):
+    """Return mono float samples: ``sections`` are ``(milliseconds, loud)`` pairs."""
+    rng = np.random.default_rng(0)
+    pieces = []
+    for ms, loud in sections:
+        count = rate * ms // 1000
+        noise = rng.normal(0, 0.001, count)
+        if loud:
+            noise += 0.5 * np.sin(np.arange(count) * 2 * np.pi * 440 / rate)
+        pieces.append(noise)
+    return np.concatenate(pieces).astype(np.float32)
+
+
+SECTIONS = [(1000, False), (1500, True), (1000, False), (800, True), (700, False)]
+
+
+def test_speech_boundaries_find_onsets_and_offsets():
+    rms, step_ms = samples_envelope(tone_track(SECTIONS), RATE)
+    onsets, offsets = speech_boundaries(rms, step_ms)
+    assert onsets.tolist() == [1000, 3500]
+    assert offsets.tolist() == [2500, 4300]
+
+
+def test_speech_boundaries_bridge_short_pauses_and_drop_blips():
+    sections = [(1000, False), (500, True), (100, False), (500, True), (1000, False), (50, True), (1000, False)]
+    rms, step_ms = samples_envelope(tone_track(sections), RATE)
+    onsets, offsets = speech_boundaries(rms, step_ms, min_silence_ms=150, min_speech_ms=100)
+    assert onsets.tolist() == [1000]
+    assert offsets.tolist() == [2100]
+
+
+def test_silence_has_no_boundaries():
+    onsets, offsets = speech_boundaries(np.zeros(0), 10)
+    assert len(onsets) == len(offsets) == 0
+
+
+def test_snap_times_only_within_tolerance():
+    targets = np.array([1000, 2000, 5000])
+    snapped = snap_times([900, 1490, 1750, 4000, 5250], targets, 300)
+    assert snapped.tolist() == [1000, 1490, 2000, 4000, 5000]
+    assert snap_times([100, 200], np.array([], dtype=np.int64), 300).tolist() == [100, 200]
+
+
+def test_snap_arrays_keep_ends_after_starts():
+    starts, ends = snap_arrays([900, 3000], [1950, 3100], np.array([1000, 3200]), np.array([2000, 2900]), 300)
+    assert starts.tolist() == [1000, 3200]
+    # 2900 would precede the snapped start, so the old end is kept (moved past the start if needed)
+    assert ends.tolist() == [2000, 3201]
+
+
+@pytest.mark.parametrize("sample_width", [1, 2, 3, 4])
+def test_wav_envelope_matches_the_samples(tmp_path, sample_width):
+    samples = tone_track(SECTIONS)
+    stereo = np.repeat(samples[:, None], 2, axis=1)
+    scale = 2 ** (8 * sample_width - 1) - 1
+    pcm = np.rint(stereo * scale).astype("<i4")
+    if sample_width == 1:
+        data = (pcm + 128).astype(np.uint8).tobytes()
+    else:
+        data = b"".join(value.to_bytes(4, "little", signed=True)[:sample_width] for value in pcm.reshape(-1).tolist())
+    path = str(tmp_path / "speech.wav")
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(2)
+        wav.setsampwidth(sample_width)
+        wav.setframerate(RATE)
+        wav.writeframes(data)
+
+    rms, step_ms = wav_envelope(path)
+    expected, _ = samples_envelope(samples, RATE)
+    assert step_ms == 10
+    assert len(rms) == len(expected)
+    assert np.allclose(rms, expected, atol=2.0 / 2 ** (8 * sample_width - 1))
+    assert speech_boundaries(rms, step_ms)[0].tolist() == [1000, 3500]
+
+
+def test_chunked_envelope_matches_one_pass():
+    samples = tone_track(SECTIONS)
+    whole, step_ms = samples_envelope(samples, RATE)
+    chunks = np.array_split(samples, [777, 5000, 5001, 20000])
+    rms, chunked_step_ms = chunked_envelope(iter(chunks), RATE)
+    assert chunked_step_ms == step_ms
+    assert np.allclose(rms, whole)
@@ -0,0 +1,60 @@
+import os
+
+from B_SubEditor.batch_convert import convert_file, main
+
+GOOD = "1\n00:00:01,000 --> 00:00:02,000\nhello\n"
+HALF = GOOD + "\nnot a cue\n\n2\n00:00:03,000 --> 00:00:04,000\nworld\n"
+
+
+def write(path, content):
+    path.write_text(content, encoding="utf-8")
+    return str(path)
+
+
+def test_convert_file_writes_valid_cues(tmp_path):
+    source = write(tmp_path / "ok.srt", GOOD)
+    target = str(tmp_path / "out" / "ok.vtt")
+    _, cues, malformed, _, _, error = convert_file((source, target, 'VTT', False))
+    assert (cues, malformed, error) == (1, [], None)
+    assert open(target, encoding="utf-8").read().startswith("WEBVTT")
+
+
+def test_convert_file_returns_malformed_blocks(tmp_path):
+    source = write(tmp_path / "half.srt", HALF)
+    _, cues, malformed, _, _, error = convert_file((source, str(tmp_path / "half.vtt"), 'VTT', False))
+    assert cues == 2
+    assert error is None
+    assert [line for line, _ in malformed] == [5]
+
+
+def test_convert_file_fails_without_cues(tmp_path):
+    target = tmp_path / "bad.vtt"
+    for name, content in (("bad.srt", "not\na subtitle\n"), ("empty.srt", "")):
+        source = write(tmp_path / name, content)
+        _, cues, _, _, _, error = convert_file((source, str(target), 'VTT', False))
+        assert cues == 0
+        assert error.startswith("no valid subtitles")
+    assert not target.exists()
+
+
+def test_main_reports_failures_and_warnings(tmp_path, capsys):
+    source = tmp_path / "in"
+    source.mkdir()
+    write(source / "ok.srt", GOOD)
+    write(source / "half.srt", HALF)
+    write(source / "bad.srt", "junk\n")
+    target = tmp_path / "out"
+
+    status = main([str(source), str(target), "--to", "vtt", "-j", "1"])
+    output = capsys.readouterr().out
+    assert status == 1
+    assert f"Failed: {source / 'bad.srt'}: no valid subtitles (1 malformed block(s))" in output
+    assert f"Warning: {source / 'half.srt'}: skipped 1 malformed block(s), first at line 5" in output
+    assert "Converted 2/3 files to VTT (1 with malformed blocks skipped), 1 failed" in output
+    assert sorted(os.listdir(target)) == ["half.vtt", "ok.vtt"]
+
+
+def test_main_succeeds_when_every_file_converts(tmp_path, capsys):
+    source = write(tmp_path / "ok.srt", GOOD)
+    assert main([source, str(tmp_path / "ok.sbv"), "--to", "sbv", "-j", "1"]) == 0
+    assert "Converted 1/1 files to SBV" in capsys.readouterr().out
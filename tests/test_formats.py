@@ -0,0 +1,118 @@
+import pytest
+
+from B_SubEditor.subtitle_core import parse_subtitle_data
+from B_SubEditor.subtitle_formats import convert, get_codec, strip_markup
+
+MALFORMED = "Missing or malformed timecode line"
+
+SAMPLES = {
+    'SRT': (
+        "1\n00:00:01,000 --> 00:00:02,500\n<b>Bold</b> start\n\n"
+        "2\n00:00:03,000 --> 00:00:04,000\ntwo\nlines\n\n"
+    ),
+    'VTT': (
+        "WEBVTT\n\n"
+        "00:00:01.000 --> 00:00:02.500 line:0\n<i>Italic</i> start\n\n"
+        "00:00:03.000 --> 00:00:04.000\ntwo\nlines\n\n"
+    ),
+    'SBV': (
+        "0:00:01.000,0:00:02.500\nplain start\n\n"
+        "0:00:03.000,0:00:04.000\ntwo\nlines\n\n"
+    ),
+    'ASS': (
+        "[Script Info]\nScriptType: v4.00+\n\n"
+        "[V4+ Styles]\n"
+        "Format: Name, Fontname, Fontsize, PrimaryColour, Bold, Italic\n"
+        "Style: Default,Arial,40,&H00FFFFFF,0,0\n\n"
+        "[Events]\n"
+        "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
+        "Dialogue: 0,0:00:01.00,0:00:02.50,Default,,0,0,0,,{\\b1}Bold{\\b0} start\n"
+        "Dialogue: 0,0:00:03.00,0:00:04.00,Default,,0,0,0,,two\\Nlines\n"
+    ),
+}
+
+
+def cue_tuples(document):
+    return [(start, end, text) for start, end, text, _ in document.iter_cues()]
+
+
+@pytest.mark.parametrize("format", sorted(SAMPLES))
+def test_round_trip(format):
+    codec = get_codec(format)
+    document = codec.parse(SAMPLES[format])
+    assert [(start, end) for start, end, _ in cue_tuples(document)] == [(1000, 2500), (3000, 4000)]
+    assert cue_tuples(codec.parse(codec.dumps(document))) == cue_tuples(document)
+
+
+@pytest.mark.parametrize("format", ['SRT', 'VTT', 'SBV'])
+def test_round_trip_is_exact(format):
+    codec = get_codec(format)
+    assert codec.dumps(codec.parse(SAMPLES[format])) == SAMPLES[format]
+
+
+@pytest.mark.parametrize("source", sorted(SAMPLES))
+@pytest.mark.parametrize("target", sorted(SAMPLES))
+def test_convert_keeps_timing_and_markup(source, target):
+    expected = cue_tuples(get_codec(source).parse(SAMPLES[source]))
+    if target == 'SBV':
+        # SBV has no markup
+        expected = [(start, end, strip_markup(text)) for start, end, text in expected]
+    converted = get_codec(target).parse(convert(SAMPLES[source], source, target))
+    assert cue_tuples(converted) == expected
+
+
+def test_vtt_notes_stay_in_place():
+    content = (
+        "WEBVTT\n\nNOTE top\n\n"
+        "00:00:01.000 --> 00:00:02.000\none\n\n"
+        "NOTE between\n\n"
+        "00:00:03.000 --> 00:00:04.000\ntwo\n\n"
+        "NOTE end\n\n"
+    )
+    codec = get_codec('VTT')
+    document = codec.parse(content)
+    assert len(document) == 2
+    assert codec.dumps(document) == content
+    # Notes never leak into other formats
+    assert "NOTE" not in get_codec('SRT').dumps(document)
+
+
+def test_srt_malformed_block_line_numbers():
+    content = (
+        "1\n00:00:01,000 --> 00:00:02,000\none\n\n"
+        "not a cue\nat all\n\n"
+        "2\n00:00:03,000 --> 00:00:04,000\ntwo\n\n"
+        "3\nbroken --> timing\nthree\n"
+    )
+    errors = []
+    cues = parse_subtitle_data(content, errors)
+    assert len(cues) == 2
+    assert errors == [(5, MALFORMED), (12, MALFORMED)]
+
+
+def test_srt_comment_blocks_are_not_malformed():
+    content = "# Metadata\n# title: Test\n\n1\n00:00:01,000 --> 00:00:02,000\none\n"
+    errors = []
+    cues = parse_subtitle_data(content, errors)
+    assert len(cues) == 1
+    assert errors == []
+
+
+@pytest.mark.parametrize("format, content, line", [
+    ('VTT', "WEBVTT\n\n00:00:01.000 --> 00:00:02.000\nhi\n\nnope\n", 6),
+    ('SBV', "0:00:01.000,0:00:02.000\nhello\n\nbad\n", 4),
+])
+def test_malformed_block_line_numbers(format, content, line):
+    errors = []
+    document = get_codec(format).parse(content, errors)
+    assert len(document) == 1
+    assert errors == [(line, MALFORMED)]
+
+
+def test_line_breaks_are_encoded_by_each_writer():
+    cues = [(1000, 2000, "first\nsecond", None)]
+    assert "first\\nsecond" in "".join(get_codec('SRT').iter_blocks(cues, legacy_newlines=True))
+    assert "\nfirst\nsecond\n" in "".join(get_codec('SRT').iter_blocks(cues))
+    assert "\nfirst\nsecond\n" in "".join(get_codec('VTT').iter_blocks(cues))
+    assert "\nfirst\nsecond\n" in "".join(get_codec('SBV').iter_blocks(cues))
+    assert ",first\\Nsecond\n" in "".join(get_codec('ASS').iter_blocks(cues))
@@ -0,0 +1,53 @@
+import random
+
+from B_SubEditor.intervals import IntervalIndex, pack_channels
+
+
+def random_intervals(count, seed):
+    rng = random.Random(seed)
+    starts = [rng.randrange(0, 1000) for _ in range(count)]
+    ends = [start + rng.randrange(1, 80) for start in starts]
+    return starts, ends
+
+
+def test_queries_match_brute_force():
+    starts, ends = random_intervals(300, 1)
+    index = IntervalIndex(starts, ends)
+    order = sorted(range(len(starts)), key=starts.__getitem__)
+    for a, b in [(0, 1), (10, 50), (499, 500), (900, 1200), (-5, 0)]:
+        expected = [i for i in order if starts[i] < b and ends[i] > a]
+        assert index.overlapping(a, b) == expected
+        assert index.any_overlap(a, b) == bool(expected)
+    for t in range(0, 1100, 37):
+        assert index.at(t) == [i for i in order if starts[i] <= t < ends[i]]
+
+
+def test_intervals_are_half_open():
+    index = IntervalIndex([0, 10], [10, 20], ids=["a", "b"])
+    assert index.at(9) == ["a"]
+    assert index.at(10) == ["b"]
+    assert index.overlapping(20, 30) == []
+
+
+def test_pack_channels_uses_fewest_channels():
+    starts, ends = random_intervals(300, 2)
+    order = sorted(range(len(starts)), key=starts.__getitem__)
+    starts = [starts[i] for i in order]
+    ends = [ends[i] for i in order]
+    channels = pack_channels(starts, ends, 2)
+
+    by_channel = {}
+    for start, end, channel in zip(starts, ends, channels):
+        by_channel.setdefault(channel, []).append((start, end))
+    for intervals in by_channel.values():
+        assert all(end <= start for (_, end), (start, _) in zip(intervals, intervals[1:]))
+    # First fit without obstacles needs exactly the maximum overlap depth
+    depth = max(sum(start <= t < end for start, end in zip(starts, ends)) for t in range(1100))
+    assert min(channels) == 2
+    assert max(channels) == 2 + depth - 1
+
+
+def test_pack_channels_avoids_occupied_ranges():
+    occupied = {2: IntervalIndex([0], [100]), 3: IntervalIndex([150], [200])}
+    channels = pack_channels([50, 120, 160], [60, 130, 170], 2, occupied)
+    assert list(channels) == [3, 2, 2]
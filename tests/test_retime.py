@@ -0,0 +1,59 @@
+from fractions import Fraction
+
+import pytest
+
+from B_SubEditor import retime
+from B_SubEditor.cue_store import CueStore
+
+
+@pytest.fixture(params=[True, False], ids=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(retime, "np", None)
+
+
+def make_cues(times):
+    cues = CueStore()
+    for number, (start, end) in enumerate(times):
+        cues.append(start, end, f"cue {number}")
+    return cues
+
+
+def test_offset_drops_cues_before_zero(backend):
+    cues = make_cues([(1000, 2000), (3000, 6000), (8000, 9000)])
+    kept = retime.retime_cues(cues, *retime.offset_map(-5000))
+    assert [kept.text(i) for i in range(len(kept))] == ["cue 1", "cue 2"]
+    # A cue straddling zero is cut at zero, later cues just move
+    assert list(kept.starts) == [0, 3000]
+    assert list(kept.ends) == [1000, 4000]
+
+
+def test_retime_keeps_every_cue_after_zero(backend):
+    cues = make_cues([(1000, 2000), (3000, 4000)])
+    assert retime.retime_cues(cues, *retime.stretch_map(2)) is cues
+    assert list(cues.starts) == [2000, 6000]
+    assert list(cues.ends) == [4000, 8000]
+
+
+class Strip:
+    def __init__(self, start, end):
+        self.frame_start = start
+        self.frame_final_duration = end - start
+
+    @property
+    def frame_final_start(self):
+        return self.frame_start
+
+    @property
+    def frame_final_end(self):
+        return self.frame_start + self.frame_final_duration
+
+
+def test_retime_strips_returns_dropped_strips(backend):
+    strips = [Strip(25, 50), Strip(75, 150), Strip(200, 225)]
+    moved, dropped = retime.retime_strips(strips, Fraction(25), *retime.offset_map(-5000))
+    assert moved == 2
+    assert dropped == [strips[0]]
+    assert [(strip.frame_final_start, strip.frame_final_end) for strip in strips[1:]] == [(0, 25), (75, 100)]
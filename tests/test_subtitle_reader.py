@@ -0,0 +1,82 @@
+import pytest
+
+from B_SubEditor.incremental_parse import IncrementalParser
+from B_SubEditor.parse_cache import load_subtitle_file
+from B_SubEditor.subtitle_core import parse_subtitle_data
+from B_SubEditor.subtitle_reader import (
+    SNIFF_SIZE, CueOffsetIndex, iter_subtitle_lines, map_subtitle_file, read_text,
+)
+
+
+def srt_bytes(count, newline=b"\n"):
+    return b"".join(
+        newline.join((b"%d" % (i + 1), b"00:00:%02d,000 --> 00:00:%02d,500" % (i % 60, i % 60), b"cue %d" % i, b""))
+        + newline
+        for i in range(count)
+    )
+
+
+def write(path, data):
+    path.write_bytes(data)
+    return str(path)
+
+
+def assert_same_cues(a, b):
+    assert list(a.starts) == list(b.starts)
+    assert list(a.ends) == list(b.ends)
+    assert list(a.lines) == list(b.lines)
+    assert [a.text(i) for i in range(len(a))] == [b.text(i) for i in range(len(b))]
+
+
+@pytest.mark.parametrize("encoding", ["utf-8-sig", "utf-16", "utf-16-le", "cp1252"])
+def test_encodings_are_detected(tmp_path, encoding):
+    content = "1\n00:00:01,000 --> 00:00:02,000\nNaïve café\n"
+    path = write(tmp_path / "sub.srt", content.encode(encoding))
+    assert read_text(path) == content
+    assert list(iter_subtitle_lines(path)) == content.splitlines()
+
+
+def test_legacy_bytes_past_the_sniffed_head_decode_the_same_everywhere(tmp_path):
+    head = srt_bytes(4000)
+    assert len(head) > SNIFF_SIZE
+    path = write(tmp_path / "late.srt", head + "Naïve café\n".encode("cp1252"))
+    with map_subtitle_file(path) as (_, encoding, _):
+        assert encoding == "cp1252"
+    lines = list(iter_subtitle_lines(path))
+    assert lines[-1] == "Naïve café"
+    assert read_text(path).splitlines() == lines
+    index = CueOffsetIndex(path)
+    assert index.read_block(len(index) - 1) == ["Naïve café"]
+
+
+def test_cue_offset_index_reads_single_cues(tmp_path):
+    path = write(tmp_path / "sub.srt", b"\r\n" + srt_bytes(50, b"\r\n").replace(b"\r\n\r\n", b"\r\n \r\n\r\n"))
+    index = CueOffsetIndex(path)
+    assert len(index) == 50
+    assert index.first_lines[:2].tolist() == [2, 7]
+    cue = index.read_cue(1)
+    assert (cue.start_ms, cue.end_ms, cue.text) == (1000, 1500, "cue 1")
+
+
+def test_file_reparse_only_decodes_changed_blocks(tmp_path):
+    data = srt_bytes(200, b"\r\n")
+    path = write(tmp_path / "sub.srt", data)
+    parser = IncrementalParser()
+    errors = []
+    assert_same_cues(parser.parse_file(path, errors), parse_subtitle_data(read_text(path)))
+    assert parser.reparsed == 200
+
+    write(tmp_path / "sub.srt", data.replace(b"cue 17\r\n", b"<b>changed</b>\r\n\r\nnot a cue\r\n"))
+    errors = []
+    expected_errors = []
+    cues = parser.parse_file(path, errors)
+    assert_same_cues(cues, parse_subtitle_data(read_text(path), expected_errors))
+    assert errors == expected_errors == [(73, "Missing or malformed timecode line")]
+    assert parser.reparsed == 2
+
+
+def test_load_subtitle_file_streams_every_format(tmp_path):
+    path = write(tmp_path / "sub.vtt", "WEBVTT\n\n00:00:01.000 --> 00:00:02.000\n<b>hi</b>\n".encode("utf-16"))
+    cues, errors = load_subtitle_file(path)
+    assert (len(cues), cues.text(0), errors) == (1, "hi", [])
+    assert load_subtitle_file(write(tmp_path / "empty.srt", b"")) == (None, [])
@@ -0,0 +1,151 @@
+import random
+
+import pytest
+
+from B_SubEditor import text_stats
+from B_SubEditor.text_stats import (
+    TextStats, clear_caches, cue_block, forget_text, selected_character_count,
+)
+
+
+class Line:
+    __slots__ = ("body",)
+
+    def __init__(self, body):
+        self.body = body
+
+
+class FakeText:
+    """The parts of a Blender text block the footer reads."""
+
+    def __init__(self, content):
+        self.set(content)
+        self.current_line_index = self.current_character = 0
+        self.select_end_line_index = self.select_end_character = 0
+
+    def set(self, content):
+        self.lines = [Line(body) for body in content.split("\n")]
+
+    def as_string(self):
+        return "\n".join(line.body for line in self.lines)
+
+    def as_pointer(self):
+        return id(self)
+
+    def select(self, start_line, start_col, end_line, end_col):
+        self.current_line_index, self.current_character = start_line, start_col
+        self.select_end_line_index, self.select_end_character = end_line, end_col
+
+
+def srt(count):
+    return "\n".join(
+        f"{i + 1}\n00:00:{i:02d},000 --> 00:00:{i:02d},500\nline {i} of text\n" for i in range(count)
+    )
+
+
+def expected_count(text, count_spaces=True):
+    start = (text.current_line_index, text.current_character)
+    end = (text.select_end_line_index, text.select_end_character)
+    (first, first_col), (last, last_col) = sorted((start, end))
+    bodies = [line.body for line in text.lines]
+    if first == last:
+        pieces = [bodies[first][first_col:last_col]]
+    else:
+        pieces = [bodies[first][first_col:], *bodies[first + 1:last], bodies[last][:last_col]]
+    selected = "".join(pieces)
+    return len(selected) if count_spaces else len(selected) - selected.count(" ")
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    clear_caches()
+    yield
+    clear_caches()
+
+
+def assert_matches_rebuild(text):
+    stats = text_stats.text_stats(text)
+    fresh = TextStats([line.body for line in text.lines])
+    assert stats.bodies == fresh.bodies
+    assert list(stats.lengths) == list(fresh.lengths)
+    assert list(stats.non_spaces) == list(fresh.non_spaces)
+    assert stats.timing_lines == fresh.timing_lines
+    return stats
+
+
+def test_unchanged_text_reuses_the_cache():
+    text = FakeText(srt(5))
+    assert text_stats.text_stats(text) is text_stats.text_stats(text)
+
+
+def test_cache_follows_random_edits():
+    rng = random.Random(3)
+    text = FakeText(srt(40))
+    for _ in range(200):
+        bodies = [line.body for line in text.lines]
+        position = rng.randrange(len(bodies))
+        stop = position + 1
+        kind = rng.randrange(4)
+        if kind == 0:
+            bodies[position] += rng.choice(" xyz")
+        elif kind == 1:
+            bodies.insert(position, "")
+        elif kind == 2 and len(bodies) > 1:
+            del bodies[position]
+        else:
+            # Indent or replace across several lines at once
+            stop = min(position + rng.randrange(1, 6), len(bodies))
+            bodies[position:stop] = ["    " + body for body in bodies[position:stop]]
+        text.set("\n".join(bodies))
+        # The Text Editor leaves the cursor and selection on the edited lines
+        last = len(text.lines) - 1
+        text.select(min(position, last), 0, min(stop - 1, last), 0)
+
+        stats = assert_matches_rebuild(text)
+        last = len(text.lines) - 1
+        first = rng.randrange(last + 1)
+        end = rng.randrange(first, last + 1)
+        text.select(first, rng.randrange(len(text.lines[first].body) + 1),
+                    end, rng.randrange(len(text.lines[end].body) + 1))
+        for count_spaces in (True, False):
+            assert selected_character_count(text, count_spaces, stats) == expected_count(text, count_spaces)
+
+
+def test_edit_far_from_the_cursor_is_seen():
+    text = FakeText(srt(10))
+    text.select(0, 0, 0, 0)
+    text_stats.text_stats(text)
+    text.set(text.as_string().replace("line 9 of text", "line 9\n\n10\n00:00:20,000 --> 00:00:21,000\nnew"))
+    assert assert_matches_rebuild(text).cue_count == 11
+
+
+def test_unchanged_text_is_checked_without_reading_it_all():
+    text = FakeText(srt(5))
+    text_stats.text_stats(text)
+    text.as_string = None  # a draw must not need the whole text
+    text.select(6, 2, 9, 0)
+    assert text_stats.text_stats(text).cue_count == 5
+
+
+def test_operator_rewrite_is_seen_after_forget_text():
+    text = FakeText(srt(5))
+    text_stats.text_stats(text)
+    # Same line count, untouched cursor lines: only forget_text signals it
+    text.set(text.as_string().replace("line 2 of text", "line two"))
+    forget_text(text)
+    assert assert_matches_rebuild(text).bodies[10] == "line two"
+
+
+def test_cue_block_recovers_from_a_stale_cache():
+    text = FakeText(srt(3))
+    stats = text_stats.text_stats(text)
+    # Rewrite the block behind the cache's back, shifting every cue down
+    text.set("\n\n" + text.as_string())
+    assert cue_block(text, stats, 3) == (1, 0, 500, "line 0 of text")
+
+
+def test_forget_text_drops_the_cache():
+    text = FakeText(srt(2))
+    stats = text_stats.text_stats(text)
+    forget_text(text)
+    assert text_stats.text_stats(text) is not stats
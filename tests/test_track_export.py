@@ -0,0 +1,42 @@
+from B_SubEditor.track_export import channel_path, group_strips, track_file_stem
+
+
+class Strip:
+    """The parts of a VSE strip the track grouping reads."""
+
+    def __init__(self, name, channel, start, type='TEXT', parent=None, text=""):
+        self.name, self.channel, self.frame_final_start = name, channel, start
+        self.type, self.text, self._parent = type, text, parent
+
+    def parent_meta(self):
+        return self._parent
+
+
+def test_meta_contents_get_their_own_tracks():
+    meta = Strip("meta", 3, 0, type='META')
+    inner = Strip("inner", 1, 10, parent=meta)
+    nested_meta = Strip("nested", 2, 0, type='META', parent=meta)
+    nested = Strip("nested text", 1, 20, parent=nested_meta)
+    top = Strip("top", 1, 5)
+    later_top = Strip("later top", 1, 0)
+
+    assert channel_path(nested) == (3, 2, 1)
+    tracks = group_strips([top, meta, inner, nested_meta, nested, later_top])
+    assert [(key, [strip.name for strip in strips]) for key, strips in tracks] == [
+        ((1,), ["later top", "top"]),
+        ((3, 1), ["inner"]),
+        ((3, 2, 1), ["nested text"]),
+    ]
+    assert [track_file_stem("film", key) for key, _ in tracks] == [
+        "film_channel_1", "film_channel_3_1", "film_channel_3_2_1",
+    ]
+
+
+def test_speaker_tracks_ignore_channels():
+    meta = Strip("meta", 3, 0, type='META')
+    strips = [Strip("[Ann] hi", 1, 5), Strip("b", 1, 2, parent=meta, text="[Ann] yo"), Strip("c", 2, 0)]
+    tracks = group_strips(strips, 'SPEAKER')
+    assert [(key, [strip.name for strip in group]) for key, group in tracks] == [
+        ("", ["c"]), ("Ann", ["b", "[Ann] hi"]),
+    ]
+    assert track_file_stem("film", "Ann", 'SPEAKER') == "film_Ann"